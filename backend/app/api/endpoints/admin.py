@@ -1,12 +1,12 @@
 import logging
 from fastapi import APIRouter, HTTPException
-from app.services.qdrant_service import QdrantService
 from app.core.greeting_config import get_greeting, set_greeting
 from app.core.inbound_config import get_inbound_status, set_inbound_status
+from app.services.realtime_orchestrator import session_pool
+from app.services.post_call_processor import post_call_processor
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
-qdrant_service = QdrantService()
 
 @router.get("/settings/greeting")
 async def get_greeting_endpoint():
@@ -38,3 +38,24 @@ async def update_inbound(data: dict):
     set_inbound_status(enabled)
     logger.info(f"Inbound calls {'enabled' if enabled else 'disabled'}")
     return {"status": "success", "enabled": enabled}
+
+
+@router.get("/realtime-pool")
+async def get_realtime_pool_stats():
+    """Realtime session pool size, hit/miss counters and lease latency."""
+    return session_pool.stats()
+
+
+@router.get("/post-call-jobs")
+async def get_post_call_jobs():
+    """Post-call processing queue depth, status counts and recent jobs."""
+    return post_call_processor.stats()
+
+
+@router.get("/post-call-jobs/{call_id}")
+async def get_post_call_job(call_id: str):
+    """Status of one call's post-call processing job."""
+    job = post_call_processor.get(call_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="No post-call job for this call")
+    return job.summary()
@@ -1,8 +1,11 @@
 import json
 import logging
 from typing import List, Optional
-from fastapi import APIRouter, Response, Request
+from fastapi import APIRouter, HTTPException, Response, Request
+from twilio.request_validator import RequestValidator
+from app.core.config import settings
 from app.core.supabase_client import supabase
+from app.services.realtime_orchestrator import session_pool
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +37,13 @@ def normalize_transcript(transcript):
                 })
     return normalized
 
+def valid_twilio_signature(request: Request, url: str, params: dict) -> bool:
+    """Whether the request carries a valid X-Twilio-Signature for `url` (False without an auth token)."""
+    signature = request.headers.get("x-twilio-signature", "")
+    if not settings.TWILIO_AUTH_TOKEN or not signature:
+        return False
+    return RequestValidator(settings.TWILIO_AUTH_TOKEN).validate(url, params, signature)
+
 def map_call(c):
     # Extract summary from nested call_summaries list if using join
     summaries = c.get("call_summaries", [])
@@ -59,6 +69,7 @@ def map_call(c):
         "duration": c.get("call_duration") or 0,
         "status": c.get("call_status") or "active",
         "intent": c.get("intent") or "N/A",
+        "sentiment": c.get("sentiment") or "N/A",
         "summary": summary_text or c.get("summary") or "",
         "transcript": normalize_transcript(c.get("transcript")),
         "language": c.get("language") or "en-US",
@@ -194,9 +205,24 @@ async def twilio_webhook(request: Request):
     # Capture caller info from Twilio POST body
     form_data = await request.form()
     caller_number = form_data.get("From", "Unknown")
+    call_sid = form_data.get("CallSid", "")
+    
+    # Twilio signs the public URL it posted to (https behind the tunnel/proxy)
+    webhook_url = f"{'https' if is_secure else 'http'}://{host}{request.url.path}"
+    if request.url.query:
+        webhook_url += f"?{request.url.query}"
+    signed = valid_twilio_signature(request, webhook_url, dict(form_data))
+    if settings.TWILIO_AUTH_TOKEN and not signed:
+        logger.warning(f"Rejected Twilio webhook with a missing/invalid signature (CallSid: {call_sid})")
+        raise HTTPException(status_code=403, detail="Invalid Twilio signature")
+    
+    # Start opening the Realtime session now, while Twilio sets up the media stream.
+    # Only for signed requests: each reservation opens a paid OpenAI session.
+    if call_sid and signed:
+        session_pool.reserve(call_sid)
     
     logger.info("--- TWILIO WEBHOOK CALLED ---")
-    logger.info(f"Caller: {caller_number}")
+    logger.info(f"Caller: {caller_number}, CallSid: {call_sid}")
     logger.info(f"Host: {host}")
     logger.info(f"Protocol: {protocol}")
     logger.info(f"Generated WS URL: {ws_url}")
@@ -206,6 +232,7 @@ async def twilio_webhook(request: Request):
     <Connect>
         <Stream url="{ws_url}">
             <Parameter name="callerNumber" value="{caller_number}" />
+            <Parameter name="callSid" value="{call_sid}" />
         </Stream>
     </Connect>
 </Response>"""
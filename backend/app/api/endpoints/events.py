@@ -0,0 +1,51 @@
+"""
+WebSocket endpoint for the live dashboard.
+Streams call events from the in-process event hub (no Realtime session per tab).
+"""
+import asyncio
+import logging
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+
+from app.services.event_hub import event_hub
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# "Try again later": the client fell behind and should reconnect for a fresh snapshot
+CLOSE_TOO_SLOW = 1013
+
+
+async def _pump(websocket: WebSocket, subscriber):
+    """Send queued ticks until the hub drops this subscriber."""
+    try:
+        while True:
+            message = await subscriber.next()
+            if message is None:
+                logger.warning("[Events] Closing slow dashboard connection")
+                await websocket.close(code=CLOSE_TOO_SLOW)
+                return
+            await websocket.send_text(message)
+    except Exception:
+        # Connection already gone; the receive loop cleans up
+        pass
+
+
+@router.websocket("/events")
+async def events_endpoint(websocket: WebSocket):
+    """Dashboard event stream: a snapshot, then one JSON array of events per tick."""
+    await websocket.accept()
+    subscriber = event_hub.subscribe()
+    logger.info(f"[Events] Dashboard connected ({len(event_hub.subscribers)} subscribers)")
+    pump = asyncio.create_task(_pump(websocket, subscriber))
+    try:
+        # Nothing is expected from the client; reading detects the disconnect
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.warning(f"[Events] Connection error: {e}")
+    finally:
+        pump.cancel()
+        event_hub.unsubscribe(subscriber)
+        logger.info("[Events] Dashboard disconnected")
@@ -3,6 +3,8 @@ Knowledge Base Management Endpoints
 Handles document upload, deletion, and listing.
 """
 
+import asyncio
+import hashlib
 import logging
 import os
 import tempfile
@@ -10,14 +12,17 @@ from fastapi import APIRouter, UploadFile, File, HTTPException, Form
 from fastapi.responses import JSONResponse
 from typing import Optional
 
-from app.services.document_ingestion_service import DocumentIngestionService
+from app.services.ingestion_jobs import IngestionJob, get_job_row, ingestion_jobs
 from app.core.supabase_client import supabase
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/knowledge-base", tags=["knowledge-base"])
 
-# Initialize service
-doc_ingestion = DocumentIngestionService()
+# Shared with the ingestion workers
+doc_ingestion = ingestion_jobs.service
+
+MAX_UPLOAD_BYTES = 15 * 1024 * 1024
+UPLOAD_BLOCK_BYTES = 1024 * 1024
 
 @router.post("/upload")
 async def upload_document(
@@ -27,7 +32,8 @@ async def upload_document(
 ):
     """
     Upload a document to the knowledge base.
-    Also tracks the upload in the knowledge_base_documents Supabase table.
+    Returns 202 with a job id as soon as the file is saved; ingestion runs in the
+    background (see /jobs/{job_id}) and is tracked in the knowledge_base_documents table.
     """
     if not file.filename:
         raise HTTPException(status_code=400, detail="No file provided")
@@ -43,22 +49,25 @@ async def upload_document(
         )
     
     temp_path = None
-    # Save uploaded file to temp location
+    # Save uploaded file to temp location, block by block (never the whole upload in memory)
     try:
         with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext) as temp_file:
-            content = await file.read()
-            
-            # Check file size (15 MB limit)
-            file_size = len(content)
-            file_size_mb = file_size / (1024 * 1024)
-            if file_size_mb > 15:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"File size exceeds the limit. Maximum accepted file size is 15 MB. Your file: {file_size_mb:.2f} MB"
-                )
-            
-            temp_file.write(content)
             temp_path = temp_file.name
+            file_size = 0
+            content_hash = hashlib.sha256()
+            while block := await file.read(UPLOAD_BLOCK_BYTES):
+                file_size += len(block)
+                content_hash.update(block)
+                
+                # Check file size (15 MB limit)
+                if file_size > MAX_UPLOAD_BYTES:
+                    file_size_mb = (file.size or file_size) / (1024 * 1024)
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"File size exceeds the limit. Maximum accepted file size is 15 MB. Your file: {file_size_mb:.2f} MB"
+                    )
+                
+                temp_file.write(block)
         
         # Prepare metadata
         metadata = {}
@@ -67,32 +76,39 @@ async def upload_document(
         if description:
             metadata["description"] = description
         
-        # Ingest document
-        result = await doc_ingestion.ingest_document(
+        # Queue ingestion; a new job owns the temp file from here on
+        doc_id = doc_ingestion._generate_doc_id(content_hash.hexdigest())
+        job = IngestionJob(
+            doc_id=doc_id,
             file_path=temp_path,
             file_name=file.filename,
+            file_size=file_size,
             metadata=metadata
         )
+        try:
+            covering = await ingestion_jobs.submit(job)
+        except asyncio.QueueFull:
+            raise HTTPException(status_code=503, detail="Too many uploads in progress. Please try again shortly.")
+        if covering is job:
+            temp_path = None
+            message = f"Queued {file.filename} for ingestion"
+            logger.info(f"Queued ingestion of {file.filename} ({doc_id}, job {job.job_id})")
+        elif covering.status == "ready":
+            message = f"{file.filename} is already in the knowledge base as {covering.file_name}"
+        else:
+            message = f"{file.filename} is already being ingested as {covering.file_name}"
         
-        # Track upload in Supabase knowledge_base_documents table
-        if result.get("success"):
-            try:
-                doc_id = result.get("doc_id", "")
-                supabase.table("knowledge_base_documents").insert({
-                    "doc_id": doc_id,
-                    "filename": file.filename,
-                    "file_size": file_size,
-                    "file_type": file_ext.lstrip("."),
-                    "uploaded_by": "system",  # Will be updated when auth is implemented
-                    "chunk_count": result.get("chunks", 0),
-                    "status": "ready",
-                    "metadata": metadata
-                }).execute()
-                logger.info(f"Tracked upload in Supabase: {file.filename} ({doc_id})")
-            except Exception as db_err:
-                logger.warning(f"Failed to track upload in Supabase: {db_err}")
-        
-        return JSONResponse(content=result, status_code=200 if result["success"] else 400)
+        return JSONResponse(
+            content={
+                "success": True,
+                "job_id": covering.job_id,
+                "doc_id": doc_id,
+                "file_name": covering.file_name,
+                "status": covering.status,
+                "message": message
+            },
+            status_code=200 if covering.status == "ready" else 202
+        )
         
     except HTTPException:
         raise
@@ -101,13 +117,44 @@ async def upload_document(
         raise HTTPException(status_code=500, detail=f"Error uploading document: {str(e)}")
     
     finally:
-        # Clean up temp file
+        # Clean up temp file unless a job took it
         if temp_path and os.path.exists(temp_path):
             try:
                 os.remove(temp_path)
             except:
                 pass
 
+@router.get("/jobs")
+async def list_ingestion_jobs():
+    """Ingestion queue depth, status counts and recent jobs."""
+    return ingestion_jobs.stats()
+
+@router.get("/jobs/{job_id}")
+async def get_ingestion_job(job_id: str):
+    """
+    Status and per-stage progress of one upload.
+    Falls back to the knowledge_base_documents row once the job has left memory.
+    """
+    job = ingestion_jobs.get(job_id)
+    if job:
+        return job.summary()
+    try:
+        row = await get_job_row(job_id)
+    except Exception as e:
+        logger.error(f"Error fetching ingestion job {job_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error fetching job: {str(e)}")
+    if not row:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {
+        "job_id": job_id,
+        "file_name": row.get("filename"),
+        "file_size": row.get("file_size"),
+        "status": row.get("status"),
+        "chunk_count": row.get("chunk_count"),
+        "vector_count": row.get("vector_count"),
+        "queued_at": row.get("upload_date")
+    }
+
 @router.get("/list")
 async def list_documents():
     """
@@ -117,7 +164,7 @@ async def list_documents():
         List of documents with their metadata
     """
     try:
-        raw_documents = doc_ingestion.list_documents()
+        raw_documents = await doc_ingestion.list_documents()
         
         # Transform to frontend-expected format
         documents = []
@@ -200,7 +247,7 @@ async def knowledge_base_info():
         Knowledge base statistics
     """
     try:
-        documents = doc_ingestion.list_documents()
+        documents = await doc_ingestion.list_documents()
         total_files = sum(doc["file_count"] for doc in documents)
         
         return JSONResponse(
@@ -209,8 +256,11 @@ async def knowledge_base_info():
                 "total_documents": len(documents),
                 "total_files": total_files,
                 "supported_formats": ["pdf", "txt", "docx"],
-                "chunk_size": doc_ingestion.chunk_size,
-                "chunk_overlap": doc_ingestion.chunk_overlap,
+                "chunk_max_tokens": doc_ingestion.chunk_max_tokens,
+                "chunk_overlap_tokens": doc_ingestion.chunk_overlap_tokens,
+                # Pre-token-chunking keys, kept for existing clients (now also in tokens)
+                "chunk_size": doc_ingestion.chunk_max_tokens,
+                "chunk_overlap": doc_ingestion.chunk_overlap_tokens,
                 "embedding_model": "OpenAI text-embedding-3-small",
                 "vector_database": "Qdrant"
             }
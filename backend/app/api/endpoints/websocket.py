@@ -7,7 +7,9 @@ import asyncio
 import logging
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
+from app.core.config import settings
 from app.services.realtime_orchestrator import RealtimeOrchestrator
+from app.services.media_ingress import extract_media_payload
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -31,6 +33,15 @@ async def websocket_endpoint(websocket: WebSocket):
     try:
         while True:
             message = await websocket.receive_text()
+            
+            # Fast path: media frames skip json.loads entirely
+            if settings.MEDIA_FAST_PATH:
+                payload = extract_media_payload(message)
+                if payload is not None:
+                    if orchestrator:
+                        await orchestrator.process_media_fast(payload)
+                    continue
+            
             data = json.loads(message)
             event = data.get("event")
             
@@ -42,12 +53,14 @@ async def websocket_endpoint(websocket: WebSocket):
                 stream_sid = start_data.get("streamSid")
                 custom_params = start_data.get("customParameters", {})
                 caller_number = custom_params.get("callerNumber") or start_data.get("from") or "Unknown"
+                call_sid = custom_params.get("callSid") or start_data.get("callSid")
                 
                 logger.info(f"[WS] Stream started: {stream_sid}, Caller: {caller_number}")
                 
                 if orchestrator:
                     orchestrator.stream_sid = stream_sid
                     orchestrator.caller_number = caller_number
+                    orchestrator.call_sid = call_sid
                     asyncio.create_task(orchestrator.start())
                 
             elif event == "media":
@@ -1,6 +1,9 @@
 import os
+from pathlib import Path
 from pydantic_settings import BaseSettings
 
+BACKEND_DIR = Path(__file__).parent.parent.parent
+
 class Settings(BaseSettings):
     PROJECT_NAME: str = "vocalQ"
     API_V1_STR: str = "/api/v1"
@@ -20,12 +23,111 @@ class Settings(BaseSettings):
     # Qdrant
     QDRANT_URL: str = os.getenv("QDRANT_URL", "")
     QDRANT_API_KEY: str = os.getenv("QDRANT_API_KEY", "")
+    # gRPC transport for the shared client (REST stays available for admin calls)
+    QDRANT_PREFER_GRPC: bool = os.getenv("QDRANT_PREFER_GRPC", "false").lower() == "true"
+    QDRANT_GRPC_PORT: int = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
 
     # OpenAI Models
     REALTIME_MODEL: str = os.getenv("REALTIME_MODEL", "gpt-4o-mini-realtime-preview-2024-12-17")
     CHAT_MODEL: str = os.getenv("CHAT_MODEL", "gpt-4o-mini")
     EMBEDDING_MODEL: str = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
 
+    REALTIME_URL: str = os.getenv("REALTIME_URL", "wss://api.openai.com/v1/realtime")  # point at a local stub for load tests
+    REALTIME_VOICE: str = os.getenv("REALTIME_VOICE", "alloy")
+
+    # Pre-rendered audio for scripted phrases (greeting, closing line)
+    UTTERANCE_CACHE_ENABLED: bool = os.getenv("UTTERANCE_CACHE_ENABLED", "true").lower() == "true"
+    UTTERANCE_CACHE_DIR: str = os.getenv("UTTERANCE_CACHE_DIR", str(BACKEND_DIR / "audio_cache"))
+
+    # Embedding cache (memory LRU + SQLite file), shared by KB search and ingestion
+    EMBEDDING_CACHE_ENABLED: bool = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+    EMBEDDING_CACHE_SIZE: int = int(os.getenv("EMBEDDING_CACHE_SIZE", "2048"))
+    EMBEDDING_CACHE_PATH: str = os.getenv("EMBEDDING_CACHE_PATH", str(BACKEND_DIR / "embedding_cache" / "embeddings.sqlite3"))
+    EMBEDDING_CACHE_MAX_ROWS: int = int(os.getenv("EMBEDDING_CACHE_MAX_ROWS", "200000"))  # SQLite tier, oldest pruned (0 = unbounded)
+    EMBEDDING_CACHE_MAX_AGE_DAYS: float = float(os.getenv("EMBEDDING_CACHE_MAX_AGE_DAYS", "90"))  # 0 = never expire
+
+    # KB search result cache (entries also expire when the KB changes)
+    KB_RESULT_CACHE_ENABLED: bool = os.getenv("KB_RESULT_CACHE_ENABLED", "true").lower() == "true"
+    KB_RESULT_CACHE_SIZE: int = int(os.getenv("KB_RESULT_CACHE_SIZE", "512"))
+    KB_RESULT_CACHE_TTL_S: float = float(os.getenv("KB_RESULT_CACHE_TTL_S", "600"))
+    KB_RESULT_CACHE_MAX_HITS: int = int(os.getenv("KB_RESULT_CACHE_MAX_HITS", "0"))  # re-query after N hits (0 = no limit)
+
+    # In-process KB vector replica (searched instead of Qdrant; Qdrant stays the source of truth).
+    # KB_REPLICA_ONLY keeps the KB in the replica alone, with no Qdrant server (tests, local dev).
+    KB_REPLICA_ENABLED: bool = os.getenv("KB_REPLICA_ENABLED", "false").lower() == "true"
+    KB_REPLICA_ONLY: bool = os.getenv("KB_REPLICA_ONLY", "false").lower() == "true"
+    KB_REPLICA_MAX_POINTS: int = int(os.getenv("KB_REPLICA_MAX_POINTS", "10000"))  # exact search on the event loop; larger KBs use Qdrant
+    KB_REPLICA_REFRESH_S: float = float(os.getenv("KB_REPLICA_REFRESH_S", "300"))  # reload for other processes' writes (0 = never)
+
+    # Document parsing process pool (0 workers = one per CPU); PDFs are split into page ranges
+    PARSE_WORKERS: int = int(os.getenv("PARSE_WORKERS", "0"))
+    PARSE_MIN_PAGES_PER_TASK: int = int(os.getenv("PARSE_MIN_PAGES_PER_TASK", "20"))
+    PARSE_TIMEOUT_S: float = float(os.getenv("PARSE_TIMEOUT_S", "120"))  # per document, shared by its parse steps
+    PARSE_WORKER_NICE: int = int(os.getenv("PARSE_WORKER_NICE", "10"))
+
+    # Document ingestion: chunks per embedding request / bulk upsert, batches in flight, retries per batch
+    INGEST_BATCH_SIZE: int = int(os.getenv("INGEST_BATCH_SIZE", "64"))
+    INGEST_MAX_CONCURRENT_BATCHES: int = int(os.getenv("INGEST_MAX_CONCURRENT_BATCHES", "4"))
+    INGEST_BATCH_RETRIES: int = int(os.getenv("INGEST_BATCH_RETRIES", "3"))
+    INGEST_QUEUE_BATCHES: int = int(os.getenv("INGEST_QUEUE_BATCHES", "2"))  # chunked batches buffered ahead of the embedders
+    CHUNK_MAX_TOKENS: int = int(os.getenv("CHUNK_MAX_TOKENS", "256"))  # chunk budget in EMBEDDING_MODEL tokens
+    CHUNK_OVERLAP_TOKENS: int = int(os.getenv("CHUNK_OVERLAP_TOKENS", "40"))  # max sentences' tokens repeated from the previous chunk
+    KB_TEXT_CACHE_DIR: str = os.getenv("KB_TEXT_CACHE_DIR", str(BACKEND_DIR / "kb_text_cache"))  # parsed text by file hash ("" = off)
+
+    # Background ingestion jobs (uploads return a job id; documents ingested concurrently, queued uploads)
+    INGEST_JOB_CONCURRENCY: int = int(os.getenv("INGEST_JOB_CONCURRENCY", "2"))
+    INGEST_JOB_QUEUE_SIZE: int = int(os.getenv("INGEST_JOB_QUEUE_SIZE", "20"))
+    INGEST_JOB_PROGRESS_INTERVAL_S: float = float(os.getenv("INGEST_JOB_PROGRESS_INTERVAL_S", "2"))
+    INGEST_JOB_HEARTBEAT_S: float = float(os.getenv("INGEST_JOB_HEARTBEAT_S", "30"))  # job rows' updated_at refresh
+    INGEST_JOB_LEASE_S: float = float(os.getenv("INGEST_JOB_LEASE_S", "180"))  # unrefreshed "processing" rows are failed
+
+    # Realtime session pool (pre-warmed, pre-configured OpenAI Realtime sessions)
+    REALTIME_POOL_SIZE: int = int(os.getenv("REALTIME_POOL_SIZE", "2"))
+    REALTIME_POOL_MAX_AGE: int = int(os.getenv("REALTIME_POOL_MAX_AGE", "300"))  # seconds idle before recycle
+    REALTIME_PREWARM_TIMEOUT: int = int(os.getenv("REALTIME_PREWARM_TIMEOUT", "15"))  # seconds to wait for the stream after the webhook
+    REALTIME_PREWARM_MAX_PENDING: int = int(os.getenv("REALTIME_PREWARM_MAX_PENDING", "10"))  # speculative sessions awaiting their stream
+
+    # Twilio -> OpenAI media ingress
+    MEDIA_FAST_PATH: bool = os.getenv("MEDIA_FAST_PATH", "true").lower() == "true"
+    MEDIA_COALESCE_MS: int = int(os.getenv("MEDIA_COALESCE_MS", "0"))  # 0 = forward every 20 ms frame
+
+    # Per-call outbound send queues (overflow policy for audio: drop_oldest | block)
+    OPENAI_SEND_QUEUE_SIZE: int = int(os.getenv("OPENAI_SEND_QUEUE_SIZE", "200"))
+    OPENAI_AUDIO_OVERFLOW: str = os.getenv("OPENAI_AUDIO_OVERFLOW", "drop_oldest")
+    TWILIO_SEND_QUEUE_SIZE: int = int(os.getenv("TWILIO_SEND_QUEUE_SIZE", "500"))
+    TWILIO_AUDIO_OVERFLOW: str = os.getenv("TWILIO_AUDIO_OVERFLOW", "block")
+
+    # Local barge-in VAD on inbound μ-law audio (interrupts before OpenAI's speech_started arrives)
+    BARGE_IN_LOCAL_VAD: bool = os.getenv("BARGE_IN_LOCAL_VAD", "false").lower() == "true"
+    BARGE_IN_ENERGY_DBFS: float = float(os.getenv("BARGE_IN_ENERGY_DBFS", "-38"))
+    BARGE_IN_NOISE_MARGIN_DB: float = float(os.getenv("BARGE_IN_NOISE_MARGIN_DB", "12"))
+    BARGE_IN_ZCR_MIN: float = float(os.getenv("BARGE_IN_ZCR_MIN", "0.02"))
+    BARGE_IN_ZCR_MAX: float = float(os.getenv("BARGE_IN_ZCR_MAX", "0.35"))
+    BARGE_IN_MIN_SPEECH_MS: int = int(os.getenv("BARGE_IN_MIN_SPEECH_MS", "120"))
+
+    # Write-behind persistence of `calls` rows (batched upserts off the event loop)
+    DB_WRITE_QUEUE_SIZE: int = int(os.getenv("DB_WRITE_QUEUE_SIZE", "1000"))
+    DB_WRITE_BATCH_SIZE: int = int(os.getenv("DB_WRITE_BATCH_SIZE", "50"))
+    DB_WRITE_FLUSH_MS: int = int(os.getenv("DB_WRITE_FLUSH_MS", "200"))
+    DB_WRITE_MAX_RETRIES: int = int(os.getenv("DB_WRITE_MAX_RETRIES", "5"))
+
+    # Post-call processing (summary, final transliteration, record finalization)
+    POST_CALL_CONCURRENCY: int = int(os.getenv("POST_CALL_CONCURRENCY", "4"))
+    POST_CALL_MAX_RETRIES: int = int(os.getenv("POST_CALL_MAX_RETRIES", "3"))
+    POST_CALL_QUEUE_SIZE: int = int(os.getenv("POST_CALL_QUEUE_SIZE", "1000"))
+
+    # Transcript romanization: local rule-based engine, LLM only as an opt-in fallback
+    TRANSLITERATION_CACHE_SIZE: int = int(os.getenv("TRANSLITERATION_CACHE_SIZE", "4096"))
+    TRANSLITERATION_LLM_FALLBACK: bool = os.getenv("TRANSLITERATION_LLM_FALLBACK", "false").lower() == "true"
+
+    # Dashboard event stream: events are batched per tick; subscribers more than
+    # EVENT_HUB_SUBSCRIBER_QUEUE ticks behind are disconnected
+    EVENT_HUB_TICK_MS: int = int(os.getenv("EVENT_HUB_TICK_MS", "100"))
+    EVENT_HUB_SUBSCRIBER_QUEUE: int = int(os.getenv("EVENT_HUB_SUBSCRIBER_QUEUE", "50"))
+
+    # Event-loop lag sampling interval for /metrics
+    LOOP_LAG_SAMPLE_MS: int = int(os.getenv("LOOP_LAG_SAMPLE_MS", "250"))
+
     model_config = {
         "case_sensitive": True,
         "env_file": ".env",
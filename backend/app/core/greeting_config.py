@@ -12,6 +12,10 @@ def get_greeting() -> str:
 
 
 def set_greeting(greeting: str) -> None:
-    """Set a new greeting message."""
+    """Set a new greeting message (and drop the pre-rendered audio of the old one)."""
     global _current_greeting
+    previous = _current_greeting
     _current_greeting = greeting
+    if previous != greeting:
+        from app.services.utterance_cache import utterance_cache
+        utterance_cache.invalidate(previous)
@@ -0,0 +1,144 @@
+"""
+Prometheus metrics - per-call latency milestones, counters and pool gauges.
+Exposed on GET /metrics (see app/main.py).
+"""
+from prometheus_client import Counter, Gauge, Histogram
+
+# Latency buckets (seconds) tuned for voice: tens of ms up to a few seconds
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0)
+
+# --- Call milestones (measured from the Twilio `start` event unless noted) ---
+REALTIME_CONNECT_SECONDS = Histogram(
+    "vocalq_realtime_connect_seconds",
+    "Twilio start to Realtime session connected",
+    buckets=LATENCY_BUCKETS,
+)
+SESSION_READY_SECONDS = Histogram(
+    "vocalq_session_ready_seconds",
+    "Twilio start to session.updated confirmed",
+    buckets=LATENCY_BUCKETS,
+)
+GREETING_FIRST_AUDIO_SECONDS = Histogram(
+    "vocalq_greeting_first_audio_seconds",
+    "Twilio start to first greeting audio sent to the caller",
+    buckets=LATENCY_BUCKETS,
+)
+RESPONSE_LATENCY_SECONDS = Histogram(
+    "vocalq_response_latency_seconds",
+    "Caller stops talking (speech_stopped) to first AI audio delta",
+    buckets=LATENCY_BUCKETS,
+)
+TOOL_CALL_SECONDS = Histogram(
+    "vocalq_tool_call_seconds",
+    "Knowledge base tool call duration",
+    ["tool"],
+    buckets=LATENCY_BUCKETS,
+)
+CALL_DURATION_SECONDS = Histogram(
+    "vocalq_call_duration_seconds",
+    "Twilio start to disconnect",
+    buckets=(10, 30, 60, 120, 300, 600, 1200, 1800, 3600),
+)
+PREWARM_SAVED_SECONDS = Histogram(
+    "vocalq_prewarm_saved_seconds",
+    "Time-to-greeting saved by the speculative connect from the Twilio webhook",
+    buckets=LATENCY_BUCKETS,
+)
+
+EVENT_LOOP_LAG_SECONDS = Histogram(
+    "vocalq_event_loop_lag_seconds",
+    "How late a periodic timer fired on the event loop",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+# --- Counters / gauges ---
+ACTIVE_CALLS = Gauge("vocalq_active_calls", "Calls currently connected")
+CALLS_TOTAL = Counter("vocalq_calls_total", "Calls started")
+TOKENS_TOTAL = Counter("vocalq_tokens_total", "OpenAI tokens used", ["source"])
+ERRORS_TOTAL = Counter("vocalq_errors_total", "Errors by type", ["type"])
+BARGE_IN_TOTAL = Counter("vocalq_barge_in_total", "Caller interruptions by detector", ["source"])
+
+# --- Realtime session pool ---
+POOL_LEASES_TOTAL = Counter("vocalq_realtime_pool_leases_total", "Session leases", ["result"])
+POOL_LEASE_SECONDS = Histogram(
+    "vocalq_realtime_pool_lease_seconds",
+    "Time to obtain a ready Realtime session",
+    buckets=LATENCY_BUCKETS,
+)
+POOL_IDLE_SESSIONS = Gauge("vocalq_realtime_pool_idle_sessions", "Warm sessions waiting in the pool")
+
+# --- Write-behind call records ---
+DB_WRITES_TOTAL = Counter("vocalq_db_writes_total", "Call record rows by write result", ["result"])
+DB_WRITE_SECONDS = Histogram(
+    "vocalq_db_write_seconds",
+    "Duration of one batched call record upsert",
+    buckets=LATENCY_BUCKETS,
+)
+DB_WRITE_QUEUE_DEPTH = Gauge("vocalq_db_write_queue_depth", "Call record updates waiting to be written")
+
+# --- Post-call processing ---
+POST_CALL_SECONDS = Histogram(
+    "vocalq_post_call_seconds",
+    "Post-call job processing time (including retries)",
+    ["status"],
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0, 120.0),
+)
+POST_CALL_QUEUE_DEPTH = Gauge("vocalq_post_call_queue_depth", "Post-call jobs waiting for a worker")
+
+# --- Knowledge-base caches (embeddings, search results) ---
+EMBEDDING_CACHE_REQUESTS_TOTAL = Counter(
+    "vocalq_embedding_cache_requests_total", "Embedding lookups by result", ["result"]
+)
+EMBEDDING_CACHE_SAVED_SECONDS = Counter(
+    "vocalq_embedding_cache_saved_seconds_total", "Estimated embedding API time saved by cache hits"
+)
+EMBEDDING_SECONDS = Histogram(
+    "vocalq_embedding_seconds",
+    "OpenAI embedding API call time (cache misses)",
+    buckets=LATENCY_BUCKETS,
+)
+
+KB_RESULT_CACHE_TOTAL = Counter(
+    "vocalq_kb_result_cache_total", "Knowledge-base searches by result-cache outcome", ["result"]
+)
+KB_SEARCH_SECONDS = Histogram(
+    "vocalq_kb_search_seconds",
+    "Vector search time (after the query embedding) by backend",
+    ["backend"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+KB_REPLICA_POINTS = Gauge("vocalq_kb_replica_points", "Points held by the in-process KB vector replica")
+
+# --- Document ingestion ---
+INGEST_CHUNKS_TOTAL = Counter("vocalq_ingest_chunks_total", "Document chunks embedded and stored")
+INGEST_BATCH_SECONDS = Histogram(
+    "vocalq_ingest_batch_seconds",
+    "Embed + bulk upsert time per ingestion batch (including retries)",
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0),
+)
+INGEST_BATCH_RETRIES_TOTAL = Counter("vocalq_ingest_batch_retries_total", "Ingestion batch retries")
+
+# --- Dashboard event stream ---
+EVENT_HUB_SUBSCRIBERS = Gauge("vocalq_event_hub_subscribers", "Dashboard connections on /api/v1/events")
+EVENT_HUB_DROPPED_TOTAL = Counter("vocalq_event_hub_dropped_total", "Dashboard subscribers disconnected for falling behind")
+
+# --- Per-call pipeline health (observed once per call) ---
+EVENT_LANE_MAX_WAIT_SECONDS = Histogram(
+    "vocalq_event_lane_max_wait_seconds",
+    "Longest time an event waited in a lane during a call",
+    ["lane"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+EVENT_LANE_MAX_DEPTH = Histogram(
+    "vocalq_event_lane_max_depth",
+    "Deepest lane queue during a call",
+    ["lane"],
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500),
+)
+SEND_QUEUE_HIGH_WATER = Histogram(
+    "vocalq_send_queue_high_water",
+    "Outbound send queue high-water mark per call",
+    ["leg"],
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500),
+)
+SEND_QUEUE_DROPPED_TOTAL = Counter("vocalq_send_queue_dropped_total", "Audio messages dropped on overflow", ["leg"])
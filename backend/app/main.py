@@ -1,11 +1,75 @@
-from fastapi import FastAPI
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from app.core.config import settings
+from app.core import metrics as app_metrics
 from app.api.api import api_router
+from app.services.realtime_orchestrator import session_pool
+from app.services.call_record_writer import call_record_writer
+from app.services.post_call_processor import post_call_processor
+from app.services.audio_service import get_openai_client
+from app.services.qdrant_service import close_qdrant_client, qdrant_service
+from app.services.embedding_cache import embedding_cache
+from app.services.document_parser import shutdown_parse_pool
+from app.services.chunker import get_token_counter
+from app.services.ingestion_jobs import ingestion_jobs
+from app.services.utterance_cache import utterance_cache
+
+
+async def _watch_event_loop_lag():
+    """Sample how late a fixed-interval sleep wakes up (blocking calls show up here)."""
+    interval = settings.LOOP_LAG_SAMPLE_MS / 1000
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        app_metrics.EVENT_LOOP_LAG_SECONDS.observe(max(0.0, time.perf_counter() - started - interval))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start/stop process-wide background services."""
+    lag_watcher = asyncio.create_task(_watch_event_loop_lag())
+    # Build the shared AsyncOpenAI client now rather than inside the first call
+    get_openai_client()
+    # Load (possibly download) the chunking tokenizer in a thread, not on the first upload's loop
+    tokenizer_warmup = asyncio.create_task(asyncio.to_thread(get_token_counter))
+    # One shared Qdrant pool; checking the collection also opens its first connection
+    await qdrant_service.ensure_collection()
+    # Optional in-process copy of the KB so call-time searches skip the network
+    await qdrant_service.load_replica()
+    replica_refresh = asyncio.create_task(qdrant_service.run_replica_refresh())
+    # Calls look up pre-rendered phrases in memory only
+    if settings.UTTERANCE_CACHE_ENABLED:
+        await asyncio.to_thread(utterance_cache.preload)
+    call_record_writer.start()
+    post_call_processor.start()
+    # Also fails rows whose process died (only once their lease has run out)
+    ingestion_jobs.start()
+    await session_pool.start()
+    yield
+    await session_pool.stop()
+    # Post-call jobs finish before the writer flushes their records
+    await post_call_processor.stop()
+    await call_record_writer.stop()
+    # Uploads in progress still need Qdrant and the parse pool
+    await ingestion_jobs.stop()
+    replica_refresh.cancel()
+    await close_qdrant_client()
+    await embedding_cache.flush()
+    embedding_cache.close()
+    await utterance_cache.flush()
+    shutdown_parse_pool()
+    tokenizer_warmup.cancel()
+    lag_watcher.cancel()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
 )
 
 # Robust File Logging for debugging
@@ -34,3 +98,7 @@ app.include_router(api_router, prefix=settings.API_V1_STR)
 def read_root():
     return {"message": "Inbound Voice Assistant Backend is Running!"}
 
+@app.get("/metrics")
+def metrics():
+    """Prometheus scrape endpoint."""
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
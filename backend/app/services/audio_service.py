@@ -1,6 +1,9 @@
 import logging
 import asyncio
+import time
 from app.core.config import settings
+from app.core import metrics
+from app.services.embedding_cache import embedding_cache
 
 logger = logging.getLogger(__name__)
 
@@ -23,15 +26,60 @@ class AudioService:
     async def get_openai_embedding(text: str) -> list:
         """
         Generate embeddings using OpenAI text-embedding-3-small (1536 dims).
-        Used for RAG/knowledge base semantic search.
+        Used for RAG/knowledge base semantic search. Served from the embedding
+        cache when the same (normalized) text was embedded before.
         """
         try:
+            if settings.EMBEDDING_CACHE_ENABLED:
+                cached = await embedding_cache.get(text)
+                if cached is not None:
+                    return cached.tolist()
             client = get_openai_client()
+            started = time.perf_counter()
             response = await client.embeddings.create(
                 input=text,
                 model=settings.EMBEDDING_MODEL
             )
-            return response.data[0].embedding
+            elapsed = time.perf_counter() - started
+            metrics.EMBEDDING_SECONDS.observe(elapsed)
+            embedding = response.data[0].embedding
+            if settings.EMBEDDING_CACHE_ENABLED:
+                # Memory now; the SQLite write runs in the background
+                embedding_cache.put(text, embedding, api_seconds=elapsed)
+            return embedding
         except Exception as e:
             logger.error(f"OpenAI Embedding failed: {e}")
             return []
+
+    @staticmethod
+    async def get_openai_embeddings(texts: list) -> list:
+        """
+        Embed a batch of texts with one multi-input request (cached texts are
+        skipped). Returns vectors in input order. Raises on API errors so the
+        caller can retry the batch. Batches are document chunks: they are cached
+        on disk only, keeping the memory tier for live-call queries.
+        """
+        vectors = [None] * len(texts)
+        if settings.EMBEDDING_CACHE_ENABLED:
+            cached = await embedding_cache.get_many(texts, memory=False)
+            vectors = [vector.tolist() if vector is not None else None for vector in cached]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if not missing:
+            return vectors
+        
+        client = get_openai_client()
+        started = time.perf_counter()
+        response = await client.embeddings.create(
+            input=[texts[i] for i in missing],
+            model=settings.EMBEDDING_MODEL
+        )
+        elapsed = time.perf_counter() - started
+        metrics.EMBEDDING_SECONDS.observe(elapsed)
+        embedded = [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+        if len(embedded) != len(missing):
+            raise ValueError(f"Expected {len(missing)} embeddings, got {len(embedded)}")
+        for i, vector in zip(missing, embedded):
+            vectors[i] = vector
+        if settings.EMBEDDING_CACHE_ENABLED:
+            await embedding_cache.put_many([texts[i] for i in missing], embedded, api_seconds=elapsed, memory=False)
+        return vectors
@@ -0,0 +1,112 @@
+"""
+Local barge-in detection - energy + zero-crossing VAD on inbound μ-law audio,
+so the AI can be interrupted without waiting for OpenAI's speech_started
+event to make the round trip.
+"""
+import numpy as np
+
+SAMPLE_RATE = 8000
+FRAME_MS = 20
+FRAME_SAMPLES = SAMPLE_RATE * FRAME_MS // 1000  # 160 samples per Twilio frame
+
+_ULAW_BIAS = 0x84
+_ULAW_CLIP = 32635
+
+# Digital silence decodes to zero; don't let it drag the noise floor to -100 dB
+_MIN_NOISE_FLOOR_DB = -70.0
+
+
+def _build_ulaw_table() -> np.ndarray:
+    """G.711 μ-law byte -> float32 sample in [-1, 1)."""
+    u = ~np.arange(256, dtype=np.int32) & 0xFF
+    exponent = (u >> 4) & 0x07
+    mantissa = u & 0x0F
+    magnitude = (((mantissa << 3) + _ULAW_BIAS) << exponent) - _ULAW_BIAS
+    pcm = np.where(u & 0x80, -magnitude, magnitude)
+    return (pcm / 32768.0).astype(np.float32)
+
+
+ULAW_TO_FLOAT = _build_ulaw_table()
+
+
+def ulaw_decode(data: bytes) -> np.ndarray:
+    """Decode μ-law bytes to float32 samples (vectorized table lookup)."""
+    return ULAW_TO_FLOAT[np.frombuffer(data, dtype=np.uint8)]
+
+
+def ulaw_encode(samples: np.ndarray) -> bytes:
+    """Encode float samples in [-1, 1] to μ-law bytes (used to synthesize test audio)."""
+    pcm = np.clip(np.asarray(samples, dtype=np.float64) * 32768.0, -32768, 32767).astype(np.int32)
+    sign = np.where(pcm < 0, 0x80, 0x00)
+    magnitude = np.minimum(np.abs(pcm), _ULAW_CLIP) + _ULAW_BIAS
+    exponent = np.floor(np.log2(magnitude)).astype(np.int32) - 7
+    exponent = np.clip(exponent, 0, 7)
+    mantissa = (magnitude >> (exponent + 3)) & 0x0F
+    return (~(sign | (exponent << 4) | mantissa) & 0xFF).astype(np.uint8).tobytes()
+
+
+class BargeInDetector:
+    """
+    Short-window speech detector. A 20 ms frame counts as speech when its energy
+    clears both an absolute floor and the tracked noise floor by a margin, and its
+    zero-crossing rate is in the voiced/fricative range (rejecting hiss and hum).
+    `min_speech_ms` of consecutive speech frames triggers once until silence resets it.
+    """
+
+    def __init__(
+        self,
+        energy_dbfs: float = -38.0,
+        noise_margin_db: float = 12.0,
+        zcr_min: float = 0.02,
+        zcr_max: float = 0.35,
+        min_speech_ms: int = 120,
+    ):
+        self.energy_dbfs = energy_dbfs
+        self.noise_margin_db = noise_margin_db
+        self.zcr_min = zcr_min
+        self.zcr_max = zcr_max
+        self.frames_needed = max(1, min_speech_ms // FRAME_MS)
+
+        self.noise_floor_db = -60.0
+        self._speech_frames = 0
+        self._triggered = False
+        self._pending = np.empty(0, dtype=np.float32)
+
+    def reset(self):
+        """Forget the current speech run (noise floor is kept)."""
+        self._speech_frames = 0
+        self._triggered = False
+
+    def process(self, ulaw: bytes) -> bool:
+        """Feed inbound μ-law audio; returns True when a barge-in is detected."""
+        samples = ulaw_decode(ulaw)
+        if self._pending.size:
+            samples = np.concatenate((self._pending, samples))
+        whole = samples.size - samples.size % FRAME_SAMPLES
+        self._pending = samples[whole:]
+        if not whole:
+            return False
+
+        frames = samples[:whole].reshape(-1, FRAME_SAMPLES)
+        energy_db = 10.0 * np.log10(np.mean(frames * frames, axis=1) + 1e-10)
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / FRAME_SAMPLES
+
+        detected = False
+        for frame_db, frame_zcr in zip(energy_db.tolist(), zcr.tolist()):
+            is_speech = (
+                frame_db > self.energy_dbfs
+                and frame_db > self.noise_floor_db + self.noise_margin_db
+                and self.zcr_min <= frame_zcr <= self.zcr_max
+            )
+            if is_speech:
+                self._speech_frames += 1
+                if self._speech_frames >= self.frames_needed and not self._triggered:
+                    self._triggered = True
+                    detected = True
+            else:
+                self._speech_frames = 0
+                self._triggered = False
+                # Track background level only on non-speech frames
+                self.noise_floor_db += 0.05 * (max(frame_db, _MIN_NOISE_FLOOR_DB) - self.noise_floor_db)
+        return detected
@@ -0,0 +1,126 @@
+"""
+Call Record Writer - write-behind persistence for `calls` rows. Orchestrators
+submit field updates without waiting; one background task coalesces them per
+call, batches them across calls into bulk upserts (run off the event loop,
+since the Supabase client is synchronous) and retries failed batches.
+"""
+import asyncio
+import logging
+import time
+
+from app.core.config import settings
+from app.core.supabase_client import supabase
+from app.core import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class CallRecordWriter:
+    """Bounded queue of `calls` upserts drained by a single writer task."""
+
+    def __init__(self, maxsize: int, batch_size: int, flush_ms: int, max_retries: int):
+        self.batch_size = batch_size
+        self.flush_interval = flush_ms / 1000
+        self.max_retries = max_retries
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self._task = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = 10.0):
+        """Flush what is queued (up to timeout), then stop the writer."""
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Call record writer stopped with {self.queue.qsize()} updates unwritten")
+        self._task.cancel()
+        self._task = None
+
+    def submit_nowait(self, call_id: str, fields: dict) -> bool:
+        """Queue an update without ever waiting; dropped (and counted) if the queue is full."""
+        try:
+            self.queue.put_nowait((call_id, fields))
+            metrics.DB_WRITE_QUEUE_DEPTH.set(self.queue.qsize())
+            return True
+        except asyncio.QueueFull:
+            logger.error(f"[{call_id}] Call record queue full - dropping update {sorted(fields)}")
+            metrics.DB_WRITES_TOTAL.labels(result="dropped").inc()
+            return False
+
+    async def submit(self, call_id: str, fields: dict):
+        """Queue an update, waiting for space (for callers that are done with the live call)."""
+        await self.queue.put((call_id, fields))
+        metrics.DB_WRITE_QUEUE_DEPTH.set(self.queue.qsize())
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = {}
+            taken = 0
+            call_id, fields = await self.queue.get()
+            pending.setdefault(call_id, {}).update(fields)
+            taken += 1
+
+            # Collect more updates until the batch is full or the flush window ends
+            deadline = loop.time() + self.flush_interval
+            while len(pending) < self.batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    call_id, fields = await asyncio.wait_for(self.queue.get(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+                pending.setdefault(call_id, {}).update(fields)
+                taken += 1
+
+            try:
+                await self._write(pending)
+            except Exception as e:
+                logger.error(f"Call record writer error: {e}", exc_info=True)
+            finally:
+                for _ in range(taken):
+                    self.queue.task_done()
+                metrics.DB_WRITE_QUEUE_DEPTH.set(self.queue.qsize())
+
+    async def _write(self, pending: dict):
+        # PostgREST bulk upserts need one column set per request
+        groups = {}
+        for call_id, fields in pending.items():
+            row = {"call_id": call_id, **fields}
+            groups.setdefault(tuple(sorted(row)), []).append(row)
+
+        for rows in groups.values():
+            for attempt in range(self.max_retries + 1):
+                started = time.perf_counter()
+                try:
+                    await asyncio.to_thread(self._upsert, rows)
+                    metrics.DB_WRITE_SECONDS.observe(time.perf_counter() - started)
+                    metrics.DB_WRITES_TOTAL.labels(result="ok").inc(len(rows))
+                    break
+                except Exception as e:
+                    if attempt == self.max_retries:
+                        logger.error(f"Call record upsert failed for {[r['call_id'] for r in rows]}: {e}")
+                        metrics.DB_WRITES_TOTAL.labels(result="failed").inc(len(rows))
+                        metrics.ERRORS_TOTAL.labels(type="db_write_failed").inc()
+                        break
+                    delay = min(0.5 * 2 ** attempt, 10.0)
+                    logger.warning(f"Call record upsert of {len(rows)} rows failed ({e}), retrying in {delay:.1f}s")
+                    metrics.DB_WRITES_TOTAL.labels(result="retry").inc(len(rows))
+                    await asyncio.sleep(delay)
+
+    @staticmethod
+    def _upsert(rows: list):
+        supabase.table("calls").upsert(rows, on_conflict="call_id").execute()
+
+
+call_record_writer = CallRecordWriter(
+    maxsize=settings.DB_WRITE_QUEUE_SIZE,
+    batch_size=settings.DB_WRITE_BATCH_SIZE,
+    flush_ms=settings.DB_WRITE_FLUSH_MS,
+    max_retries=settings.DB_WRITE_MAX_RETRIES,
+)
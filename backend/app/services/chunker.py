@@ -0,0 +1,220 @@
+"""
+Chunker - splits document text into chunks sized in embedding-model tokens.
+
+Sentences are segmented in one regex pass over whitespace-collapsed text and
+packed greedily up to max_tokens. Each chunk starts with trailing sentences of
+the previous one (at most overlap_tokens, never the whole chunk) and always
+adds at least one new sentence, so chunking moves forward and runs in linear time.
+Sentences longer than a chunk are split on word boundaries.
+
+Tokens are counted with tiktoken's encoding for EMBEDDING_MODEL; without
+tiktoken (or its encoding files) they are estimated at ~4 characters per token.
+Loading an encoding can download it, so the app warms it in a thread at startup
+and counting during ingestion runs in the parse pool or a thread.
+"""
+import logging
+import re
+from collections import deque
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Text is whitespace-collapsed first, so sentences are separated by single spaces
+SENTENCE_RE = re.compile(r'\S.*?(?:[.!?](?= )|$)')
+
+# Longest input the OpenAI embedding models accept
+MAX_EMBEDDING_TOKENS = 8191
+
+CHARS_PER_TOKEN = 4
+
+
+class TokenCounter:
+    """Token counts for one embedding model (estimated when tiktoken is unavailable)."""
+
+    def __init__(self, model: str):
+        self.model = model
+        self._encoding = _load_encoding(model)
+        self.name = self._encoding.name if self._encoding else "estimate"
+
+    def count(self, text: str) -> int:
+        if self._encoding is not None:
+            return len(self._encoding.encode_ordinary(text))
+        return -(-len(text) // CHARS_PER_TOKEN)
+
+    def split(self, text: str, max_tokens: int) -> List[str]:
+        """Pieces of at most max_tokens, cut between words (inside a word only if it alone is too long)."""
+        pieces = []
+        words = []
+        tokens = 0
+        for word in text.split(" "):
+            word_tokens = self.count(" " + word)
+            if word_tokens > max_tokens:
+                # A character is at most ~2 tokens, even in scripts without spaces
+                step = max(1, max_tokens // 2)
+                parts = [word[i:i + step] for i in range(0, len(word), step)]
+            else:
+                parts = [word]
+            for part in parts:
+                part_tokens = word_tokens if len(parts) == 1 else self.count(" " + part)
+                if words and tokens + part_tokens > max_tokens:
+                    pieces.append(" ".join(words))
+                    words = []
+                    tokens = 0
+                words.append(part)
+                tokens += part_tokens
+        if words:
+            pieces.append(" ".join(words))
+        return pieces
+
+
+def _load_encoding(model: str):
+    try:
+        import tiktoken
+    except ImportError:
+        logger.warning("tiktoken not installed; chunk token counts are estimated")
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        # Encoding files are downloaded on first use
+        logger.warning(f"tiktoken encoding for {model} unavailable ({e}); chunk token counts are estimated")
+        return None
+
+
+@lru_cache(maxsize=None)
+def get_token_counter(model: Optional[str] = None) -> TokenCounter:
+    """Shared counter for the model (default EMBEDDING_MODEL)."""
+    if model is None:
+        from app.core.config import settings
+        model = settings.EMBEDDING_MODEL
+    return TokenCounter(model)
+
+
+def split_sentences(
+    pending: str, segment: str, max_tokens: int, model: Optional[str] = None, final: bool = False
+) -> Tuple[List[Tuple[str, int]], str]:
+    """
+    The CPU-heavy half of chunking: segment pending + segment into sentences and
+    count their tokens. Returns ((piece, tokens) for each complete sentence, with
+    over-long sentences split into pieces of at most max_tokens; the unfinished
+    text to pass back in with the next segment). final=True flushes everything.
+    Pure and picklable, so ingestion runs it in the parse pool.
+    """
+    counter = get_token_counter(model)
+    piece = re.sub(r'\s+', ' ', segment)
+    if not pending:
+        piece = piece.lstrip()
+    elif pending.endswith(' ') and piece.startswith(' '):
+        piece = piece[1:]
+    buffer = pending + piece
+    if final:
+        buffer = buffer.rstrip()
+
+    sentences = []
+    consumed = 0
+    for match in SENTENCE_RE.finditer(buffer):
+        if match.end() == len(buffer) and not final:
+            # May continue in the next segment
+            break
+        sentences.append(match.group())
+        consumed = match.end()
+    buffer = buffer[consumed:].lstrip()
+    # An unfinished "sentence" longer than this is cut at a space (text with no punctuation)
+    if len(buffer) > max_tokens * CHARS_PER_TOKEN * 4:
+        cut = buffer.rfind(' ')
+        if cut > 0:
+            sentences.append(buffer[:cut])
+            buffer = buffer[cut + 1:]
+
+    pieces = []
+    for sentence in sentences:
+        # Counted with the space that joins it to the previous sentence
+        tokens = counter.count(" " + sentence)
+        if tokens > max_tokens:
+            pieces.extend((part, counter.count(" " + part)) for part in counter.split(sentence, max_tokens))
+        else:
+            pieces.append((sentence, tokens))
+    return pieces, buffer
+
+
+class TokenChunker:
+    """
+    Streaming token-budget chunker: feed() text as it is parsed and get back the
+    chunks that are final. Holds only the unfinished sentence and the open chunk.
+
+    feed() = split_sentences() + pack(); callers on the event loop run
+    split_sentences off-loop and pass its result to pack(), which only does arithmetic.
+    """
+
+    def __init__(self, max_tokens: int, overlap_tokens: int, counter: Optional[TokenCounter] = None):
+        self.max_tokens = max(1, min(max_tokens, MAX_EMBEDDING_TOKENS))
+        self.overlap_tokens = max(0, min(overlap_tokens, self.max_tokens // 2))
+        self.model = counter.model if counter else None
+        self.pending = ""            # unfinished sentence carried into the next segment
+        self._window = deque()       # (sentence, tokens) of the open chunk
+        self._window_tokens = 0
+        self._fresh = 0              # sentences in the open chunk that no earlier chunk had
+
+    def feed(self, segment: str) -> List[str]:
+        """Add the next piece of the text; returns the chunks that are now final."""
+        pieces, self.pending = split_sentences(self.pending, segment, self.max_tokens, self.model)
+        return self.pack(pieces)
+
+    def finish(self) -> List[str]:
+        """Flush the remaining text."""
+        pieces, self.pending = split_sentences(self.pending, "", self.max_tokens, self.model, final=True)
+        return self.pack(pieces, final=True)
+
+    def pack(self, pieces: List[Tuple[str, int]], final: bool = False) -> List[str]:
+        """Pack counted pieces from split_sentences; final=True also closes the open chunk."""
+        chunks = []
+        for piece, piece_tokens in pieces:
+            if self._window and self._window_tokens + piece_tokens > self.max_tokens:
+                if self._fresh:
+                    chunks.append(self._emit())
+                if self._window_tokens + piece_tokens > self.max_tokens:
+                    # The carried overlap doesn't leave room for this piece
+                    self._window.clear()
+                    self._window_tokens = 0
+            self._window.append((piece, piece_tokens))
+            self._window_tokens += piece_tokens
+            self._fresh += 1
+        if final and self._fresh:
+            chunks.append(self._emit())
+        return chunks
+
+    def _emit(self) -> str:
+        chunk = " ".join(sentence for sentence, _ in self._window)
+        # Carry trailing sentences into the next chunk: at most overlap_tokens, never the whole chunk
+        carried = deque()
+        carried_tokens = 0
+        while len(self._window) > 1 and carried_tokens + self._window[-1][1] <= self.overlap_tokens:
+            sentence, tokens = self._window.pop()
+            carried.appendleft((sentence, tokens))
+            carried_tokens += tokens
+        self._window = carried
+        self._window_tokens = carried_tokens
+        self._fresh = 0
+        return chunk
+
+
+def count_tokens(texts: List[str], model: Optional[str] = None) -> List[int]:
+    """Token count of each text (blocking: call it off the event loop)."""
+    counter = get_token_counter(model)
+    return [counter.count(text) for text in texts]
+
+
+def chunk_by_tokens(text: str, max_tokens: int, overlap_tokens: int, counter: Optional[TokenCounter] = None) -> List[str]:
+    """Chunk a whole text at once."""
+    chunker = TokenChunker(max_tokens, overlap_tokens, counter)
+    return chunker.feed(text) + chunker.finish()
+
+
+def chunk_stats(chunks: List[str], counter: TokenCounter) -> Tuple[int, float, int]:
+    """(count, mean tokens, max tokens) of a chunk list."""
+    counts = [counter.count(chunk) for chunk in chunks] or [0]
+    return len(chunks), sum(counts) / len(counts), max(counts)
@@ -1,73 +1,191 @@
 """
 Document Ingestion Service for RAG (Retrieval-Augmented Generation)
 Handles document upload, parsing, chunking, embedding, and storage in Qdrant.
+Documents and chunks are content-addressed, so re-ingesting or syncing only
+embeds chunks that changed.
 """
 
+import asyncio
 import logging
 import os
 import hashlib
+import shutil
+import time
+import uuid
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
-import PyPDF2
-from docx import Document as DocxDocument
-import re
+from typing import AsyncIterable, AsyncIterator, Callable, List, Dict, Iterable, Optional, Tuple, Union
 
-from app.services.qdrant_service import QdrantService
+from app.core.config import settings
+from app.core import metrics
+from app.services.qdrant_service import qdrant_service
 from app.services.audio_service import AudioService
+from app.services.document_parser import ParseBudget, iter_document_text, run_in_parse_pool, text_cache_dir
+from app.services.chunker import TokenChunker, chunk_by_tokens, count_tokens, split_sentences
 
 logger = logging.getLogger(__name__)
 
+# Ingestion stages
+PARSING = "parsing"    # parse and chunk (storing overlaps it as batches fill)
+STORING = "storing"    # parsing finished; last batches embedding/upserting
+SAVING = "saving"
+DONE = "done"
+FAILED = "failed"
+
+SUPPORTED_EXTENSIONS = {".pdf", ".txt", ".docx"}
+
+# Parsed text is sentence-split in the parse pool in slices of this many characters,
+# which bounds the packing done on the event loop per slice
+CHUNK_SLICE_CHARS = 64 * 1024
+
+
+@dataclass
+class IngestionProgress:
+    """Per-stage counters for one ingestion, updated as the pipeline runs."""
+    file_name: str
+    stage: str = PARSING
+    pages_total: Optional[int] = None  # PDFs only
+    pages_parsed: int = 0
+    chars_parsed: int = 0
+    chunks_created: int = 0
+    chunks_stored: int = 0      # newly embedded
+    chunks_reused: int = 0      # already stored with the same content
+    chunks_removed: int = 0
+    error: Optional[str] = None
+
+
+async def _aiter(items: Union[Iterable, AsyncIterable]) -> AsyncIterator:
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
 class DocumentIngestionService:
     """Service for ingesting documents into the RAG knowledge base."""
     
     def __init__(self):
-        self.qdrant_service = QdrantService()
-        self.chunk_size = 1000  # characters per chunk
-        self.chunk_overlap = 200  # overlap between chunks
+        self.qdrant_service = qdrant_service
+        self.chunk_max_tokens = settings.CHUNK_MAX_TOKENS  # embedding-model tokens per chunk
+        self.chunk_overlap_tokens = settings.CHUNK_OVERLAP_TOKENS  # at most this much carried into the next chunk
         self.knowledge_base_dir = Path(__file__).parent.parent.parent / "knowledge_base" / "uploaded"
         self.knowledge_base_dir.mkdir(parents=True, exist_ok=True)
         
-    async def ingest_document(self, file_path: str, file_name: str, metadata: Optional[Dict] = None) -> Dict:
+    async def ingest_document(
+        self,
+        file_path: str,
+        file_name: str,
+        metadata: Optional[Dict] = None,
+        on_progress: Optional[Callable[[IngestionProgress], None]] = None,
+        doc_id: Optional[str] = None,
+        existing: Optional[Dict[str, Tuple]] = None,
+        save: bool = True
+    ) -> Dict:
         """
         Ingest a document into the knowledge base.
+        Runs as a streaming pipeline (parse -> chunk -> embed -> upsert) so memory
+        stays bounded regardless of document size; on_progress is called with the
+        IngestionProgress whenever a stage advances.
+        
+        Incremental: point ids are content-addressed, so chunks the document already
+        has in Qdrant keep their vectors and skip embedding, and chunks it no longer
+        has are deleted. doc_id defaults to one derived from the file content;
+        existing ({point_id: (content_hash, chunking)}) is looked up when not given.
         """
+        progress = IngestionProgress(file_name=file_name)
+        
+        def report(stage: Optional[str] = None):
+            if stage:
+                progress.stage = stage
+            if on_progress:
+                try:
+                    on_progress(progress)
+                except Exception as e:
+                    logger.warning(f"Ingestion progress callback failed: {e}")
+        
         try:
             logger.info(f"Ingesting document: {file_name}")
+            report()
             
-            # Parse document
-            text = self._parse_document(file_path, file_name)
-            if not text:
-                raise ValueError(f"Could not extract text from {file_name}")
-            
-            # Chunk the document
-            chunks = self._chunk_text(text)
-            logger.info(f"Created {len(chunks)} chunks from {file_name}")
-            
-            # Create embeddings and store
-            doc_id = self._generate_doc_id(file_name)
+            content_hash = await asyncio.to_thread(self._file_hash, file_path)
+            doc_id = doc_id or self._generate_doc_id(content_hash)
+            if existing is None:
+                existing = (await self.qdrant_service.point_versions(doc_id)).get(doc_id, {})
+            version = (content_hash, self.chunking)
             
             # Prepare metadata
             doc_metadata = {
                 "source": file_name,
                 "doc_id": doc_id,
                 "category": "uploaded_document",
+                "content_hash": content_hash,
+                "chunking": self.chunking,
                 **(metadata or {})
             }
             
-            # Store chunks in Qdrant
-            point_ids = await self._store_chunks(chunks, doc_metadata)
+            # Parse, chunk and store as one pipeline (parsing runs in the process pool)
+            started = time.perf_counter()
+            wanted = set()
+            chunks = self._iter_chunks(file_path, file_name, content_hash, progress, report)
+            try:
+                stored = await self._store_chunks(
+                    self._new_chunks(chunks, doc_id, existing, wanted, progress), doc_metadata, progress, report
+                )
+            except Exception as e:
+                # Don't leave a partial document behind (chunks it already had stay)
+                try:
+                    if existing:
+                        await self.qdrant_service.delete_points(list(wanted - existing.keys()))
+                    else:
+                        await self.qdrant_service.delete_by_metadata("doc_id", doc_id)
+                except Exception:
+                    pass
+                if isinstance(e, asyncio.TimeoutError):
+                    raise ValueError(f"Parsing {file_name} took longer than {settings.PARSE_TIMEOUT_S:.0f}s")
+                raise
+            if not progress.chunks_created:
+                raise ValueError(f"Could not extract text from {file_name}")
+            
+            # Drop chunks the document no longer has; re-tag the ones it kept
+            removed = [point_id for point_id in existing if point_id not in wanted]
+            if removed:
+                await self.qdrant_service.delete_points(removed)
+            progress.chunks_removed = len(removed)
+            retag = [point_id for point_id, old_version in existing.items() if point_id in wanted and old_version != version]
+            if retag:
+                await self.qdrant_service.set_metadata(
+                    retag, {"content_hash": content_hash, "chunking": self.chunking, "source": file_name}
+                )
+            
+            elapsed = time.perf_counter() - started
+            chunks_per_second = stored / elapsed if elapsed > 0 else 0.0
+            logger.info(
+                f"Stored {stored} new chunks of {file_name} in {elapsed:.2f}s ({chunks_per_second:.1f} chunks/s); "
+                f"{progress.chunks_reused} unchanged, {len(removed)} removed"
+            )
             
             # Save original file
-            saved_path = self._save_document(file_path, file_name, doc_id)
+            saved_path = None
+            if save:
+                report(SAVING)
+                saved_path = await asyncio.to_thread(self._save_document, file_path, file_name, doc_id)
+            report(DONE)
             
             result = {
                 "success": True,
                 "file_name": file_name,
                 "doc_id": doc_id,
-                "chunks_created": len(chunks),
-                "points_stored": len(point_ids),
-                "saved_path": str(saved_path),
-                "message": f"Successfully ingested {file_name} with {len(chunks)} chunks"
+                "content_hash": content_hash,
+                "chunks_created": progress.chunks_created,
+                "points_stored": stored,
+                "chunks_reused": progress.chunks_reused,
+                "chunks_removed": len(removed),
+                "chunks_per_second": round(chunks_per_second, 1),
+                "saved_path": str(saved_path) if saved_path else None,
+                "progress": asdict(progress),
+                "message": f"Successfully ingested {file_name} with {progress.chunks_created} chunks"
             }
             
             logger.info(result["message"])
@@ -75,146 +193,227 @@ class DocumentIngestionService:
             
         except Exception as e:
             logger.error(f"Error ingesting document {file_name}: {str(e)}")
+            progress.error = str(e)
+            report(FAILED)
             return {
                 "success": False,
                 "file_name": file_name,
-                "error": str(e)
+                "error": str(e),
+                "progress": asdict(progress)
             }
     
-    def _parse_document(self, file_path: str, file_name: str) -> str:
+    async def sync_knowledge_base(self, on_document: Optional[Callable[[str, Dict], None]] = None) -> Dict:
         """
-        Parse document based on file type.
-        Supports: PDF, TXT, DOCX
+        Bring Qdrant in line with knowledge_base_dir (one folder per doc_id).
+        Documents whose chunks all carry the file's current content hash and the
+        current chunking settings are skipped without parsing; changed ones are re-ingested incrementally; documents with
+        no folder are deleted. on_document(doc_id, result) is called per document.
         """
-        file_ext = Path(file_name).suffix.lower()
+        started = time.perf_counter()
+        stats = {"unchanged": 0, "updated": 0, "failed": 0, "orphans_removed": 0,
+                 "chunks_embedded": 0, "chunks_reused": 0, "chunks_removed": 0}
+        indexed = await self.qdrant_service.point_versions()
+        live_hashes = set()
         
-        try:
-            if file_ext == ".pdf":
-                return self._parse_pdf(file_path)
-            elif file_ext == ".txt":
-                return self._parse_txt(file_path)
-            elif file_ext == ".docx":
-                return self._parse_docx(file_path)
+        doc_dirs = sorted(path for path in self.knowledge_base_dir.iterdir() if path.is_dir()) if self.knowledge_base_dir.exists() else []
+        for doc_dir in doc_dirs:
+            doc_id = doc_dir.name
+            existing = indexed.pop(doc_id, {})
+            files = sorted(path for path in doc_dir.iterdir() if path.suffix.lower() in SUPPORTED_EXTENSIONS)
+            if not files:
+                continue
+            # One document per folder; uploads save exactly one file
+            file_path = files[0]
+            content_hash = await asyncio.to_thread(self._file_hash, str(file_path))
+            live_hashes.add(content_hash)
+            if existing and set(existing.values()) == {(content_hash, self.chunking)}:
+                stats["unchanged"] += 1
+                if on_document:
+                    on_document(doc_id, {"success": True, "unchanged": True, "file_name": file_path.name})
+                continue
+            
+            result = await self.ingest_document(
+                file_path=str(file_path),
+                file_name=file_path.name,
+                doc_id=doc_id,
+                existing=existing,
+                save=False
+            )
+            if result["success"]:
+                stats["updated"] += 1
+                stats["chunks_embedded"] += result["points_stored"]
+                stats["chunks_reused"] += result["chunks_reused"]
+                stats["chunks_removed"] += result["chunks_removed"]
             else:
-                raise ValueError(f"Unsupported file format: {file_ext}")
-        except Exception as e:
-            logger.error(f"Error parsing {file_name}: {str(e)}")
-            raise
-    
-    def _parse_pdf(self, file_path: str) -> str:
-        """Extract text from PDF file."""
-        text = []
-        try:
-            with open(file_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                for page_num in range(len(reader.pages)):
-                    page = reader.pages[page_num]
-                    text.append(page.extract_text())
-            return "\n".join(text)
-        except Exception as e:
-            logger.error(f"Error parsing PDF: {str(e)}")
-            raise
-    
-    def _parse_txt(self, file_path: str) -> str:
-        """Extract text from TXT file."""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                return file.read()
-        except UnicodeDecodeError:
-            # Try with different encoding
-            with open(file_path, 'r', encoding='latin-1') as file:
-                return file.read()
+                stats["failed"] += 1
+            if on_document:
+                on_document(doc_id, result)
+        
+        # Whatever is left in the index has no folder any more
+        for doc_id, points in indexed.items():
+            await self.qdrant_service.delete_points(list(points))
+            stats["orphans_removed"] += 1
+            stats["chunks_removed"] += len(points)
+        
+        await asyncio.to_thread(self._prune_text_cache, live_hashes)
+        stats["elapsed_s"] = round(time.perf_counter() - started, 2)
+        logger.info(f"Knowledge base sync: {stats}")
+        return stats
     
-    def _parse_docx(self, file_path: str) -> str:
-        """Extract text from DOCX file."""
-        try:
-            doc = DocxDocument(file_path)
-            text = []
-            for para in doc.paragraphs:
-                if para.text.strip():
-                    text.append(para.text)
-            return "\n".join(text)
-        except Exception as e:
-            logger.error(f"Error parsing DOCX: {str(e)}")
-            raise
+    @property
+    def chunking(self) -> str:
+        """
+        Chunking settings stored with each point: a change re-chunks documents on the next sync.
+        Deliberately excludes which token counter loaded, so a tiktoken fallback doesn't re-embed the KB.
+        """
+        return f"{settings.EMBEDDING_MODEL}/{self.chunk_max_tokens}/{self.chunk_overlap_tokens}"
     
     def _chunk_text(self, text: str) -> List[str]:
+        """Split text into overlapping chunks (inline; ingestion chunks the parsed stream)."""
+        return chunk_by_tokens(text, self.chunk_max_tokens, self.chunk_overlap_tokens)
+    
+    async def _iter_chunks(
+        self, file_path: str, file_name: str, content_hash: str, progress: IngestionProgress, report: Callable
+    ) -> AsyncIterator[str]:
         """
-        Split text into chunks with overlap.
-        Uses sentence-aware chunking when possible.
+        Parse and chunk stages: chunks as soon as they are final, never the whole text.
+        Sentence splitting and token counting run in the parse pool; only packing runs here.
+        Parsing and splitting share one PARSE_TIMEOUT_S budget for the document.
         """
-        # Clean text
-        text = re.sub(r'\s+', ' ', text).strip()
+        budget = ParseBudget()
+        chunker = TokenChunker(self.chunk_max_tokens, self.chunk_overlap_tokens)
+        model = settings.EMBEDDING_MODEL
         
-        chunks = []
-        start = 0
+        def on_pages(done: int, total: int):
+            progress.pages_parsed = done
+            progress.pages_total = total
         
-        while start < len(text):
-            # Calculate end position
-            end = start + self.chunk_size
-            
-            # If not at end of text, try to split at sentence boundary
-            if end < len(text):
-                # Look for sentence boundary (., !, ?) within last 100 chars
-                last_sentence_end = max(
-                    text.rfind('. ', start, end),
-                    text.rfind('! ', start, end),
-                    text.rfind('? ', start, end)
+        async for segment in iter_document_text(file_path, file_name, on_pages, content_hash=content_hash, budget=budget):
+            for start in range(0, len(segment), CHUNK_SLICE_CHARS):
+                pieces, chunker.pending = await run_in_parse_pool(
+                    split_sentences, chunker.pending, segment[start:start + CHUNK_SLICE_CHARS], chunker.max_tokens, model,
+                    budget=budget
                 )
-                
-                if last_sentence_end > start:
-                    end = last_sentence_end + 1
-            
-            chunk = text[start:end].strip()
-            if chunk:  # Only add non-empty chunks
-                chunks.append(chunk)
-            
-            # Move start position with overlap
-            start = end - self.chunk_overlap
-            
-            # Prevent infinite loop
-            if start >= len(text) - 1:
-                break
-        
-        return chunks
+                for chunk in chunker.pack(pieces):
+                    yield chunk
+            progress.chars_parsed += len(segment)
+            report()
+        pieces, chunker.pending = await run_in_parse_pool(
+            split_sentences, chunker.pending, "", chunker.max_tokens, model, True, budget=budget
+        )
+        for chunk in chunker.pack(pieces, final=True):
+            yield chunk
     
-    async def _store_chunks(self, chunks: List[str], metadata: Dict) -> List[int]:
+    async def _new_chunks(
+        self, chunks: AsyncIterable[str], doc_id: str, existing: Dict, wanted: set, progress: IngestionProgress
+    ) -> AsyncIterator[Tuple[int, str, str]]:
+        """
+        Id stage: (chunk_index, point_id, chunk) for chunks not already stored.
+        Every chunk's point id is added to wanted; repeats of a chunk get the next occurrence's id.
         """
-        Embed and store chunks in Qdrant.
+        chunk_index = 0
+        async for chunk in chunks:
+            occurrence = 0
+            point_id = self._generate_point_id(doc_id, chunk)
+            while point_id in wanted:
+                occurrence += 1
+                point_id = self._generate_point_id(doc_id, chunk, occurrence)
+            wanted.add(point_id)
+            progress.chunks_created += 1
+            if point_id in existing:
+                progress.chunks_reused += 1
+            else:
+                yield chunk_index, point_id, chunk
+            chunk_index += 1
+    
+    async def _store_chunks(
+        self,
+        chunks: Union[Iterable[Tuple[int, str, str]], AsyncIterable[Tuple[int, str, str]]],
+        metadata: Dict,
+        progress: Optional[IngestionProgress] = None,
+        report: Optional[Callable] = None
+    ) -> int:
         """
-        point_ids = []
+        Embed and store (chunk_index, point_id, chunk) items in Qdrant as they arrive:
+        batches of INGEST_BATCH_SIZE chunks (one multi-input embedding request + one bulk
+        upsert each) go through a queue of INGEST_QUEUE_BATCHES to INGEST_MAX_CONCURRENT_BATCHES
+        workers, so a fast producer waits instead of buffering. A failing batch is retried;
+        if it still fails, ingestion fails rather than storing a partial document.
+        Returns the number of chunks stored.
+        """
+        batch_size = settings.INGEST_BATCH_SIZE
+        workers = settings.INGEST_MAX_CONCURRENT_BATCHES
+        queue = asyncio.Queue(maxsize=settings.INGEST_QUEUE_BATCHES)
+        
+        async def produce():
+            batch = []
+            async for item in _aiter(chunks):
+                batch.append(item)
+                if len(batch) == batch_size:
+                    await queue.put(batch)
+                    batch = []
+            if batch:
+                await queue.put(batch)
+            if progress and report:
+                report(STORING)
+            for _ in range(workers):
+                await queue.put(None)
         
-        for idx, chunk in enumerate(chunks):
+        async def consume() -> int:
+            stored = 0
+            while (batch := await queue.get()) is not None:
+                stored += len(await self._store_batch(batch, metadata))
+                if progress:
+                    progress.chunks_stored += len(batch)
+                if report:
+                    report()
+            return stored
+        
+        tasks = [asyncio.create_task(produce())] + [asyncio.create_task(consume()) for _ in range(workers)]
+        try:
+            counts = await asyncio.gather(*tasks)
+        except Exception:
+            # Stop the other stages before the caller cleans up the document
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return sum(counts[1:])
+    
+    async def _store_batch(self, items: List[Tuple[int, str, str]], metadata: Dict) -> List[str]:
+        """Embed and upsert one batch of (chunk_index, point_id, chunk), retrying the whole batch with backoff."""
+        started = time.perf_counter()
+        first_idx, last_idx = items[0][0], items[-1][0]
+        token_counts = await asyncio.to_thread(count_tokens, [chunk for _, _, chunk in items])
+        attempt = 0
+        while True:
             try:
-                # Generate embedding using LLM service
-                embedding = await AudioService.get_openai_embedding(chunk)
-                
-                # Create point data
-                point_id = self._generate_point_id(metadata["doc_id"], idx)
-                point_metadata = {
-                    **metadata,
-                    "chunk_index": idx,
-                    "chunk_size": len(chunk),
-                    "text_preview": chunk[:100] + "..." if len(chunk) > 100 else chunk
-                }
-                
-                # Store in Qdrant
-                await self.qdrant_service.add_point(
-                    point_id=point_id,
-                    vector=embedding,
-                    payload={
-                        "text": chunk,
-                        "metadata": point_metadata
+                embeddings = await AudioService.get_openai_embeddings([chunk for _, _, chunk in items])
+                points = []
+                for (idx, point_id, chunk), embedding, token_count in zip(items, embeddings, token_counts):
+                    point_metadata = {
+                        **metadata,
+                        "chunk_index": idx,
+                        "chunk_size": len(chunk),
+                        "token_count": token_count,
+                        "text_preview": chunk[:100] + "..." if len(chunk) > 100 else chunk
                     }
-                )
-                
-                point_ids.append(point_id)
-                
+                    points.append((point_id, embedding, {"text": chunk, "metadata": point_metadata}))
+                await self.qdrant_service.add_points(points)
+                break
             except Exception as e:
-                logger.error(f"Error embedding chunk {idx}: {str(e)}")
-                continue
+                attempt += 1
+                if attempt > settings.INGEST_BATCH_RETRIES:
+                    logger.error(f"Chunks {first_idx}-{last_idx} failed after {attempt} attempts: {e}")
+                    raise
+                delay = min(2 ** attempt, 30)
+                logger.warning(f"Chunks {first_idx}-{last_idx} failed ({e}), retry in {delay}s")
+                metrics.INGEST_BATCH_RETRIES_TOTAL.inc()
+                await asyncio.sleep(delay)
         
-        return point_ids
+        metrics.INGEST_BATCH_SECONDS.observe(time.perf_counter() - started)
+        metrics.INGEST_CHUNKS_TOTAL.inc(len(points))
+        return [point_id for point_id, _, _ in points]
     
     def _save_document(self, file_path: str, file_name: str, doc_id: str) -> Path:
         """Save uploaded document to knowledge base folder."""
@@ -225,25 +424,44 @@ class DocumentIngestionService:
             
             # Save file
             saved_path = doc_dir / file_name
-            with open(file_path, 'rb') as src:
-                with open(saved_path, 'wb') as dst:
-                    dst.write(src.read())
+            if saved_path.exists() and saved_path.resolve() == Path(file_path).resolve():
+                return saved_path
+            shutil.copyfile(file_path, saved_path)
             
             return saved_path
         except Exception as e:
             logger.error(f"Error saving document: {str(e)}")
             raise
     
-    def _generate_doc_id(self, file_name: str) -> str:
-        """Generate unique document ID based on file name and current time."""
-        import time
-        content = f"{file_name}-{time.time()}".encode()
-        return hashlib.md5(content).hexdigest()[:12]
+    def _prune_text_cache(self, live_hashes: set):
+        """Drop parsed-text cache entries for files no longer in the knowledge base."""
+        cache_dir = text_cache_dir()
+        if cache_dir is None or not cache_dir.exists():
+            return
+        for entry in cache_dir.glob("*.txt"):
+            if entry.stem not in live_hashes:
+                entry.unlink(missing_ok=True)
     
-    def _generate_point_id(self, doc_id: str, chunk_idx: int) -> int:
-        """Generate unique point ID for chunk."""
-        # Convert doc_id hex to int and add chunk index
-        return int(doc_id, 16) + chunk_idx
+    @staticmethod
+    def _file_hash(file_path: str) -> str:
+        """sha256 of the file's bytes, read in blocks."""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as file:
+            while block := file.read(1024 * 1024):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    def _generate_doc_id(self, content_hash: str) -> str:
+        """Document ID from the file's content hash: the same content always gets the same id."""
+        return content_hash[:12]
+    
+    def _generate_point_id(self, doc_id: str, chunk: str, occurrence: int = 0) -> str:
+        """
+        Point ID from the document, chunk content and embedding model: an unchanged
+        chunk keeps its point (and vector) until the model changes.
+        """
+        digest = hashlib.sha256(f"{settings.EMBEDDING_MODEL}\n{doc_id}\n{occurrence}\n{chunk}".encode()).hexdigest()
+        return str(uuid.UUID(digest[:32]))
     
     async def delete_document(self, doc_id: str) -> Dict:
         """
@@ -272,42 +490,19 @@ class DocumentIngestionService:
                 "error": str(e)
             }
     
-    def list_documents(self) -> List[Dict]:
+    async def list_documents(self) -> List[Dict]:
         """List all ingested documents from local folder and Qdrant."""
         documents = []
         seen_doc_ids = set()
         
         try:
             # First, check local knowledge base folder
-            if self.knowledge_base_dir.exists():
-                for doc_dir in self.knowledge_base_dir.iterdir():
-                    if doc_dir.is_dir():
-                        files = list(doc_dir.glob("*"))
-                        if files:
-                            documents.append({
-                                "doc_id": doc_dir.name,
-                                "files": [f.name for f in files],
-                                "file_count": len(files),
-                                "source": "local"
-                            })
-                            seen_doc_ids.add(doc_dir.name)
+            for doc in await asyncio.to_thread(self._list_local):
+                documents.append(doc)
+                seen_doc_ids.add(doc["doc_id"])
             
             # Also check Qdrant for any documents not in local folder
-            # Use synchronous approach for listing
-            import asyncio
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    # We're in an async context, use a new approach
-                    import concurrent.futures
-                    with concurrent.futures.ThreadPoolExecutor() as executor:
-                        future = executor.submit(self._list_from_qdrant_sync)
-                        qdrant_docs = future.result(timeout=5)
-                else:
-                    qdrant_docs = loop.run_until_complete(self._list_from_qdrant())
-            except RuntimeError:
-                # No event loop, create one
-                qdrant_docs = asyncio.run(self._list_from_qdrant())
+            qdrant_docs = await self._list_from_qdrant()
             
             # Add Qdrant documents not seen locally
             for doc in qdrant_docs:
@@ -320,6 +515,22 @@ class DocumentIngestionService:
             logger.error(f"Error listing documents: {str(e)}")
             return documents  # Return what we have
     
+    def _list_local(self) -> List[Dict]:
+        """Documents in the local knowledge base folder (blocking directory scan)."""
+        documents = []
+        if self.knowledge_base_dir.exists():
+            for doc_dir in self.knowledge_base_dir.iterdir():
+                if doc_dir.is_dir():
+                    files = list(doc_dir.glob("*"))
+                    if files:
+                        documents.append({
+                            "doc_id": doc_dir.name,
+                            "files": [f.name for f in files],
+                            "file_count": len(files),
+                            "source": "local"
+                        })
+        return documents
+    
     async def _list_from_qdrant(self) -> List[Dict]:
         """Fetch document list from Qdrant."""
         try:
@@ -353,8 +564,3 @@ class DocumentIngestionService:
         except Exception as e:
             logger.error(f"Error listing from Qdrant: {e}")
             return []
-    
-    def _list_from_qdrant_sync(self) -> List[Dict]:
-        """Synchronous wrapper for listing from Qdrant."""
-        import asyncio
-        return asyncio.run(self._list_from_qdrant())
@@ -0,0 +1,347 @@
+"""
+Document Parser - CPU-bound text extraction (PyPDF2, python-docx), run in a
+process pool so a large upload never blocks the event loop.
+
+Text is streamed: PDF page ranges are extracted by different workers and
+yielded in page order as they complete, so the chunker (app.services.chunker)
+never holds the whole document. A document's parse steps share one
+PARSE_TIMEOUT_S budget (ParseBudget). Ingestion also runs the chunker's sentence
+splitting and token counting here (run_in_parse_pool), against the same budget.
+Parsed text can be cached on disk by file content hash.
+
+Cancelling a step does not stop its worker process, so when a budget runs out
+the pool is retired: new steps go to a fresh pool, steps already submitted by
+other uploads finish on the old one, and its workers are terminated PARSE_TIMEOUT_S
+later (any still running by then are stuck).
+
+chunk_text is the original character-based chunker, kept as the benchmark baseline.
+
+The module-level functions run inside the worker processes; keep their imports light.
+"""
+import asyncio
+import codecs
+import logging
+import multiprocessing
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import AsyncIterator, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Text files are streamed in blocks of this many bytes/characters
+TXT_BLOCK_BYTES = 256 * 1024
+
+# Global process pool (created on first parse)
+_parse_pool = None
+
+
+# --- Worker-side functions ---
+def _init_worker(nice: int):
+    # Parsing yields the CPU to the event loop when they compete
+    if nice and hasattr(os, "nice"):
+        os.nice(nice)
+
+
+def pdf_page_count(file_path: str) -> int:
+    import PyPDF2
+    with open(file_path, 'rb') as file:
+        return len(PyPDF2.PdfReader(file).pages)
+
+
+def extract_pdf_pages(file_path: str, start: int, end: int) -> List[str]:
+    """Text of pages [start, end)."""
+    import PyPDF2
+    with open(file_path, 'rb') as file:
+        reader = PyPDF2.PdfReader(file)
+        return [reader.pages[page_num].extract_text() or "" for page_num in range(start, end)]
+
+
+def extract_docx(file_path: str) -> str:
+    from docx import Document as DocxDocument
+    doc = DocxDocument(file_path)
+    return "\n".join(para.text for para in doc.paragraphs if para.text.strip())
+
+
+def extract_txt(file_path: str) -> str:
+    try:
+        with open(file_path, 'r', encoding='utf-8') as file:
+            return file.read()
+    except UnicodeDecodeError:
+        # Try with different encoding
+        with open(file_path, 'r', encoding='latin-1') as file:
+            return file.read()
+
+
+def chunk_text(text: str, chunk_size: int, chunk_overlap: int) -> List[str]:
+    """
+    Split text into chunks with overlap.
+    Uses sentence-aware chunking when possible.
+    """
+    # Clean text
+    text = re.sub(r'\s+', ' ', text).strip()
+
+    chunks = []
+    start = 0
+
+    while start < len(text):
+        # Calculate end position
+        end = start + chunk_size
+
+        # If not at end of text, try to split at sentence boundary
+        if end < len(text):
+            # Look for sentence boundary (., !, ?) within last 100 chars
+            last_sentence_end = max(
+                text.rfind('. ', start, end),
+                text.rfind('! ', start, end),
+                text.rfind('? ', start, end)
+            )
+
+            if last_sentence_end > start:
+                end = last_sentence_end + 1
+
+        chunk = text[start:end].strip()
+        if chunk:  # Only add non-empty chunks
+            chunks.append(chunk)
+
+        # Move start position with overlap
+        start = end - chunk_overlap
+
+        # Prevent infinite loop
+        if start >= len(text) - 1:
+            break
+
+    return chunks
+
+
+# --- Event-loop side ---
+def _worker_count() -> int:
+    from app.core.config import settings
+    return settings.PARSE_WORKERS or os.cpu_count() or 1
+
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    """Get or create the shared parsing pool."""
+    global _parse_pool
+    if _parse_pool is None:
+        # spawn: never fork a process that has an event loop and threads running
+        from app.core.config import settings
+        _parse_pool = ProcessPoolExecutor(
+            max_workers=_worker_count(),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(settings.PARSE_WORKER_NICE,)
+        )
+        logger.info(f"Document parse pool started ({_worker_count()} workers)")
+    return _parse_pool
+
+
+def shutdown_parse_pool():
+    global _parse_pool
+    if _parse_pool is not None:
+        _parse_pool.shutdown(wait=False, cancel_futures=True)
+        _parse_pool = None
+
+
+def _retire_parse_pool():
+    """Replace the pool after a timeout; the old one's stuck workers are terminated later."""
+    global _parse_pool
+    pool, _parse_pool = _parse_pool, None
+    if pool is None:
+        return
+    from app.core.config import settings
+    processes = list((pool._processes or {}).values())
+    pool.shutdown(wait=False)
+    asyncio.get_running_loop().call_later(settings.PARSE_TIMEOUT_S, _terminate_workers, processes)
+    logger.error("Document parse timed out; retired the parse pool")
+
+
+def _terminate_workers(processes: list):
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+
+
+async def _run(func, *args):
+    pool = get_parse_pool()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM on a hostile PDF); start a fresh pool for the next upload
+        # (unless this was a retired pool, already replaced)
+        if pool is _parse_pool:
+            logger.error("Document parse pool broke; restarting it")
+            shutdown_parse_pool()
+        raise
+
+
+class ParseBudget:
+    """
+    One document's parse time limit (PARSE_TIMEOUT_S by default), shared by all of its
+    steps. Counts the time spent waiting on parse results, not time the pipeline spends
+    downstream (embedding, storage) while workers run ahead.
+    """
+
+    def __init__(self, seconds: Optional[float] = None):
+        from app.core.config import settings
+        self.seconds = settings.PARSE_TIMEOUT_S if seconds is None else seconds
+        self.remaining = self.seconds
+
+    async def wait(self, awaitable):
+        """Await a parse result; asyncio.TimeoutError once the budget is spent."""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        try:
+            return await asyncio.wait_for(awaitable, timeout=max(self.remaining, 0))
+        except asyncio.TimeoutError:
+            _retire_parse_pool()
+            raise
+        finally:
+            self.remaining -= loop.time() - started
+
+
+async def _step(budget: ParseBudget, func, *args):
+    """One pool call, charged to the document's budget."""
+    return await budget.wait(_run(func, *args))
+
+
+async def run_in_parse_pool(func, *args, budget: Optional[ParseBudget] = None):
+    """Run a module-level (picklable) CPU-bound function in the parse pool, charged to `budget`."""
+    return await _step(budget or ParseBudget(), func, *args)
+
+
+async def _iter_pdf(file_path: str, budget: ParseBudget, on_pages: Optional[Callable] = None) -> AsyncIterator[str]:
+    """Page ranges extracted by the pool (one range per worker in flight), yielded in page order."""
+    from app.core.config import settings
+    pages = await _step(budget, pdf_page_count, file_path)
+    per_task = settings.PARSE_MIN_PAGES_PER_TASK
+    starts = iter(range(0, pages, per_task))
+    in_flight = deque()
+
+    def submit_next():
+        start = next(starts, None)
+        if start is not None:
+            end = min(start + per_task, pages)
+            in_flight.append((end, asyncio.ensure_future(_run(extract_pdf_pages, file_path, start, end))))
+
+    try:
+        for _ in range(_worker_count()):
+            submit_next()
+        separator = ""
+        while in_flight:
+            end, task = in_flight.popleft()
+            page_texts = await budget.wait(task)
+            # Refill before yielding so workers stay busy while downstream stages run
+            submit_next()
+            if on_pages:
+                on_pages(end, pages)
+            yield separator + "\n".join(page_texts)
+            separator = "\n"
+    finally:
+        # On timeout/error/early exit, drop ranges that haven't been consumed
+        for _, task in in_flight:
+            task.cancel()
+
+
+def _txt_encoding(file_path: str) -> str:
+    """utf-8 if the whole file decodes, else latin-1 (checked incrementally, not loaded)."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    try:
+        with open(file_path, 'rb') as file:
+            while block := file.read(TXT_BLOCK_BYTES):
+                decoder.decode(block)
+            decoder.decode(b"", final=True)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "latin-1"
+
+
+async def _iter_txt(file_path: str, encoding: Optional[str] = None) -> AsyncIterator[str]:
+    encoding = encoding or await asyncio.to_thread(_txt_encoding, file_path)
+    file = await asyncio.to_thread(open, file_path, 'r', encoding=encoding)
+    try:
+        while block := await asyncio.to_thread(file.read, TXT_BLOCK_BYTES):
+            yield block
+    finally:
+        file.close()
+
+
+async def _iter_parsed(
+    file_path: str, file_name: str, budget: ParseBudget, on_pages: Optional[Callable] = None
+) -> AsyncIterator[str]:
+    file_ext = Path(file_name).suffix.lower()
+    if file_ext == ".pdf":
+        async for segment in _iter_pdf(file_path, budget, on_pages):
+            yield segment
+    elif file_ext == ".txt":
+        async for segment in _iter_txt(file_path):
+            yield segment
+    elif file_ext == ".docx":
+        # python-docx loads the whole package anyway
+        yield await _step(budget, extract_docx, file_path)
+    else:
+        raise ValueError(f"Unsupported file format: {file_ext}")
+
+
+def text_cache_dir() -> Optional[Path]:
+    """Parsed-text cache directory (entries are <file sha256>.txt), or None when disabled."""
+    from app.core.config import settings
+    return Path(settings.KB_TEXT_CACHE_DIR) if settings.KB_TEXT_CACHE_DIR else None
+
+
+def text_cache_path(content_hash: str) -> Optional[Path]:
+    cache_dir = text_cache_dir()
+    return cache_dir / f"{content_hash}.txt" if cache_dir else None
+
+
+async def iter_document_text(
+    file_path: str,
+    file_name: str,
+    on_pages: Optional[Callable] = None,
+    content_hash: Optional[str] = None,
+    budget: Optional[ParseBudget] = None
+) -> AsyncIterator[str]:
+    """
+    Stream a document's text in segments, extracted off the event loop.
+    Segments concatenate to the full text (they carry their own separators).
+    Supports: PDF (page ranges), TXT (blocks), DOCX (whole document).
+    on_pages(done, total) reports PDF progress. Raises ValueError for other
+    formats and asyncio.TimeoutError once parsing has used up `budget` (a fresh
+    PARSE_TIMEOUT_S budget for the whole document by default).
+
+    With content_hash (the file's sha256), text is read from / written to the
+    parsed-text cache (KB_TEXT_CACHE_DIR), so a file is parsed once per content.
+    """
+    budget = budget or ParseBudget()
+    cache_path = text_cache_path(content_hash) if content_hash else None
+    if cache_path is not None and await asyncio.to_thread(cache_path.exists):
+        async for segment in _iter_txt(str(cache_path), encoding="utf-8"):
+            yield segment
+        return
+    if cache_path is None:
+        async for segment in _iter_parsed(file_path, file_name, budget, on_pages):
+            yield segment
+        return
+
+    # Tee into a temp file; it only becomes the cache entry once the whole document parsed
+    await asyncio.to_thread(cache_path.parent.mkdir, parents=True, exist_ok=True)
+    partial_path = cache_path.with_suffix(f".{os.getpid()}.partial")
+    cache_file = await asyncio.to_thread(open, partial_path, 'w', encoding='utf-8')
+    complete = False
+    try:
+        async for segment in _iter_parsed(file_path, file_name, budget, on_pages):
+            await asyncio.to_thread(cache_file.write, segment)
+            yield segment
+        complete = True
+    finally:
+        cache_file.close()
+        try:
+            if complete:
+                os.replace(partial_path, cache_path)
+            else:
+                os.remove(partial_path)
+        except OSError as e:
+            logger.warning(f"Parsed-text cache update failed: {e}")
@@ -0,0 +1,240 @@
+"""
+Embedding Cache - two-tier cache of OpenAI embeddings keyed by normalized text
+and embedding model: an in-memory LRU in front of a SQLite file that survives
+restarts. Vectors are kept as float32 arrays (raw bytes on disk).
+
+Shared by knowledge-base search and ingestion through
+AudioService.get_openai_embedding / get_openai_embeddings. Ingestion batches
+use the SQLite tier only (memory=False), so an upload never evicts the query
+vectors live calls depend on. The SQLite tier is pruned, oldest first, to
+EMBEDDING_CACHE_MAX_ROWS rows and EMBEDDING_CACHE_MAX_AGE_DAYS.
+
+A query's vector (put) is written to disk by a background writer, which batches
+whatever has queued up into one transaction; the caller only updates memory.
+"""
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.core import metrics
+
+logger = logging.getLogger(__name__)
+
+# Rows written between two prunes of the SQLite tier
+PRUNE_EVERY_ROWS = 1000
+
+
+def normalize_text(text: str) -> str:
+    """Queries differing only in case or spacing share an embedding."""
+    return " ".join(text.lower().split())
+
+
+class EmbeddingCache:
+    """Memory LRU + SQLite store of float32 embedding vectors."""
+
+    def __init__(self, path: str, max_memory: int, max_rows: int = 0, max_age_days: float = 0):
+        self.path = Path(path)
+        self.max_memory = max_memory
+        self.max_rows = max_rows            # 0 = unbounded
+        self.max_age_days = max_age_days    # 0 = never expire
+        self._memory = OrderedDict()
+        self._db = None
+        self._db_lock = threading.Lock()
+        self._rows_since_prune = PRUNE_EVERY_ROWS  # prune on the first write
+        self._pending_rows = []
+        self._writer = None
+        # Running average of an API embedding call, credited as saved on each hit
+        self._api_seconds = 0.3
+
+    def _key(self, text: str, model: str) -> str:
+        return hashlib.sha1(f"{model}\n{normalize_text(text)}".encode()).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, model TEXT NOT NULL, dim INTEGER NOT NULL, "
+                "vector BLOB NOT NULL, created_at REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS embeddings_created_at ON embeddings (created_at)")
+            self._db = db
+        return self._db
+
+    def _read(self, key: str) -> Optional[np.ndarray]:
+        with self._db_lock:
+            row = self._connect().execute("SELECT vector FROM embeddings WHERE key = ?", (key,)).fetchone()
+        return np.frombuffer(row[0], dtype=np.float32) if row else None
+
+    def _read_many(self, keys: list) -> dict:
+        found = {}
+        with self._db_lock:
+            db = self._connect()
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                rows = db.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(batch))})", batch
+                ).fetchall()
+                found.update((key, np.frombuffer(blob, dtype=np.float32)) for key, blob in rows)
+        return found
+
+    def _write(self, rows: list):
+        """rows: (key, model, vector) tuples, written in one transaction."""
+        now = time.time()
+        with self._db_lock:
+            db = self._connect()
+            db.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, model, dim, vector, created_at) VALUES (?, ?, ?, ?, ?)",
+                [(key, model, len(vector), vector.tobytes(), now) for key, model, vector in rows]
+            )
+            db.commit()
+            self._rows_since_prune += len(rows)
+            if self._rows_since_prune >= PRUNE_EVERY_ROWS:
+                self._rows_since_prune = 0
+                self._prune(db, now)
+
+    def _prune(self, db: sqlite3.Connection, now: float):
+        """Drop rows past max_age_days, then the oldest rows beyond max_rows (caller holds the lock)."""
+        removed = 0
+        if self.max_age_days:
+            removed += db.execute(
+                "DELETE FROM embeddings WHERE created_at < ?", (now - self.max_age_days * 86400,)
+            ).rowcount
+        if self.max_rows:
+            excess = db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0] - self.max_rows
+            if excess > 0:
+                removed += db.execute(
+                    "DELETE FROM embeddings WHERE key IN "
+                    "(SELECT key FROM embeddings ORDER BY created_at LIMIT ?)", (excess,)
+                ).rowcount
+        db.commit()
+        if removed:
+            logger.info(f"Embedding cache pruned {removed} rows")
+
+    def _remember(self, key: str, vector: np.ndarray):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory:
+            self._memory.popitem(last=False)
+
+    async def get(self, text: str, model: str = None) -> Optional[np.ndarray]:
+        """Cached vector for the text, from memory or disk; None on a miss."""
+        key = self._key(text, model or settings.EMBEDDING_MODEL)
+        vector = self._memory.get(key)
+        if vector is not None:
+            self._memory.move_to_end(key)
+            self._record("memory_hit")
+            return vector
+        try:
+            vector = await asyncio.to_thread(self._read, key)
+        except Exception as e:
+            logger.warning(f"Embedding cache read failed: {e}")
+            vector = None
+        if vector is None:
+            metrics.EMBEDDING_CACHE_REQUESTS_TOTAL.labels(result="miss").inc()
+            return None
+        self._remember(key, vector)
+        self._record("disk_hit")
+        return vector
+
+    async def get_many(self, texts: list, model: str = None, memory: bool = True) -> list:
+        """
+        Cached vectors for a batch of texts (None for misses), one disk lookup for the batch.
+        memory=False leaves the memory LRU as it was (disk hits aren't promoted into it).
+        """
+        keys = [self._key(text, model or settings.EMBEDDING_MODEL) for text in texts]
+        vectors = [self._memory.get(key) for key in keys]
+        for key, vector in zip(keys, vectors):
+            if vector is not None:
+                if memory:
+                    self._memory.move_to_end(key)
+                self._record("memory_hit")
+        missing = [key for key, vector in zip(keys, vectors) if vector is None]
+        if missing:
+            try:
+                found = await asyncio.to_thread(self._read_many, missing)
+            except Exception as e:
+                logger.warning(f"Embedding cache read failed: {e}")
+                found = {}
+            for i, key in enumerate(keys):
+                if vectors[i] is None and key in found:
+                    vectors[i] = found[key]
+                    if memory:
+                        self._remember(key, found[key])
+                    self._record("disk_hit")
+            metrics.EMBEDDING_CACHE_REQUESTS_TOTAL.labels(result="miss").inc(len(missing) - len(found))
+        return vectors
+
+    def put(self, text: str, vector, model: str = None, api_seconds: float = None):
+        """Store a freshly computed vector in memory now; the disk write runs in the background."""
+        rows = self._rows([text], [vector], model or settings.EMBEDDING_MODEL, api_seconds, memory=True)
+        self._pending_rows.extend(rows)
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.create_task(self._drain())
+
+    async def put_many(
+        self, texts: list, vectors: list, model: str = None, api_seconds: float = None, memory: bool = True
+    ):
+        """Store freshly computed vectors (one API request's worth) on disk, and in memory unless memory=False."""
+        rows = self._rows(texts, vectors, model or settings.EMBEDDING_MODEL, api_seconds, memory)
+        try:
+            await asyncio.to_thread(self._write, rows)
+        except Exception as e:
+            logger.warning(f"Failed to persist embedding cache entries: {e}")
+
+    async def flush(self):
+        """Wait for queued background writes (shutdown)."""
+        if self._writer is not None:
+            await self._writer
+
+    def _rows(self, texts: list, vectors: list, model: str, api_seconds: Optional[float], memory: bool) -> list:
+        rows = []
+        for text, vector in zip(texts, vectors):
+            key = self._key(text, model)
+            vector = np.asarray(vector, dtype=np.float32)
+            if memory:
+                self._remember(key, vector)
+            rows.append((key, model, vector))
+        if api_seconds is not None:
+            self._api_seconds = 0.9 * self._api_seconds + 0.1 * api_seconds
+        return rows
+
+    async def _drain(self):
+        """Background writer: everything queued since the last write goes in one transaction."""
+        while self._pending_rows:
+            rows, self._pending_rows = self._pending_rows, []
+            try:
+                await asyncio.to_thread(self._write, rows)
+            except Exception as e:
+                logger.warning(f"Failed to persist embedding cache entries: {e}")
+
+    def _record(self, result: str):
+        metrics.EMBEDDING_CACHE_REQUESTS_TOTAL.labels(result=result).inc()
+        metrics.EMBEDDING_CACHE_SAVED_SECONDS.inc(self._api_seconds)
+
+    def close(self):
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+embedding_cache = EmbeddingCache(
+    settings.EMBEDDING_CACHE_PATH,
+    settings.EMBEDDING_CACHE_SIZE,
+    max_rows=settings.EMBEDDING_CACHE_MAX_ROWS,
+    max_age_days=settings.EMBEDDING_CACHE_MAX_AGE_DAYS
+)
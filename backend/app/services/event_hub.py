@@ -0,0 +1,116 @@
+"""
+Event Hub - in-process broadcast of live call events to dashboard subscribers
+(/api/v1/events).
+
+Calls publish `call_started`, `transcript_update` and `call_ended`; events are
+buffered and flushed once per tick as a single JSON array, serialized once and
+fanned out to every subscriber. Consecutive transcript deltas of a call within
+a tick are merged into one event. Publishing never waits on a subscriber: each
+one has a bounded queue of ticks and is dropped when it falls too far behind.
+
+The hub also keeps the active calls (with transcripts) so a new subscriber
+starts from a `snapshot` event. Transcript deltas carry the index of their
+first entry, so replaying one the snapshot already contains is harmless.
+"""
+import asyncio
+import json
+import logging
+from typing import Optional
+
+from app.core.config import settings
+from app.core import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class Subscriber:
+    """One dashboard connection: a bounded queue of serialized ticks."""
+
+    def __init__(self, maxsize: int):
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = False
+
+    async def next(self) -> Optional[str]:
+        """Next serialized tick, or None once the hub has dropped this subscriber."""
+        if self.dropped:
+            return None
+        return await self.queue.get()
+
+
+class EventHub:
+    """Tick-coalesced fan-out of call events."""
+
+    def __init__(self, tick_ms: int, subscriber_queue: int):
+        self.tick = tick_ms / 1000
+        self.subscriber_queue = subscriber_queue
+        self.subscribers = set()
+        self.calls = {}          # call_id -> dashboard call dict (with transcript)
+        self._pending = []       # events of the current tick
+        self._last_delta = {}    # call_id -> transcript_update event open for merging this tick
+        self._flush_handle = None
+
+    def subscribe(self) -> Subscriber:
+        subscriber = Subscriber(self.subscriber_queue)
+        snapshot = [{"type": "snapshot", "data": {"calls": list(self.calls.values())}}]
+        subscriber.queue.put_nowait(json.dumps(snapshot))
+        self.subscribers.add(subscriber)
+        metrics.EVENT_HUB_SUBSCRIBERS.set(len(self.subscribers))
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self.subscribers.discard(subscriber)
+        metrics.EVENT_HUB_SUBSCRIBERS.set(len(self.subscribers))
+
+    def publish_call_started(self, call_id: str, call: dict):
+        self.calls[call_id] = {**call, "transcript": list(call.get("transcript") or [])}
+        self._publish({"type": "call_started", "data": self.calls[call_id]})
+
+    def publish_transcript(self, call_id: str, index: int, entries: list):
+        """Entries replace (or append to) the call's transcript starting at `index`."""
+        call = self.calls.get(call_id)
+        if call is not None:
+            call["transcript"][index:index + len(entries)] = entries
+        if not self.subscribers:
+            return
+        last = self._last_delta.get(call_id)
+        if last and last["data"]["index"] + len(last["data"]["entries"]) == index:
+            last["data"]["entries"].extend(entries)
+            return
+        event = {"type": "transcript_update", "data": {"call_id": call_id, "index": index, "entries": list(entries)}}
+        self._last_delta[call_id] = event
+        self._publish(event)
+
+    def publish_call_ended(self, call_id: str, data: dict):
+        self.calls.pop(call_id, None)
+        self._last_delta.pop(call_id, None)
+        self._publish({"type": "call_ended", "data": {"id": call_id, **data}})
+
+    def _publish(self, event: dict):
+        if not self.subscribers:
+            return
+        self._pending.append(event)
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.tick, self._flush)
+
+    def _flush(self):
+        self._flush_handle = None
+        events, self._pending = self._pending, []
+        self._last_delta.clear()
+        if not events or not self.subscribers:
+            return
+        message = json.dumps(events)
+        for subscriber in list(self.subscribers):
+            try:
+                subscriber.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Never let a slow dashboard hold events (or memory) for everyone else
+                subscriber.dropped = True
+                self.unsubscribe(subscriber)
+                metrics.EVENT_HUB_DROPPED_TOTAL.inc()
+                logger.warning(f"Dropped dashboard subscriber ({self.subscriber_queue} ticks behind)")
+
+
+event_hub = EventHub(
+    tick_ms=settings.EVENT_HUB_TICK_MS,
+    subscriber_queue=settings.EVENT_HUB_SUBSCRIBER_QUEUE,
+)
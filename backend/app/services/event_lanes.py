@@ -0,0 +1,79 @@
+"""
+Event lanes - per-call queues with a dedicated worker task each, so slow
+Realtime event handlers (KB search, transliteration, DB work) never stall
+latency-critical audio forwarding.
+"""
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Sentinel telling a lane worker to exit once everything queued before it is handled
+_STOP = object()
+
+
+class EventLane:
+    """Unbounded FIFO drained by a single worker task calling `handler(event)`."""
+
+    def __init__(self, name: str, handler, call_id: str = ""):
+        self.name = name
+        self.handler = handler
+        self.call_id = call_id
+        self.queue = asyncio.Queue()
+        self.task = None
+
+        # Stats
+        self.processed = 0
+        self.max_depth = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self._run())
+
+    def put(self, event):
+        """Enqueue an event without blocking the reader."""
+        self.queue.put_nowait((time.perf_counter(), event))
+        depth = self.queue.qsize()
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    async def stop(self, timeout: float = None):
+        """Let the worker finish what is queued (up to `timeout`), then cancel it."""
+        if self.task is None:
+            return
+        self.queue.put_nowait((time.perf_counter(), _STOP))
+        try:
+            await asyncio.wait_for(self.task, timeout=timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            pass
+        self.task = None
+
+    def stats(self) -> dict:
+        return {
+            "depth": self.queue.qsize(),
+            "max_depth": self.max_depth,
+            "processed": self.processed,
+            "avg_wait_ms": round(self.total_wait_ms / self.processed, 3) if self.processed else 0.0,
+            "max_wait_ms": round(self.max_wait_ms, 3),
+        }
+
+    async def _run(self):
+        while True:
+            enqueued_at, event = await self.queue.get()
+            if event is _STOP:
+                return
+
+            # Time spent queued behind earlier events in this lane
+            wait_ms = (time.perf_counter() - enqueued_at) * 1000
+            self.total_wait_ms += wait_ms
+            if wait_ms > self.max_wait_ms:
+                self.max_wait_ms = wait_ms
+
+            try:
+                await self.handler(event)
+            except Exception as e:
+                logger.error(f"[{self.call_id}] {self.name} lane handler error: {e}", exc_info=True)
+            self.processed += 1
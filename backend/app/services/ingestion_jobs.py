@@ -0,0 +1,312 @@
+"""
+Ingestion Jobs - uploads are queued here and ingested in the background by a
+fixed pool of worker tasks, so the upload request returns as soon as the file
+is on disk. Each job's progress is kept in memory and written back to its
+knowledge_base_documents row (status, chunk_count, vector_count); the job id is
+that row's id.
+
+Uploads are deduplicated by content (doc_id): one that matches a document being
+ingested joins that job, and one that matches a ready document returns it.
+Jobs live in their process only. Each process refreshes its jobs' rows
+(updated_at) every INGEST_JOB_HEARTBEAT_S; a "processing" row not refreshed for
+INGEST_JOB_LEASE_S belonged to a process that died and is marked failed
+(fail_orphaned_rows). Rows other workers are ingesting right now are left alone.
+"""
+import asyncio
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from app.core.config import settings
+from app.core.supabase_client import supabase
+from app.services.document_ingestion_service import DocumentIngestionService, IngestionProgress
+
+logger = logging.getLogger(__name__)
+
+# Job statuses (PROCESSING/READY/FAILED are also the knowledge_base_documents statuses)
+QUEUED = "queued"
+PROCESSING = "processing"
+READY = "ready"
+FAILED = "failed"
+
+
+@dataclass
+class IngestionJob:
+    """One uploaded file waiting for, or going through, ingestion."""
+    doc_id: str                  # content-hash document id
+    file_path: str               # temp copy of the upload; removed when the job finishes
+    file_name: str
+    file_size: int
+    metadata: dict
+    status: str = QUEUED
+    progress: Optional[IngestionProgress] = None
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    queued_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    job_id: str = field(default_factory=lambda: str(uuid.uuid4()))  # knowledge_base_documents.id
+
+    def summary(self) -> dict:
+        info = asdict(self)
+        info.pop("file_path")
+        return info
+
+
+class IngestionJobQueue:
+    """Bounded upload queue drained by `concurrency` worker tasks."""
+
+    def __init__(self, service: DocumentIngestionService, concurrency: int, maxsize: int, keep_jobs: int = 200):
+        self.service = service
+        self.concurrency = concurrency
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.keep_jobs = keep_jobs
+        self.jobs = OrderedDict()
+        self._active = {}            # doc_id -> its queued or processing job
+        self._workers = []
+        self._heartbeat_task = None
+
+    def start(self):
+        if not self._workers:
+            self._workers = [asyncio.create_task(self._worker(i)) for i in range(self.concurrency)]
+        if self._heartbeat_task is None:
+            self._heartbeat_task = asyncio.create_task(self._heartbeat())
+
+    async def stop(self, timeout: float = 30.0):
+        """Finish queued jobs (up to timeout), then stop the workers."""
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Ingestion queue stopped with {self.queue.qsize()} jobs pending")
+        for worker in self._workers:
+            worker.cancel()
+        self._workers = []
+        if self._heartbeat_task:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+
+    async def fail_orphaned_rows(self):
+        """Mark "processing" rows whose lease ran out (their process died) as failed."""
+        cutoff = (datetime.now(timezone.utc) - timedelta(seconds=settings.INGEST_JOB_LEASE_S)).isoformat()
+        try:
+            response = await asyncio.to_thread(
+                lambda: supabase.table("knowledge_base_documents")
+                .update({"status": FAILED}).eq("status", PROCESSING).lt("updated_at", cutoff).execute()
+            )
+            if response.data:
+                logger.warning(f"Marked {len(response.data)} interrupted ingestion(s) as failed")
+        except Exception as e:
+            logger.warning(f"Failed to clean up interrupted ingestions: {e}")
+
+    async def submit(self, job: IngestionJob) -> IngestionJob:
+        """
+        Record the job as processing and queue it; returns the job covering the upload.
+        When the same content is already queued, processing or ready, that job (or a
+        READY job standing for the document) is returned instead and the caller still
+        owns the file. Raises asyncio.QueueFull when the queue is full (likewise).
+        """
+        active = self._active.get(job.doc_id)
+        if active is not None:
+            return active
+        if self.queue.full():
+            raise asyncio.QueueFull()
+        # Registered before any await, so a concurrent upload of the same content joins this job
+        self._active[job.doc_id] = job
+        try:
+            row = await self._document_row(job.doc_id)
+            if row and (row.get("status") == READY or row.get("status") == PROCESSING and not _lease_expired(row)):
+                # Ready, or being ingested by another process
+                self._active.pop(job.doc_id, None)
+                return IngestionJob(
+                    doc_id=job.doc_id,
+                    file_path="",
+                    file_name=row.get("filename") or job.file_name,
+                    file_size=row.get("file_size") or job.file_size,
+                    metadata=row.get("metadata") or {},
+                    status=row["status"],
+                    job_id=row["id"]
+                )
+            # The row exists before a worker can update it; a failed or orphaned attempt's row is replaced
+            await self._write_row(job, insert=True, replace=row is not None)
+            try:
+                self.queue.put_nowait(job)
+            except asyncio.QueueFull:
+                job.status = FAILED
+                job.error = "Ingestion queue is full"
+                await self._write_row(job)
+                raise
+        except BaseException:
+            self._active.pop(job.doc_id, None)
+            raise
+        self.jobs[job.job_id] = job
+        while len(self.jobs) > self.keep_jobs:
+            self.jobs.popitem(last=False)
+        return job
+
+    def get(self, job_id: str) -> Optional[IngestionJob]:
+        return self.jobs.get(job_id)
+
+    def stats(self) -> dict:
+        counts = {}
+        for job in self.jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            "concurrency": self.concurrency,
+            "queued": self.queue.qsize(),
+            "jobs": counts,
+            "recent": [job.summary() for job in list(self.jobs.values())[-20:]],
+        }
+
+    async def _heartbeat(self):
+        """Keep this process's job rows leased and fail rows whose process died."""
+        while True:
+            job_ids = [job.job_id for job in self._active.values()]
+            if job_ids:
+                try:
+                    await asyncio.to_thread(
+                        lambda: supabase.table("knowledge_base_documents")
+                        .update({"updated_at": _now()}).in_("id", job_ids).execute()
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to refresh ingestion job leases: {e}")
+            await self.fail_orphaned_rows()
+            await asyncio.sleep(settings.INGEST_JOB_HEARTBEAT_S)
+
+    async def _worker(self, index: int):
+        while True:
+            job = await self.queue.get()
+            try:
+                await self._process(job)
+            except Exception as e:
+                logger.error(f"[{job.job_id}] Ingestion worker {index} error: {e}", exc_info=True)
+                job.status = FAILED
+                job.error = str(e)
+                job.finished_at = time.time()
+                await self._write_row(job)
+            finally:
+                self._active.pop(job.doc_id, None)
+                self._remove_file(job)
+                self.queue.task_done()
+
+    async def _process(self, job: IngestionJob):
+        job.status = PROCESSING
+        job.started_at = time.time()
+        last_write = 0.0
+        pending_write = None
+
+        def on_progress(progress: IngestionProgress):
+            nonlocal last_write, pending_write
+            job.progress = progress
+            # Throttled: one row update at a time, at most every INGEST_JOB_PROGRESS_INTERVAL_S
+            now = time.monotonic()
+            if now - last_write >= settings.INGEST_JOB_PROGRESS_INTERVAL_S and (pending_write is None or pending_write.done()):
+                last_write = now
+                pending_write = asyncio.create_task(self._write_row(job))
+
+        result = await self.service.ingest_document(
+            file_path=job.file_path,
+            file_name=job.file_name,
+            metadata=job.metadata,
+            on_progress=on_progress,
+            doc_id=job.doc_id
+        )
+        if pending_write is not None:
+            await pending_write
+        job.result = result
+        job.status = READY if result.get("success") else FAILED
+        job.error = result.get("error")
+        job.finished_at = time.time()
+        await self._write_row(job)
+        logger.info(f"[{job.job_id}] Ingestion {job.status} for {job.file_name} in {job.finished_at - job.started_at:.1f}s")
+
+    async def _document_row(self, doc_id: str) -> Optional[dict]:
+        """The knowledge_base_documents row for the content, if any (None when Supabase is unreachable)."""
+        try:
+            response = await asyncio.to_thread(
+                lambda: supabase.table("knowledge_base_documents")
+                .select("id, filename, file_size, status, metadata, updated_at").eq("doc_id", doc_id).limit(1).execute()
+            )
+        except Exception as e:
+            logger.warning(f"[{doc_id}] Failed to look up document in Supabase: {e}")
+            return None
+        return response.data[0] if response.data else None
+
+    async def _write_row(self, job: IngestionJob, insert: bool = False, replace: bool = False):
+        """Mirror the job into knowledge_base_documents (tracking only; failures are logged)."""
+        progress = job.progress
+        fields = {
+            "status": FAILED if job.status == FAILED else READY if job.status == READY else PROCESSING,
+            "chunk_count": progress.chunks_created if progress else 0,
+            "vector_count": progress.chunks_stored + progress.chunks_reused if progress else 0,
+            "updated_at": _now(),
+        }
+        try:
+            if replace:
+                await asyncio.to_thread(
+                    lambda: supabase.table("knowledge_base_documents").delete().eq("doc_id", job.doc_id).execute()
+                )
+            if insert:
+                await asyncio.to_thread(
+                    lambda: supabase.table("knowledge_base_documents").insert({
+                        "id": job.job_id,
+                        "doc_id": job.doc_id,
+                        "filename": job.file_name,
+                        "file_size": job.file_size,
+                        "file_type": os.path.splitext(job.file_name)[1].lower().lstrip("."),
+                        "uploaded_by": "system",  # Will be updated when auth is implemented
+                        "metadata": job.metadata,
+                        **fields
+                    }).execute()
+                )
+            else:
+                await asyncio.to_thread(
+                    lambda: supabase.table("knowledge_base_documents").update(fields).eq("id", job.job_id).execute()
+                )
+        except Exception as e:
+            logger.warning(f"[{job.job_id}] Failed to track ingestion in Supabase: {e}")
+
+    def _remove_file(self, job: IngestionJob):
+        try:
+            os.remove(job.file_path)
+        except OSError:
+            pass
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _lease_expired(row: dict) -> bool:
+    """Whether a "processing" row's owner stopped refreshing it (rows without updated_at count as live)."""
+    if not row.get("updated_at"):
+        return False
+    updated_at = datetime.fromisoformat(row["updated_at"])
+    if updated_at.tzinfo is None:
+        updated_at = updated_at.replace(tzinfo=timezone.utc)
+    return datetime.now(timezone.utc) - updated_at > timedelta(seconds=settings.INGEST_JOB_LEASE_S)
+
+
+async def get_job_row(job_id: str) -> Optional[dict]:
+    """The knowledge_base_documents row for a job that is no longer in memory (e.g. after a restart)."""
+    try:
+        uuid.UUID(job_id)
+    except ValueError:
+        return None
+    response = await asyncio.to_thread(
+        lambda: supabase.table("knowledge_base_documents")
+        .select("doc_id, filename, file_size, status, chunk_count, vector_count, upload_date")
+        .eq("id", job_id).limit(1).execute()
+    )
+    return response.data[0] if response.data else None
+
+
+ingestion_jobs = IngestionJobQueue(
+    DocumentIngestionService(),
+    concurrency=settings.INGEST_JOB_CONCURRENCY,
+    maxsize=settings.INGEST_JOB_QUEUE_SIZE,
+)
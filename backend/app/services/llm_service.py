@@ -0,0 +1,124 @@
+"""
+LLM Service - chat-completion helpers shared by live calls and post-call
+processing (transliteration fallback, structured call insights). All calls go through
+the shared AsyncOpenAI client; each helper returns (result, tokens_used).
+"""
+import logging
+from typing import Literal
+
+import openai
+from pydantic import BaseModel, ValidationError, field_validator
+
+from app.core.config import settings
+from app.services.audio_service import get_openai_client
+from app.services.transliteration import romanize
+
+logger = logging.getLogger(__name__)
+
+TRANSLITERATION_PROMPT = "Transliterate to Roman script. Keep words, change script. Example: 'నమస్కారం' → 'Namaskaram'. Output only transliteration."
+
+CALL_INTENTS = ("pricing", "services", "support", "sales", "appointment", "complaint", "general_inquiry", "other")
+CALL_SENTIMENTS = ("positive", "neutral", "negative")
+
+# One JSON-mode request for the post-call fields; kept shorter than the old
+# summary-only prompt, and held to its output budget (the call's language is
+# detected locally from the transcript's script, not asked for)
+INSIGHTS_PROMPT = f"""Analyze this VocalQ call. Reply with JSON:
+{{"summary": "1-2 crisp sentences: Caller asked about [topic]. [Outcome].", "intent": "{"|".join(CALL_INTENTS)}", "sentiment": "{"|".join(CALL_SENTIMENTS)}"}}"""
+INSIGHTS_MAX_TOKENS = 80  # the old summary call's max_tokens
+
+FALLBACK_SUMMARY = "Call completed."
+
+# Worth retrying: the request may succeed later. Anything else (bad request,
+# auth, malformed output) would fail the same way again.
+TRANSIENT_ERRORS = (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError)
+
+
+class CallInsights(BaseModel):
+    """Validated post-call extraction; loose model output is normalized, not rejected."""
+    summary: str
+    intent: Literal[CALL_INTENTS] = "other"
+    sentiment: Literal[CALL_SENTIMENTS] = "neutral"
+
+    @field_validator("summary")
+    @classmethod
+    def _summary(cls, value: str) -> str:
+        value = value.strip()
+        if not value:
+            raise ValueError("empty summary")
+        return value
+
+    @field_validator("intent", mode="before")
+    @classmethod
+    def _intent(cls, value):
+        value = str(value or "").strip().lower().replace(" ", "_")
+        return value if value in CALL_INTENTS else "other"
+
+    @field_validator("sentiment", mode="before")
+    @classmethod
+    def _sentiment(cls, value):
+        value = str(value or "").strip().lower()
+        return value if value in CALL_SENTIMENTS else "neutral"
+
+
+def _tokens(response) -> int:
+    usage = getattr(response, "usage", None)
+    return usage.total_tokens if usage else 0
+
+
+async def transliterate_to_roman(text: str) -> tuple:
+    """
+    Transliterate non-ASCII text to Roman script: local rules first, the LLM only
+    for scripts they don't cover and only when TRANSLITERATION_LLM_FALLBACK is on.
+    Raises on API errors.
+    """
+    roman = romanize(text)
+    if roman.isascii() or not settings.TRANSLITERATION_LLM_FALLBACK:
+        return roman, 0
+    client = get_openai_client()
+    response = await client.chat.completions.create(
+        model=settings.CHAT_MODEL,
+        messages=[
+            {"role": "system", "content": TRANSLITERATION_PROMPT},
+            {"role": "user", "content": text}
+        ],
+        max_tokens=100,
+        temperature=0.1
+    )
+    return response.choices[0].message.content.strip(), _tokens(response)
+
+
+async def extract_call_insights(conversation_history: list) -> tuple:
+    """
+    Summary, intent and sentiment of a call in one request. Raises on API errors;
+    output that isn't valid JSON for CallInsights (e.g. cut off at max_tokens)
+    gives fallback insights rather than an error, so it is never retried.
+    """
+    if not conversation_history:
+        return CallInsights(summary="No conversation."), 0
+    if len(conversation_history) <= 1:
+        return CallInsights(summary="Short call - minimal interaction."), 0
+
+    conversation_text = ""
+    for msg in conversation_history:
+        role = "Caller" if msg["role"] == "user" else "AI"
+        conversation_text += f"{role}: {msg['content']}\n"
+
+    client = get_openai_client()
+    response = await client.chat.completions.create(
+        model=settings.CHAT_MODEL,
+        messages=[
+            {"role": "system", "content": INSIGHTS_PROMPT},
+            {"role": "user", "content": conversation_text}
+        ],
+        response_format={"type": "json_object"},
+        max_tokens=INSIGHTS_MAX_TOKENS,
+        temperature=0.2
+    )
+    choice = response.choices[0]
+    try:
+        insights = CallInsights.model_validate_json(choice.message.content or "")
+    except ValidationError as e:
+        logger.warning(f"Call insights output unusable (finish_reason={choice.finish_reason}): {e}")
+        insights = CallInsights(summary=FALLBACK_SUMMARY)
+    return insights, _tokens(response)
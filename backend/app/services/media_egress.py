@@ -0,0 +1,45 @@
+"""
+Media egress passthrough - forwards OpenAI `response.audio.delta` payloads to
+Twilio by slicing the base64 delta out of the raw frame and writing it into a
+pre-formatted Twilio `media` envelope. Only non-audio events get json.loads.
+"""
+import json
+from typing import Optional
+
+_DELTA_TYPE = '"type":"response.audio.delta"'
+_DELTA_KEY = '"delta":"'
+# The type field is serialized first (at worst after event_id), so only scan the head
+_TYPE_SCAN_CHARS = 96
+
+
+def extract_audio_delta(message: str) -> Optional[str]:
+    """
+    Return the base64 audio of a raw response.audio.delta frame, or None if the
+    message is another event or not in the expected compact form.
+    """
+    if message.find(_DELTA_TYPE, 0, _TYPE_SCAN_CHARS) < 0:
+        return None
+    start = message.find(_DELTA_KEY)
+    if start < 0:
+        return None
+    start += len(_DELTA_KEY)
+    end = message.find('"', start)
+    if end < 0:
+        return None
+    delta = message[start:end]
+    # Base64 never needs JSON escapes; anything escaped takes the slow path
+    if "\\" in delta:
+        return None
+    return delta
+
+
+class TwilioMediaEnvelope:
+    """Pre-formatted Twilio `media` message for one stream."""
+
+    def __init__(self, stream_sid: str):
+        self.stream_sid = stream_sid
+        self._prefix = '{"event":"media","streamSid":' + json.dumps(stream_sid) + ',"media":{"payload":"'
+        self._suffix = '"}}'
+
+    def wrap(self, payload: str) -> str:
+        return self._prefix + payload + self._suffix
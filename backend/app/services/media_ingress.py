@@ -0,0 +1,88 @@
+"""
+Media ingress fast path - turns Twilio `media` frames into OpenAI
+`input_audio_buffer.append` events without json.loads / dict / json.dumps,
+optionally coalescing consecutive 20 ms frames into one append.
+
+Coalescing is not free: Twilio frames are 160 bytes, not a multiple of 3, so
+each frame's base64 ends in padding and frames can't be joined as strings. They
+are decoded and the window re-encoded once, which costs more CPU than the fast
+path saves (scripts/bench_media_ingress.py); what it buys is fewer WebSocket
+sends per call-second.
+"""
+import binascii
+from typing import Optional
+
+# g711 μ-law at 8 kHz: one byte per sample
+ULAW_BYTES_PER_MS = 8
+# Coalescing windows are whole multiples of this (3 Twilio frames, 60 ms): the
+# smallest run of 20 ms frames whose base64 has no padding
+COALESCE_ALIGN_BYTES = 480
+
+# Twilio serializes the event name first, e.g. {"event":"media","sequenceNumber":"4",...}
+_MEDIA_PREFIX = '{"event":"media"'
+_PAYLOAD_KEY = '"payload":"'
+
+# Pre-built OpenAI event; the base64 payload is spliced in between
+_APPEND_PREFIX = '{"type":"input_audio_buffer.append","audio":"'
+_APPEND_SUFFIX = '"}'
+
+
+def extract_media_payload(message: str) -> Optional[str]:
+    """
+    Return the base64 payload of a Twilio media frame, or None if the message
+    is not a media frame in the expected compact form (callers then fall back to json.loads).
+    """
+    if not message.startswith(_MEDIA_PREFIX):
+        return None
+    start = message.find(_PAYLOAD_KEY)
+    if start < 0:
+        return None
+    start += len(_PAYLOAD_KEY)
+    end = message.find('"', start)
+    if end < 0:
+        return None
+    payload = message[start:end]
+    # Base64 never needs JSON escapes; anything escaped takes the slow path
+    if "\\" in payload:
+        return None
+    return payload
+
+
+def build_append_event(payload: str) -> str:
+    """Serialize an input_audio_buffer.append event from a base64 payload."""
+    return _APPEND_PREFIX + payload + _APPEND_SUFFIX
+
+
+class MediaCoalescer:
+    """
+    Accumulates μ-law frames and emits one append event per window of audio.
+    `window_ms` is rounded to a multiple of 60 ms (COALESCE_ALIGN_BYTES), so every
+    full window is whole frames and unpadded base64.
+    """
+
+    def __init__(self, window_ms: int):
+        windows = max(1, round(window_ms * ULAW_BYTES_PER_MS / COALESCE_ALIGN_BYTES))
+        self.window_bytes = windows * COALESCE_ALIGN_BYTES
+        self._payloads = []
+        self._bytes = 0
+
+    def add(self, payload: str) -> Optional[str]:
+        """Add a base64 frame; returns an append event once the window is full."""
+        self._payloads.append(payload)
+        self._bytes += len(payload) // 4 * 3 - payload.count("=", -2)
+        if self._bytes >= self.window_bytes:
+            return self.flush()
+        return None
+
+    def flush(self) -> Optional[str]:
+        """Emit whatever is buffered as a single append event (call on stream stop/disconnect too)."""
+        if not self._payloads:
+            return None
+        if len(self._payloads) == 1:
+            payload = self._payloads[0]
+        else:
+            audio = b"".join([binascii.a2b_base64(p) for p in self._payloads])
+            payload = binascii.b2a_base64(audio, newline=False).decode("ascii")
+        self._payloads = []
+        self._bytes = 0
+        return build_append_event(payload)
@@ -0,0 +1,172 @@
+"""
+Post-Call Processor - job queue for work that happens after a caller hangs up
+(final transliteration pass, one structured summary/intent/sentiment
+extraction, DB finalization). A fixed pool of worker tasks bounds concurrency;
+jobs that hit a transient OpenAI error (connection, rate limit, 5xx) are retried
+with backoff, other failures are not, and every job carries a status that the
+admin API exposes.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+
+from app.core.config import settings
+from app.core import metrics
+from app.services.call_record_writer import call_record_writer
+from app.services.llm_service import FALLBACK_SUMMARY, TRANSIENT_ERRORS, extract_call_insights, transliterate_to_roman
+
+logger = logging.getLogger(__name__)
+
+# Job statuses
+QUEUED = "queued"
+RUNNING = "running"
+RETRYING = "retrying"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+@dataclass
+class PostCallJob:
+    """Snapshot of a finished call plus processing status."""
+    call_id: str
+    record: dict                 # call record columns already known (written again on finalization)
+    transcript: list
+    conversation_history: list
+    token_usage: int
+    status: str = QUEUED
+    attempts: int = 0
+    error: Optional[str] = None
+    queued_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+
+    def summary(self) -> dict:
+        info = asdict(self)
+        for key in ("record", "transcript", "conversation_history"):
+            info.pop(key)
+        return info
+
+
+class PostCallProcessor:
+    """Bounded job queue drained by `concurrency` worker tasks."""
+
+    def __init__(self, concurrency: int, max_retries: int, maxsize: int, keep_jobs: int = 500):
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.keep_jobs = keep_jobs
+        self.jobs = OrderedDict()
+        self._workers = []
+
+    def start(self):
+        if not self._workers:
+            self._workers = [asyncio.create_task(self._worker(i)) for i in range(self.concurrency)]
+
+    async def stop(self, timeout: float = 30.0):
+        """Finish queued jobs (up to timeout), then stop the workers."""
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Post-call processor stopped with {self.queue.qsize()} jobs pending")
+        for worker in self._workers:
+            worker.cancel()
+        self._workers = []
+
+    async def submit(self, job: PostCallJob):
+        """Queue a finished call for processing."""
+        self.jobs[job.call_id] = job
+        while len(self.jobs) > self.keep_jobs:
+            self.jobs.popitem(last=False)
+        await self.queue.put(job)
+        metrics.POST_CALL_QUEUE_DEPTH.set(self.queue.qsize())
+
+    def get(self, call_id: str) -> Optional[PostCallJob]:
+        return self.jobs.get(call_id)
+
+    def stats(self) -> dict:
+        counts = {}
+        for job in self.jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            "concurrency": self.concurrency,
+            "queued": self.queue.qsize(),
+            "jobs": counts,
+            "recent": [job.summary() for job in list(self.jobs.values())[-20:]],
+        }
+
+    async def _worker(self, index: int):
+        while True:
+            job = await self.queue.get()
+            metrics.POST_CALL_QUEUE_DEPTH.set(self.queue.qsize())
+            try:
+                await self._process(job)
+            except Exception as e:
+                logger.error(f"[{job.call_id}] Post-call worker {index} error: {e}", exc_info=True)
+            finally:
+                self.queue.task_done()
+
+    async def _process(self, job: PostCallJob):
+        started = time.perf_counter()
+        insights = None
+        while True:
+            job.attempts += 1
+            job.status = RUNNING
+            try:
+                await self._transliterate(job)
+                insights, tokens = await extract_call_insights(job.conversation_history)
+                if tokens:
+                    job.token_usage += tokens
+                    metrics.TOKENS_TOTAL.labels(source="summary").inc(tokens)
+                    logger.info(f"[{job.call_id}] Summary tokens: +{tokens}")
+                job.status = COMPLETED
+                job.error = None
+                break
+            except Exception as e:
+                job.error = f"{type(e).__name__}: {e}"
+                if not isinstance(e, TRANSIENT_ERRORS) or job.attempts > self.max_retries:
+                    logger.error(f"[{job.call_id}] Post-call processing failed after {job.attempts} attempts: {e}")
+                    metrics.ERRORS_TOTAL.labels(type="post_call_failed").inc()
+                    job.status = FAILED
+                    break
+                delay = min(2 ** job.attempts, 30)
+                logger.warning(f"[{job.call_id}] Post-call processing failed ({e}), retry in {delay}s")
+                job.status = RETRYING
+                await asyncio.sleep(delay)
+
+        # Finalize even on failure so the record has the transcript and a summary
+        fields = {
+            **job.record,
+            "summary": insights.summary if insights else FALLBACK_SUMMARY,
+            "transcript": job.transcript,
+            "token_usage": job.token_usage
+        }
+        if insights:
+            fields["intent"] = insights.intent
+            fields["sentiment"] = insights.sentiment
+        await call_record_writer.submit(job.call_id, fields)
+        job.finished_at = time.time()
+        metrics.POST_CALL_SECONDS.labels(status=job.status).observe(time.perf_counter() - started)
+        logger.info(f"[{job.call_id}] Post-call processing {job.status} in {job.attempts} attempt(s). Tokens: {job.token_usage}")
+
+    async def _transliterate(self, job: PostCallJob):
+        """Final pass over entries still not romanized (LLM fallback results, or entries it never reached)."""
+        for index, entry in enumerate(job.transcript):
+            text = entry.get("text") or ""
+            if text.isascii():
+                continue
+            roman, tokens = await transliterate_to_roman(text)
+            entry["text"] = roman
+            if index < len(job.conversation_history):
+                job.conversation_history[index]["content"] = roman
+            if tokens:
+                job.token_usage += tokens
+                metrics.TOKENS_TOTAL.labels(source="transliteration").inc(tokens)
+
+
+post_call_processor = PostCallProcessor(
+    concurrency=settings.POST_CALL_CONCURRENCY,
+    max_retries=settings.POST_CALL_MAX_RETRIES,
+    maxsize=settings.POST_CALL_QUEUE_SIZE,
+)
@@ -1,28 +1,91 @@
-import logging
+"""
+Qdrant Service - knowledge-base vector store operations.
+
+All services share one process-wide AsyncQdrantClient (one connection pool,
+optionally over gRPC). The collection check runs once, from the app lifespan.
+
+Search results are cached per (normalized query, limit) and tagged with the
+knowledge-base generation, which every write bumps, so results never outlive
+the KB content they came from. Concurrent identical searches share one query.
+
+With KB_REPLICA_ENABLED, searches run against an in-process VectorReplica of
+the collection that every write here is also applied to (KB_REPLICA_ONLY: the
+replica is the whole store and no Qdrant server is used).
+"""
 import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from qdrant_client import AsyncQdrantClient
 from qdrant_client.http import models
 from app.core.config import settings
+from app.core import metrics
 from app.services.audio_service import AudioService
+from app.services.embedding_cache import normalize_text
+from app.services.vector_replica import VectorReplica
 
 logger = logging.getLogger(__name__)
 
-class QdrantService:
-    def __init__(self):
-        logger.info("--- Initializing Async QdrantService ---")
-        self.client = AsyncQdrantClient(
+# Global Qdrant client instance
+_qdrant_client = None
+
+def get_qdrant_client():
+    """Get or create the shared async Qdrant client."""
+    global _qdrant_client
+    if _qdrant_client is None:
+        _qdrant_client = AsyncQdrantClient(
             url=settings.QDRANT_URL,
-            api_key=settings.QDRANT_API_KEY
+            api_key=settings.QDRANT_API_KEY,
+            prefer_grpc=settings.QDRANT_PREFER_GRPC,
+            grpc_port=settings.QDRANT_GRPC_PORT
         )
+        logger.info(f"Qdrant client created ({'gRPC' if settings.QDRANT_PREFER_GRPC else 'REST'})")
+    return _qdrant_client
+
+
+async def close_qdrant_client():
+    """Close the shared client's connections (app shutdown)."""
+    global _qdrant_client
+    if _qdrant_client is not None:
+        await _qdrant_client.close()
+        _qdrant_client = None
+
+
+@dataclass
+class CachedSearch:
+    """Search results valid for one KB generation."""
+    results: list
+    generation: int
+    expires_at: float
+    hits: int = 0
+
+
+class QdrantService:
+    def __init__(self):
         self.collection_name = "knowledge_base"
         self.vector_size = 1536 # OpenAI text-embedding-3-small
         
-        # We'll use a task to ensure collection exists without blocking init
-        asyncio.create_task(self._ensure_collection())
-        logger.info("--- Async QdrantService Initialized ---")
+        # KB generation: bumped by every write, invalidating cached search results
+        self.generation = 0
+        self._results = OrderedDict()
+        self._inflight = {}
+        
+        # In-process replica: searched once loaded (KB_REPLICA_ONLY: the only store)
+        self.remote = not settings.KB_REPLICA_ONLY
+        self.replica = VectorReplica(self.vector_size) if settings.KB_REPLICA_ENABLED or not self.remote else None
+        self.replica_ready = not self.remote
+        self._replica_over_cap = False
+
+    @property
+    def client(self):
+        # Resolved lazily so the module-level instance can be built before the event loop
+        return get_qdrant_client()
 
-    async def _ensure_collection(self):
+    async def ensure_collection(self):
         """Ensure the RAG collection exists with the correct dimensions."""
+        if not self.remote:
+            return
         try:
             collections_response = await self.client.get_collections()
             collections = collections_response.collections
@@ -60,50 +123,195 @@ class QdrantService:
         except Exception as e:
             logger.error(f"Failed to ensure Qdrant collection: {e}")
 
+    async def load_replica(self):
+        """
+        (Re)load the replica by scrolling the collection; writes made meanwhile are replayed onto it.
+        A KB over KB_REPLICA_MAX_POINTS is searched on Qdrant until a reload finds it back under.
+        """
+        if self.replica is None or not self.remote:
+            return
+        started = time.perf_counter()
+        self.replica.begin_reload()
+        try:
+            fresh = await self._scroll_replica()
+        except Exception as e:
+            self.replica.end_reload(None)
+            logger.error(f"KB replica load failed (keeping the current state until the next reload): {e}")
+            return
+        if fresh is None:
+            self.replica.end_reload(None)
+            self._drop_replica()
+            return
+        if self.replica.end_reload(fresh):
+            # Out-of-process writes (e.g. scripts/sync_kb.py) invalidate cached results too
+            self._bump_generation()
+        if len(self.replica) > settings.KB_REPLICA_MAX_POINTS:
+            # Writes replayed from the journal took it over the cap
+            self._drop_replica()
+            return
+        self.replica_ready = True
+        self._replica_over_cap = False
+        metrics.KB_REPLICA_POINTS.set(len(self.replica))
+        logger.info(f"KB replica loaded: {len(self.replica)} points in {time.perf_counter() - started:.2f}s")
+
+    def _drop_replica(self):
+        """Search Qdrant and free the replica's memory until a reload finds the KB under the cap."""
+        if not self._replica_over_cap:
+            logger.warning(f"KB has more than {settings.KB_REPLICA_MAX_POINTS} points; replica disabled, searching Qdrant")
+        self._replica_over_cap = True
+        self.replica_ready = False
+        self.replica.drop()
+        metrics.KB_REPLICA_POINTS.set(0)
+
+    async def _scroll_replica(self):
+        """The whole collection as a new VectorReplica, or None if it exceeds KB_REPLICA_MAX_POINTS."""
+        fresh = VectorReplica(self.vector_size)
+        offset = None
+        while True:
+            points, offset = await self.client.scroll(
+                collection_name=self.collection_name,
+                limit=512,
+                offset=offset,
+                with_payload=True,
+                with_vectors=True
+            )
+            fresh.upsert((point.id, point.vector, point.payload or {}) for point in points)
+            if len(fresh) > settings.KB_REPLICA_MAX_POINTS:
+                return None
+            if offset is None:
+                return fresh
+
+    async def run_replica_refresh(self):
+        """Periodic reload so writes made by other processes (e.g. scripts/sync_kb.py) reach the replica."""
+        while self.remote and self.replica is not None and settings.KB_REPLICA_REFRESH_S > 0:
+            # Keeps running while the replica is over the cap, to re-enable it once the KB shrinks
+            await asyncio.sleep(settings.KB_REPLICA_REFRESH_S)
+            await self.load_replica()
+
+    def _replicate(self, op: str, *args):
+        """Apply a write that Qdrant accepted to the replica as well."""
+        replica = self.replica
+        # A dropped replica (over the cap) is rebuilt by the next reload; one being reloaded journals the write
+        if replica is None or not (self.replica_ready or replica.reloading):
+            return
+        getattr(replica, op)(*args)
+        if self.remote and self.replica_ready and len(replica) > settings.KB_REPLICA_MAX_POINTS:
+            self._drop_replica()
+            return
+        metrics.KB_REPLICA_POINTS.set(len(replica))
+
+    def _bump_generation(self):
+        """Invalidate cached search results after a KB write."""
+        self.generation += 1
+        self._results.clear()
+
+    def _cached_results(self, key):
+        entry = self._results.get(key)
+        if entry is None:
+            return None
+        max_hits = settings.KB_RESULT_CACHE_MAX_HITS
+        if (entry.generation != self.generation or entry.expires_at <= time.monotonic()
+                or (max_hits and entry.hits >= max_hits)):
+            del self._results[key]
+            metrics.KB_RESULT_CACHE_TOTAL.labels(result="stale").inc()
+            return None
+        entry.hits += 1
+        self._results.move_to_end(key)
+        metrics.KB_RESULT_CACHE_TOTAL.labels(result="hit").inc()
+        return entry.results
+
     async def search(self, query_text: str, limit: int = 3):
-        """Search for relevant documents in Qdrant (Async)."""
+        """Search for relevant documents in Qdrant (Async), served from the result cache when possible."""
+        if not settings.KB_RESULT_CACHE_ENABLED:
+            results, _ = await self._search(query_text, limit)
+            return results
+        
+        key = (normalize_text(query_text), limit)
+        results = self._cached_results(key)
+        if results is not None:
+            return list(results)
+        
+        task = self._inflight.get(key)
+        if task is not None:
+            metrics.KB_RESULT_CACHE_TOTAL.labels(result="coalesced").inc()
+        else:
+            metrics.KB_RESULT_CACHE_TOTAL.labels(result="miss").inc()
+            task = asyncio.ensure_future(self._fill(key, query_text, limit))
+            self._inflight[key] = task
+        # Shielded: one caller hanging up mid-search doesn't cancel it for the others
+        return list(await asyncio.shield(task))
+
+    async def _fill(self, key, query_text: str, limit: int) -> list:
+        generation = self.generation
+        try:
+            results, ok = await self._search(query_text, limit)
+        finally:
+            self._inflight.pop(key, None)
+        # Failed searches aren't cached; neither are results a concurrent write made stale
+        if ok and generation == self.generation:
+            self._results[key] = CachedSearch(
+                results=results,
+                generation=generation,
+                expires_at=time.monotonic() + settings.KB_RESULT_CACHE_TTL_S
+            )
+            while len(self._results) > settings.KB_RESULT_CACHE_SIZE:
+                self._results.popitem(last=False)
+        return results
+
+    async def _search(self, query_text: str, limit: int) -> tuple:
+        """Uncached search; returns (results, ok)."""
         try:
             # Generate embedding for query using OpenAI
             query_vector = await AudioService.get_openai_embedding(query_text)
             
-            # Use query_points method (correct API)
-            search_result = await self.client.query_points(
-                collection_name=self.collection_name,
-                query=query_vector,
-                limit=limit,
-                with_payload=True
-            )
-            
-            results = [hit.payload.get("text", "") for hit in search_result.points]
-            logger.info(f"Qdrant search for '{query_text[:50]}': found {len(results)} results")
-            return results
+            started = time.perf_counter()
+            if self.replica_ready:
+                results = [payload.get("text", "") for payload in self.replica.search(query_vector, limit)]
+                metrics.KB_SEARCH_SECONDS.labels(backend="replica").observe(time.perf_counter() - started)
+            else:
+                # Use query_points method (correct API)
+                search_result = await self.client.query_points(
+                    collection_name=self.collection_name,
+                    query=query_vector,
+                    limit=limit,
+                    with_payload=True
+                )
+                results = [hit.payload.get("text", "") for hit in search_result.points]
+                metrics.KB_SEARCH_SECONDS.labels(backend="qdrant").observe(time.perf_counter() - started)
+            logger.info(f"KB search for '{query_text[:50]}': found {len(results)} results")
+            return results, True
         except Exception as e:
             logger.error(f"Qdrant search failed: {e}", exc_info=True)
-            return []
+            return [], False
 
     async def add_document(self, text: str, metadata: dict = None):
         """Add a document to the knowledge base (Async)."""
         try:
             vector = await AudioService.get_openai_embedding(text)
             import uuid
-            response = await self.client.upsert(
-                collection_name=self.collection_name,
-                points=[
-                    models.PointStruct(
-                        id=str(uuid.uuid4()),
-                        vector=vector,
-                        payload={"text": text, **(metadata or {})}
-                    )
-                ],
-                wait=True
-            )
+            point = (str(uuid.uuid4()), vector, {"text": text, **(metadata or {})})
+            response = None
+            if self.remote:
+                response = await self.client.upsert(
+                    collection_name=self.collection_name,
+                    points=[models.PointStruct(id=point[0], vector=point[1], payload=point[2])],
+                    wait=True
+                )
+            self._replicate("upsert", [point])
             logger.info(f"Document added to Qdrant: {text[:50]}... (Response: {response})")
         except Exception as e:
             logger.error(f"Failed to add document to Qdrant: {e}", exc_info=True)
             raise
+        finally:
+            self._bump_generation()
 
     async def list_documents(self):
         """List all documents in the knowledge base."""
+        if not self.remote:
+            return [
+                {"id": point_id, "text": payload.get("text", ""), "metadata": {k: v for k, v in payload.items() if k != "text"}}
+                for point_id, payload in list(self.replica.items())[:100]
+            ]
         try:
             # Scroll to get all points
             points, _ = await self.client.scroll(
@@ -127,62 +335,169 @@ class QdrantService:
     async def delete_document(self, doc_id: str):
         """Delete a document from the knowledge base."""
         try:
-            await self.client.delete(
-                collection_name=self.collection_name,
-                points_selector=models.PointIdsList(
-                    points=[doc_id],
-                ),
-            )
+            if self.remote:
+                await self.client.delete(
+                    collection_name=self.collection_name,
+                    points_selector=models.PointIdsList(
+                        points=[doc_id],
+                    ),
+                )
+            self._replicate("delete", [doc_id])
             return True
         except Exception as e:
             logger.error(f"Failed to delete document: {e}")
             return False
+        finally:
+            self._bump_generation()
     async def add_point(self, point_id: int, vector: list, payload: dict):
         """Add a single point (chunk) to the knowledge base."""
         try:
-            await self.client.upsert(
-                collection_name=self.collection_name,
-                points=[
-                    models.PointStruct(
-                        id=point_id,
-                        vector=vector,
-                        payload=payload
-                    )
-                ]
-            )
+            if self.remote:
+                await self.client.upsert(
+                    collection_name=self.collection_name,
+                    points=[
+                        models.PointStruct(
+                            id=point_id,
+                            vector=vector,
+                            payload=payload
+                        )
+                    ]
+                )
+            self._replicate("upsert", [(point_id, vector, payload)])
             logger.info(f"Point {point_id} added to Qdrant")
         except Exception as e:
             logger.error(f"Failed to add point to Qdrant: {e}", exc_info=True)
             raise
+        finally:
+            self._bump_generation()
+
+    async def add_points(self, points: list):
+        """Bulk upsert of (point_id, vector, payload) tuples in one request."""
+        try:
+            if self.remote:
+                await self.client.upsert(
+                    collection_name=self.collection_name,
+                    points=[
+                        models.PointStruct(id=point_id, vector=vector, payload=payload)
+                        for point_id, vector, payload in points
+                    ],
+                    wait=True
+                )
+            self._replicate("upsert", points)
+            logger.info(f"{len(points)} points added to Qdrant")
+        except Exception as e:
+            logger.error(f"Failed to add {len(points)} points to Qdrant: {e}")
+            raise
+        finally:
+            self._bump_generation()
 
     async def delete_by_metadata(self, key: str, value: str):
         """Delete all points matching a metadata condition."""
         try:
-            await self.client.delete(
-                collection_name=self.collection_name,
-                points_selector=models.FilterSelector(
-                    filter=models.Filter(
-                        must=[
-                            models.FieldCondition(
-                                key=f"metadata.{key}",
-                                match=models.MatchValue(value=value)
-                            )
-                        ]
+            if self.remote:
+                await self.client.delete(
+                    collection_name=self.collection_name,
+                    points_selector=models.FilterSelector(
+                        filter=models.Filter(
+                            must=[
+                                models.FieldCondition(
+                                    key=f"metadata.{key}",
+                                    match=models.MatchValue(value=value)
+                                )
+                            ]
+                        )
                     )
                 )
-            )
+            self._replicate("delete_where", key, value)
             logger.info(f"Deleted points with {key}={value}")
         except Exception as e:
             logger.error(f"Failed to delete by metadata: {e}")
             raise
+        finally:
+            self._bump_generation()
+
+    async def point_versions(self, doc_id: str = None) -> dict:
+        """
+        {doc_id: {point_id: (content_hash, chunking)}} for every chunk (or one
+        document's), payload fields only, paged through the whole collection.
+        """
+        if not self.remote:
+            return _versions(self.replica.items(), doc_id)
+        query_filter = None
+        if doc_id is not None:
+            query_filter = models.Filter(
+                must=[models.FieldCondition(key="metadata.doc_id", match=models.MatchValue(value=doc_id))]
+            )
+        docs = {}
+        offset = None
+        while True:
+            points, offset = await self.client.scroll(
+                collection_name=self.collection_name,
+                scroll_filter=query_filter,
+                limit=1000,
+                offset=offset,
+                with_payload=models.PayloadSelectorInclude(include=["metadata.doc_id", "metadata.content_hash", "metadata.chunking"]),
+                with_vectors=False
+            )
+            for point_id, versions in _versions(((point.id, point.payload or {}) for point in points)).items():
+                docs.setdefault(point_id, {}).update(versions)
+            if offset is None:
+                return docs
+
+    async def delete_points(self, point_ids: list):
+        """Delete points by id, in pages."""
+        try:
+            for start in range(0, len(point_ids) if self.remote else 0, 1000):
+                await self.client.delete(
+                    collection_name=self.collection_name,
+                    points_selector=models.PointIdsList(points=point_ids[start:start + 1000]),
+                    wait=True
+                )
+            self._replicate("delete", point_ids)
+            logger.info(f"Deleted {len(point_ids)} points")
+        except Exception as e:
+            logger.error(f"Failed to delete {len(point_ids)} points: {e}")
+            raise
+        finally:
+            self._bump_generation()
+
+    async def set_metadata(self, point_ids: list, fields: dict):
+        """Merge fields into the metadata of existing points (vectors and text untouched)."""
+        # Search results only carry chunk text, so cached results stay valid
+        for start in range(0, len(point_ids) if self.remote else 0, 1000):
+            await self.client.set_payload(
+                collection_name=self.collection_name,
+                payload=fields,
+                key="metadata",
+                points=point_ids[start:start + 1000],
+                wait=True
+            )
+        self._replicate("set_metadata", point_ids, fields)
 
     async def clear_knowledge_base(self):
         """Delete and recreate the knowledge base collection."""
         try:
-            await self.client.delete_collection(self.collection_name)
-            await self._ensure_collection()
+            if self.remote:
+                await self.client.delete_collection(self.collection_name)
+                await self.ensure_collection()
+            self._replicate("clear")
             logger.info("Knowledge base collection cleared and recreated")
             return True
         except Exception as e:
             logger.error(f"Failed to clear knowledge base: {e}")
-            return False
\ No newline at end of file
+            return False
+        finally:
+            self._bump_generation()
+
+
+def _versions(points, doc_id: str = None) -> dict:
+    """{doc_id: {point_id: (content_hash, chunking)}} from (point_id, payload) pairs."""
+    docs = {}
+    for point_id, payload in points:
+        metadata = payload.get("metadata") or {}
+        if metadata.get("doc_id") and (doc_id is None or metadata["doc_id"] == doc_id):
+            docs.setdefault(metadata["doc_id"], {})[point_id] = (metadata.get("content_hash"), metadata.get("chunking"))
+    return docs
+
+
+qdrant_service = QdrantService()
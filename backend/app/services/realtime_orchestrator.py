@@ -2,25 +2,42 @@
 Realtime Orchestrator - Ultra-low latency voice AI using OpenAI Realtime API.
 Handles Twilio ↔ OpenAI Realtime WebSocket bridging.
 """
+import binascii
 import json
 import logging
 import asyncio
 import uuid
 import time
 from datetime import datetime, timezone, timedelta
-import openai
 
-from app.core.supabase_client import supabase
 from app.core.greeting_config import get_greeting
 from app.core.config import settings
+from app.core import metrics
 from app.services.realtime_service import RealtimeService
-from app.services.qdrant_service import QdrantService
-from app.services.audio_service import get_openai_client
+from app.services.realtime_session_pool import RealtimeSessionPool
+from app.services.event_lanes import EventLane
+from app.services.media_ingress import MediaCoalescer, build_append_event
+from app.services.media_egress import TwilioMediaEnvelope, extract_audio_delta
+from app.services.send_queue import OutboundQueue
+from app.services.barge_in import BargeInDetector
+from app.services.utterance_cache import normalize_phrase, utterance_cache
+from app.services.call_record_writer import call_record_writer
+from app.services.post_call_processor import PostCallJob, post_call_processor
+from app.services.event_hub import event_hub
+from app.services.llm_service import transliterate_to_roman
+from app.services.transliteration import language_letters, romanize
+from app.services.qdrant_service import qdrant_service
 
 logger = logging.getLogger(__name__)
 
+# Fixed closing line (also cached as pre-rendered audio once spoken)
+CLOSING_LINE = "Thank you for calling Tekisho. Have a wonderful day!"
+
+# Pre-rendered audio is sent to Twilio in 100 ms media messages
+CACHED_AUDIO_CHUNK_BYTES = 800
+
 # System prompt for the AI assistant
-SYSTEM_PROMPT = """You are VocalQ.ai's professional INBOUND AI phone assistant for Tekisho –
+SYSTEM_PROMPT = f"""You are VocalQ.ai's professional INBOUND AI phone assistant for Tekisho –
 friendly, confident, and natural-sounding.
 
 Your goal is to help callers politely and end the call once satisfied.
@@ -99,7 +116,7 @@ CALL CLOSURE & TERMINATION:
 
 If the caller says:
 "That's all", "I'm good", "No more questions", "Bye", "Thank you, bye"
-1. Say: "Thank you for calling Tekisho. Have a wonderful day!"
+1. Say: "{CLOSING_LINE}"
 2. CALL `end_call` IMMEDIATELY.
 
 If the caller says only "Thank you":
@@ -136,6 +153,27 @@ KB_SEARCH_TOOL = {
     }
 }
 
+# Realtime events handled on the latency-critical audio lane
+AUDIO_LANE_EVENTS = {
+    "response.created",
+    "response.audio.delta",
+    "response.audio.done",
+    "input_audio_buffer.speech_started",
+    "input_audio_buffer.speech_stopped",
+}
+# Realtime events that may wait on network I/O (Qdrant, embeddings)
+TOOL_LANE_EVENTS = {"response.function_call_arguments.done"}
+# Realtime events for transcripts, transliteration and usage accounting
+BOOKKEEPING_LANE_EVENTS = {
+    "response.done",
+    "error",
+    "response.audio_transcript.done",
+    "conversation.item.input_audio_transcription.completed",
+}
+
+# Pre-warmed Realtime sessions, configured with the prompt and tools above
+session_pool = RealtimeSessionPool(instructions=SYSTEM_PROMPT, tools=[KB_SEARCH_TOOL])
+
 
 class RealtimeOrchestrator:
     """Orchestrator using OpenAI Realtime API for ultra-low latency voice AI."""
@@ -144,22 +182,66 @@ class RealtimeOrchestrator:
         self.websocket = websocket
         self.call_id = str(uuid.uuid4())
         self.realtime_service = RealtimeService()
-        self.qdrant_service = QdrantService()
         
         # Call state
         self.start_timestamp = None
         self.start_time_unix = time.time()
         self.stream_sid = None
+        self.call_sid = None
         self.caller_number = "Unknown"
         self.greeting_triggered_at = 0
         self.total_token_usage = 0
+        self.ended = False
+        self.prewarm_saved_ms = 0.0
+        
+        # Latency milestones (perf_counter timestamps) feeding the /metrics histograms
+        self.milestones = {}
+        self._speech_stopped_at = None
         
         # Transcripts
         self.dashboard_transcript = []
         self.conversation_history = []
+        # Caller letters per language, counted before romanization
+        self._caller_letters = {}
         
         # Events
         self.session_updated_event = asyncio.Event()
+        self._first_audio = False
+        self._twilio_envelope = None
+        
+        # Interruption state: estimated end of Twilio playback, and audio from a
+        # cancelled response is dropped until the next response starts
+        self._playback_until = 0.0
+        self._audio_suppressed = False
+        self._last_interrupt_at = 0.0
+        
+        # Scripted-phrase capture: deltas of the current response, and the phrases
+        # (normalized text -> original) still missing from the utterance cache
+        self._greeting_prerendered = False
+        self._render_chunks = None
+        self._uncached_phrases = {}
+        self.barge_in_detector = BargeInDetector(
+            energy_dbfs=settings.BARGE_IN_ENERGY_DBFS,
+            noise_margin_db=settings.BARGE_IN_NOISE_MARGIN_DB,
+            zcr_min=settings.BARGE_IN_ZCR_MIN,
+            zcr_max=settings.BARGE_IN_ZCR_MAX,
+            min_speech_ms=settings.BARGE_IN_MIN_SPEECH_MS,
+        ) if settings.BARGE_IN_LOCAL_VAD else None
+        
+        # Split event pipeline: audio never queues behind tool calls or bookkeeping
+        self.audio_lane = EventLane("audio", self._handle_audio_event, self.call_id)
+        self.tool_lane = EventLane("tool", self._handle_tool_call, self.call_id)
+        self.bookkeeping_lane = EventLane("bookkeeping", self._handle_bookkeeping_event, self.call_id)
+        
+        # Bounded outbound queue + writer task for the Twilio leg (OpenAI's is attached on lease)
+        self.twilio_outbox = OutboundQueue(
+            "twilio", websocket.send_text,
+            settings.TWILIO_SEND_QUEUE_SIZE, settings.TWILIO_AUDIO_OVERFLOW, self.call_id
+        )
+        self.twilio_outbox.start()
+        
+        # Optional coalescing of 20 ms Twilio frames into larger appends
+        self.media_coalescer = MediaCoalescer(settings.MEDIA_COALESCE_MS) if settings.MEDIA_COALESCE_MS > 20 else None
         
         logger.info(f"[{self.call_id}] Orchestrator initialized")
 
@@ -170,29 +252,47 @@ class RealtimeOrchestrator:
         ist_offset = timedelta(hours=5, minutes=30)
         self.start_timestamp = utc_now + ist_offset
         logger.info(f"[{self.call_id}] Starting orchestrator, stream_sid={self.stream_sid}")
+        self._mark("twilio_start")
+        metrics.CALLS_TOTAL.inc()
+        metrics.ACTIVE_CALLS.inc()
         
-        # Initialize DB record in background
-        asyncio.create_task(self._init_db_record())
+        # Initialize DB record (write-behind, never waits on the database)
+        self._init_db_record()
+        event_hub.publish_call_started(self.call_id, self._dashboard_call())
+
+        # Play the pre-rendered greeting while the Realtime session is still connecting
+        if self.stream_sid and settings.UTTERANCE_CACHE_ENABLED:
+            await self._play_cached_greeting()
 
         try:
-            # Connect to OpenAI Realtime
-            await self.realtime_service.connect()
-            logger.info(f"[{self.call_id}] Connected to Realtime API")
-            
-            # Update session with system prompt and tools
-            await self.realtime_service.update_session(
-                instructions=SYSTEM_PROMPT, 
-                tools=[KB_SEARCH_TOOL]
+            # Adopt the session the Twilio webhook started opening, else lease one
+            # (pre-warmed when the pool has one)
+            claimed = await session_pool.claim(self.call_sid)
+            if claimed:
+                self.realtime_service, self.prewarm_saved_ms = claimed
+                logger.info(f"[{self.call_id}] Adopted speculative session, saved {self.prewarm_saved_ms:.0f}ms to greeting")
+                metrics.PREWARM_SAVED_SECONDS.observe(self.prewarm_saved_ms / 1000)
+            else:
+                self.realtime_service = await session_pool.lease()
+            if self.ended:
+                # Caller hung up while we were connecting
+                await self.realtime_service.close()
+                return
+            self.realtime_service.attach_outbox(
+                settings.OPENAI_SEND_QUEUE_SIZE, settings.OPENAI_AUDIO_OVERFLOW, self.call_id
             )
+            logger.info(f"[{self.call_id}] Connected to Realtime API")
+            metrics.REALTIME_CONNECT_SECONDS.observe(self._mark("realtime_connected"))
             
             # Start event handler
             asyncio.create_task(self._handle_events())
             
-            # Wait for session confirmation (reduced timeout for speed)
-            try:
-                await asyncio.wait_for(self.session_updated_event.wait(), timeout=1.5)
+            # The pool already waited for session.updated (cold leases use the short timeout)
+            if self.realtime_service.session_ready:
+                self.session_updated_event.set()
                 logger.info(f"[{self.call_id}] Session updated confirmed")
-            except asyncio.TimeoutError:
+                metrics.SESSION_READY_SECONDS.observe(self._mark("session_updated"))
+            else:
                 logger.warning(f"[{self.call_id}] Session update timeout - proceeding anyway")
 
             # stream_sid should already be set before start() is called
@@ -205,16 +305,56 @@ class RealtimeOrchestrator:
 
         except Exception as e:
             logger.error(f"[{self.call_id}] Start failed: {e}", exc_info=True)
+            metrics.ERRORS_TOTAL.labels(type="start_failed").inc()
+
+    def _mark(self, milestone: str) -> float:
+        """Record a call milestone; returns seconds since the Twilio start event."""
+        now = time.perf_counter()
+        self.milestones[milestone] = now
+        return now - self.milestones.get("twilio_start", now)
+
+    async def _play_cached_greeting(self):
+        """Send the cached greeting audio straight to Twilio, if it has been rendered before."""
+        greeting_text = get_greeting()
+        audio = utterance_cache.get(greeting_text)
+        if not audio:
+            return
+        self.greeting_triggered_at = time.time()
+        self._greeting_prerendered = True
+        for i in range(0, len(audio), CACHED_AUDIO_CHUNK_BYTES):
+            await self._forward_audio(binascii.b2a_base64(audio[i:i + CACHED_AUDIO_CHUNK_BYTES], newline=False).decode())
+        # The model's first real response should log/measure its own first delta
+        self._first_audio = False
+        logger.info(f"[{self.call_id}] Played cached greeting ({len(audio)} bytes)")
 
     async def _send_greeting(self):
         """Send initial greeting to caller."""
-        self.greeting_triggered_at = time.time()
-        
         # Get dynamic greeting from config (set via UI)
         greeting_text = get_greeting()
         
         # Clear any noise in buffer
         await self.realtime_service.send_to_ws({"type": "input_audio_buffer.clear"})
+        
+        if settings.UTTERANCE_CACHE_ENABLED:
+            for phrase in (greeting_text, CLOSING_LINE):
+                if not utterance_cache.get(phrase):
+                    self._uncached_phrases[normalize_phrase(phrase)] = phrase
+        
+        if self._greeting_prerendered:
+            # Caller already heard it; record it as the assistant's turn so the model keeps context
+            await self.realtime_service.send_to_ws({
+                "type": "conversation.item.create",
+                "item": {
+                    "type": "message",
+                    "role": "assistant",
+                    "content": [{"type": "text", "text": greeting_text}]
+                }
+            })
+            self._add_transcript("ai", greeting_text)
+            logger.info(f"[{self.call_id}] Greeting served from cache")
+            return
+        
+        self.greeting_triggered_at = time.time()
 
         # Inject greeting as user instruction for AI to speak
         await self.realtime_service.send_to_ws({
@@ -237,108 +377,241 @@ class RealtimeOrchestrator:
         
         logger.info(f"[{self.call_id}] Greeting triggered")
 
-    async def _init_db_record(self):
-        """Initialize call record in Supabase."""
-        try:
-            # Format IST timestamp (timezone-aware datetime already in IST)
-            start_time_iso = self.start_timestamp.strftime('%Y-%m-%dT%H:%M:%S') + '+05:30'
-            supabase.table("calls").insert({
-                "call_id": self.call_id,
-                "caller_number": self.caller_number,
-                "start_time": start_time_iso,
-                "created_at": start_time_iso,
-                "call_status": "active",
-                "language": "en-US"
-            }).execute()
-        except Exception as e:
-            logger.warning(f"[{self.call_id}] DB insert failed: {e}")
+    def _call_record_base(self) -> dict:
+        """Columns known from the start of the call."""
+        # Format IST timestamp (timezone-aware datetime already in IST)
+        start_time_iso = self.start_timestamp.strftime('%Y-%m-%dT%H:%M:%S') + '+05:30'
+        return {
+            "caller_number": self.caller_number,
+            "start_time": start_time_iso,
+            "created_at": start_time_iso
+        }
+
+    def _caller_language(self):
+        """BCP-47 tag of the script the caller's turns were mostly in (None before they spoke)."""
+        if not self._caller_letters:
+            return None
+        return max(self._caller_letters, key=self._caller_letters.get)
+
+    def _dashboard_call(self) -> dict:
+        """Live call in the shape the calls API returns (see calls.map_call)."""
+        base = self._call_record_base()
+        return {
+            "id": self.call_id,
+            "caller": self.caller_number,
+            "timestamp": base["start_time"],
+            "duration": 0,
+            "status": "active",
+            "intent": "N/A",
+            "sentiment": "N/A",
+            "summary": "",
+            "transcript": list(self.dashboard_transcript),
+            # Unknown until the caller speaks; shown like calls.map_call shows rows without one
+            "language": self._caller_language() or "en-US",
+            "token_usage": self.total_token_usage
+        }
+
+    def _init_db_record(self):
+        """Queue the initial (active) call record."""
+        call_record_writer.submit_nowait(self.call_id, {**self._call_record_base(), "call_status": "active"})
 
     async def _handle_events(self):
-        """Handle events from OpenAI Realtime API."""
-        first_audio = False
+        """Read events from OpenAI Realtime API and route them to their lane."""
+        lanes = (self.audio_lane, self.tool_lane, self.bookkeeping_lane)
+        for lane in lanes:
+            lane.start()
         
         try:
-            async for event in self.realtime_service.receive():
+            async for message in self.realtime_service.receive_raw():
+                # Passthrough: audio deltas go to the audio lane without a JSON decode
+                delta = extract_audio_delta(message)
+                if delta is not None:
+                    self.audio_lane.put(delta)
+                    continue
+                
+                try:
+                    event = json.loads(message)
+                except json.JSONDecodeError:
+                    logger.error(f"[{self.call_id}] Failed to decode JSON from OpenAI")
+                    continue
                 event_type = event.get("type")
                 
-                # Session events
-                if event_type == "session.updated":
+                if event_type in AUDIO_LANE_EVENTS:
+                    self.audio_lane.put(event)
+                elif event_type in TOOL_LANE_EVENTS:
+                    self.tool_lane.put(event)
+                elif event_type in BOOKKEEPING_LANE_EVENTS:
+                    self.bookkeeping_lane.put(event)
+                    # Scripted-phrase capture pairs the transcript with audio on the audio lane
+                    if event_type == "response.audio_transcript.done" and self._uncached_phrases:
+                        self.audio_lane.put(event)
+                elif event_type == "session.updated":
                     self.session_updated_event.set()
 
-                # Audio streaming to Twilio
-                elif event_type == "response.audio.delta":
-                    delta = event.get("delta")
-                    if delta and self.stream_sid:
-                        if not first_audio:
-                            logger.info(f"[{self.call_id}] First audio delta")
-                            first_audio = True
-                        await self.websocket.send_text(json.dumps({
-                            "event": "media",
-                            "streamSid": self.stream_sid,
-                            "media": {"payload": delta}
-                        }))
-
-                elif event_type == "response.audio.done":
-                    first_audio = False
-                
-                # Token usage tracking - EXACT counts from OpenAI
-                elif event_type == "response.done":
-                    usage = event.get("response", {}).get("usage", {})
-                    
-                    # Get exact token breakdown
-                    input_tokens = usage.get("input_tokens", 0)
-                    output_tokens = usage.get("output_tokens", 0)
-                    total = usage.get("total_tokens", 0)
-                    
-                    # If total is provided, use it; otherwise sum input+output
-                    tokens_this_response = total if total > 0 else (input_tokens + output_tokens)
-                    
-                    if tokens_this_response > 0:
-                        self.total_token_usage += tokens_this_response
-                        logger.info(f"[{self.call_id}] Tokens this response: in={input_tokens}, out={output_tokens}, total={tokens_this_response} | Running total={self.total_token_usage}")
-                    
-                    # Log full usage object for debugging
-                    if usage:
-                        logger.debug(f"[{self.call_id}] Full usage data: {usage}")
-                
-                # Error handling
-                elif event_type == "error":
-                    logger.error(f"[{self.call_id}] OpenAI error: {event}")
-
-                # User speech detection (for interruption)
-                elif event_type == "input_audio_buffer.speech_started":
-                    # Ignore noise during greeting
-                    if time.time() - self.greeting_triggered_at < 1.5:
-                        continue
-                    
-                    logger.info(f"[{self.call_id}] User speaking - interrupt")
-                    await self.realtime_service.send_to_ws({"type": "response.cancel"})
-                    if self.stream_sid:
-                        await self.websocket.send_text(json.dumps({
-                            "event": "clear",
-                            "streamSid": self.stream_sid
-                        }))
-
-                # Tool calls (KB search)
-                elif event_type == "response.function_call_arguments.done":
-                    await self._handle_tool_call(event)
-
-                # Transcript logging
-                elif event_type == "response.audio_transcript.done":
-                    transcript = event.get("transcript")
-                    if transcript:
-                        logger.info(f"[{self.call_id}] AI: {transcript}")
-                        self._add_transcript("ai", transcript)
-
-                elif event_type == "conversation.item.input_audio_transcription.completed":
-                    transcript = event.get("transcript")
-                    if transcript:
-                        logger.info(f"[{self.call_id}] User: {transcript}")
-                        self._add_transcript("user", transcript)
-
         except Exception as e:
             logger.error(f"[{self.call_id}] Event handler error: {e}")
 
+    async def _handle_audio_event(self, event):
+        """Audio lane: forward audio deltas to Twilio and handle interruptions."""
+        # Passthrough audio delta (base64 payload sliced from the raw frame)
+        if isinstance(event, str):
+            self._capture_delta(event)
+            await self._forward_audio(event)
+            return
+        
+        event_type = event.get("type")
+        
+        if event_type == "response.created":
+            self._audio_suppressed = False
+            self._render_chunks = [] if self._uncached_phrases else None
+            return
+        
+        # Audio streaming to Twilio (frames the passthrough could not slice)
+        if event_type == "response.audio.delta":
+            delta = event.get("delta")
+            if delta:
+                self._capture_delta(delta)
+                await self._forward_audio(delta)
+
+        # Copy of the transcript for scripted-phrase capture (bookkeeping logs it)
+        elif event_type == "response.audio_transcript.done":
+            self._store_rendering(event.get("transcript") or "")
+
+        elif event_type == "response.audio.done":
+            self._first_audio = False
+
+        # Caller finished a turn; response latency runs until the next audio delta
+        elif event_type == "input_audio_buffer.speech_stopped":
+            self._speech_stopped_at = time.perf_counter()
+
+        # User speech detection (for interruption)
+        elif event_type == "input_audio_buffer.speech_started":
+            # Ignore noise during greeting
+            if time.time() - self.greeting_triggered_at < 1.5:
+                return
+            # Local VAD already interrupted this turn
+            if time.time() - self._last_interrupt_at < 1.0:
+                return
+            
+            await self._interrupt("openai_vad")
+
+    async def _interrupt(self, source: str):
+        """Stop the AI: cancel the response and flush Twilio's playback buffer."""
+        logger.info(f"[{self.call_id}] User speaking - interrupt ({source})")
+        metrics.BARGE_IN_TOTAL.labels(source=source).inc()
+        self._last_interrupt_at = time.time()
+        self._playback_until = 0.0
+        self._audio_suppressed = True
+        # A cut-off rendering must never be cached
+        self._render_chunks = None
+        
+        await self.realtime_service.send_to_ws({"type": "response.cancel"})
+        if self.stream_sid:
+            # Audio still queued for Twilio is stale now; drop it ahead of the clear
+            self.twilio_outbox.clear_audio()
+            await self.twilio_outbox.put_control(json.dumps({
+                "event": "clear",
+                "streamSid": self.stream_sid
+            }))
+
+    def _capture_delta(self, delta: str):
+        """Keep the current response's audio while scripted phrases are still uncached."""
+        if self._render_chunks is not None and not self._audio_suppressed:
+            self._render_chunks.append(delta)
+
+    def _store_rendering(self, transcript: str):
+        """Cache the finished response's audio if it was one of the scripted phrases."""
+        chunks, self._render_chunks = self._render_chunks, None
+        phrase = self._uncached_phrases.pop(normalize_phrase(transcript), None)
+        if phrase is None or not chunks:
+            return
+        audio = b"".join(binascii.a2b_base64(c) for c in chunks)
+        # Memory now; the disk write runs in the background, not on the audio lane
+        utterance_cache.put(phrase, audio)
+
+    def _ai_speaking(self) -> bool:
+        """Whether Twilio is (estimated to be) still playing AI audio."""
+        return time.time() < self._playback_until
+
+    async def _check_barge_in(self, payload: str):
+        """Run the local VAD on an inbound frame and interrupt if the caller talks over the AI."""
+        if not self.barge_in_detector:
+            return
+        if not self.barge_in_detector.process(binascii.a2b_base64(payload)):
+            return
+        if self._ai_speaking() and time.time() - self.greeting_triggered_at >= 1.5:
+            await self._interrupt("local_vad")
+
+    async def _forward_audio(self, delta: str):
+        """Write a base64 μ-law delta into the pre-formatted Twilio media envelope."""
+        if not self.stream_sid or self._audio_suppressed:
+            return
+        # μ-law is 8000 bytes/s; base64 is 4 chars per 3 bytes
+        now = time.time()
+        self._playback_until = max(self._playback_until, now) + len(delta) * 3 / 4 / 8000
+        if not self._first_audio:
+            logger.info(f"[{self.call_id}] First audio delta")
+            self._first_audio = True
+            if "greeting_first_audio" not in self.milestones:
+                metrics.GREETING_FIRST_AUDIO_SECONDS.observe(self._mark("greeting_first_audio"))
+            if self._speech_stopped_at is not None:
+                metrics.RESPONSE_LATENCY_SECONDS.observe(time.perf_counter() - self._speech_stopped_at)
+                self._speech_stopped_at = None
+        if self._twilio_envelope is None or self._twilio_envelope.stream_sid != self.stream_sid:
+            self._twilio_envelope = TwilioMediaEnvelope(self.stream_sid)
+        await self.twilio_outbox.put_audio(self._twilio_envelope.wrap(delta))
+
+    async def _handle_bookkeeping_event(self, event):
+        """Bookkeeping lane: token usage, errors and transcripts."""
+        event_type = event.get("type")
+        
+        # Token usage tracking - EXACT counts from OpenAI
+        if event_type == "response.done":
+            usage = event.get("response", {}).get("usage", {})
+            
+            # Get exact token breakdown
+            input_tokens = usage.get("input_tokens", 0)
+            output_tokens = usage.get("output_tokens", 0)
+            total = usage.get("total_tokens", 0)
+            
+            # If total is provided, use it; otherwise sum input+output
+            tokens_this_response = total if total > 0 else (input_tokens + output_tokens)
+            
+            if tokens_this_response > 0:
+                self.total_token_usage += tokens_this_response
+                metrics.TOKENS_TOTAL.labels(source="realtime").inc(tokens_this_response)
+                logger.info(f"[{self.call_id}] Tokens this response: in={input_tokens}, out={output_tokens}, total={tokens_this_response} | Running total={self.total_token_usage}")
+            
+            # Log full usage object for debugging
+            if usage:
+                logger.debug(f"[{self.call_id}] Full usage data: {usage}")
+        
+        # Error handling
+        elif event_type == "error":
+            logger.error(f"[{self.call_id}] OpenAI error: {event}")
+            error_type = (event.get("error") or {}).get("type") or "unknown"
+            metrics.ERRORS_TOTAL.labels(type=f"openai_{error_type}").inc()
+
+        # Transcript logging
+        elif event_type == "response.audio_transcript.done":
+            transcript = event.get("transcript")
+            if transcript:
+                logger.info(f"[{self.call_id}] AI: {transcript}")
+                self._add_transcript("ai", transcript)
+
+        elif event_type == "conversation.item.input_audio_transcription.completed":
+            transcript = event.get("transcript")
+            if transcript:
+                logger.info(f"[{self.call_id}] User: {transcript}")
+                self._add_transcript("user", transcript)
+
+    def lane_stats(self) -> dict:
+        """Per-lane queue depth and wait-time metrics for this call."""
+        return {
+            lane.name: lane.stats()
+            for lane in (self.audio_lane, self.tool_lane, self.bookkeeping_lane)
+        }
+
     async def _handle_tool_call(self, event):
         """Handle knowledge base search tool call."""
         call_id = event.get("call_id")
@@ -348,17 +621,21 @@ class RealtimeOrchestrator:
         if name != "search_knowledge_base":
             return
             
+        started = time.perf_counter()
         try:
             query = json.loads(args).get("query")
             logger.info(f"[{self.call_id}] KB search: '{query}'")
             
-            results = await self.qdrant_service.search(query)
+            results = await qdrant_service.search(query)
             result_text = "\n".join(results) if results else "No information found."
             
             await self.realtime_service.send_tool_output(call_id, result_text)
         except Exception as e:
             logger.error(f"[{self.call_id}] Tool call failed: {e}")
+            metrics.ERRORS_TOTAL.labels(type="tool_call_failed").inc()
             await self.realtime_service.send_tool_output(call_id, "Error searching.")
+        finally:
+            metrics.TOOL_CALL_SECONDS.labels(tool=name).observe(time.perf_counter() - started)
 
     async def _translate_to_english_async(self, text: str) -> str:
         """Transliterate text to English/Roman script (non-blocking)."""
@@ -367,47 +644,41 @@ class RealtimeOrchestrator:
             return text
             
         try:
-            client = get_openai_client()
-            response = await client.chat.completions.create(
-                model=settings.CHAT_MODEL,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "Transliterate to Roman script. Keep words, change script. Example: 'నమస్కారం' → 'Namaskaram'. Output only transliteration."
-                    },
-                    {"role": "user", "content": text}
-                ],
-                max_tokens=100,
-                temperature=0.1
-            )
+            roman, tokens = await transliterate_to_roman(text)
             # Track tokens from transliteration
-            if hasattr(response, 'usage') and response.usage:
-                tokens = response.usage.total_tokens
+            if tokens:
                 self.total_token_usage += tokens
+                metrics.TOKENS_TOTAL.labels(source="transliteration").inc(tokens)
                 logger.info(f"[{self.call_id}] Transliteration tokens: +{tokens}")
-            return response.choices[0].message.content.strip()
+            return roman
         except Exception as e:
             logger.warning(f"Transliteration failed: {e}")
             return text
 
     def _add_transcript(self, speaker: str, text: str):
-        """Add transcript entry immediately (transliteration happens in background)."""
+        """Add transcript entry immediately (romanized locally; LLM fallback in background)."""
         # Get current time in IST (UTC + 5:30)
         utc_now = datetime.now(timezone.utc)
         ist_offset = timedelta(hours=5, minutes=30)
         ist_time = utc_now + ist_offset
         now = ist_time.strftime('%Y-%m-%dT%H:%M:%S') + '+05:30'
         
-        # Add transcript immediately with original text (no blocking)
+        if speaker == "user":
+            for tag, letters in language_letters(text).items():
+                self._caller_letters[tag] = self._caller_letters.get(tag, 0) + letters
+        
+        # Indic scripts are romanized in microseconds by the local engine
+        text = romanize(text)
         entry = {"speaker": speaker, "text": text, "timestamp": now}
         self.dashboard_transcript.append(entry)
+        event_hub.publish_transcript(self.call_id, len(self.dashboard_transcript) - 1, [entry])
         self.conversation_history.append({
             "role": "assistant" if speaker == "ai" else "user", 
             "content": text
         })
         
-        # Transliterate in background if needed (non-blocking)
-        if not text.isascii():
+        # Scripts the local engine doesn't cover go to the LLM, if enabled (non-blocking)
+        if not text.isascii() and settings.TRANSLITERATION_LLM_FALLBACK:
             asyncio.create_task(self._update_transcript_async(len(self.dashboard_transcript) - 1, text))
     
     async def _update_transcript_async(self, index: int, text: str):
@@ -416,6 +687,7 @@ class RealtimeOrchestrator:
             english_text = await self._translate_to_english_async(text)
             if index < len(self.dashboard_transcript):
                 self.dashboard_transcript[index]["text"] = english_text
+                event_hub.publish_transcript(self.call_id, index, [self.dashboard_transcript[index]])
             if index < len(self.conversation_history):
                 self.conversation_history[index]["content"] = english_text
         except Exception as e:
@@ -423,13 +695,56 @@ class RealtimeOrchestrator:
 
     async def process_media(self, payload: str):
         """Forward audio from Twilio to OpenAI Realtime."""
-        await self.realtime_service.send_audio(payload)
+        await self._check_barge_in(payload)
+        if self.media_coalescer:
+            await self._coalesce_media(payload)
+        else:
+            await self.realtime_service.send_audio(payload)
+
+    async def process_media_fast(self, payload: str):
+        """Forward a Twilio frame payload as a pre-serialized append event (no dict, no json.dumps)."""
+        if not self.realtime_service.ws:
+            return
+        await self._check_barge_in(payload)
+        if self.media_coalescer:
+            await self._coalesce_media(payload)
+        else:
+            await self.realtime_service.send_raw(build_append_event(payload), audio=True)
+
+    async def _coalesce_media(self, payload: str):
+        message = self.media_coalescer.add(payload)
+        if message:
+            await self.realtime_service.send_raw(message, audio=True)
+
+    async def _flush_media(self):
+        """Send the caller audio still held by the coalescer (the end of their last words)."""
+        message = self.media_coalescer.flush() if self.media_coalescer else None
+        if message:
+            try:
+                await self.realtime_service.send_raw(message, audio=True)
+            except Exception as e:
+                logger.warning(f"[{self.call_id}] Failed to flush buffered caller audio: {e}")
 
     async def handle_disconnect(self):
         """Clean up on call disconnect."""
         logger.info(f"[{self.call_id}] Call ended")
+        self.ended = True
+        if "twilio_start" in self.milestones:
+            metrics.ACTIVE_CALLS.dec()
+            call_seconds = self._mark("disconnect")
+            metrics.CALL_DURATION_SECONDS.observe(call_seconds)
+            event_hub.publish_call_ended(self.call_id, {"status": "completed", "duration": int(call_seconds)})
+        openai_outbox = self.realtime_service.outbox
+        await self._flush_media()
         await self.realtime_service.close()
         
+        # Let queued transcripts land before the summary; pending tool calls are moot now
+        await self.audio_lane.stop(timeout=0)
+        await self.tool_lane.stop(timeout=0)
+        await self.bookkeeping_lane.stop(timeout=2.0)
+        await self.twilio_outbox.close(timeout=0)
+        self._record_pipeline_metrics(openai_outbox)
+        
         try:
             # Get current time in IST
             utc_now = datetime.now(timezone.utc)
@@ -438,65 +753,45 @@ class RealtimeOrchestrator:
             
             duration = int((end_time - self.start_timestamp).total_seconds())
             
-            # Generate meaningful summary from conversation
-            summary = self._generate_summary()
-            
-            supabase.table("calls").update({
+            # Full end state in one upsert (complete even if the initial record never landed)
+            record = {
+                **self._call_record_base(),
                 "call_status": "completed",
                 "end_time": end_time.strftime('%Y-%m-%dT%H:%M:%S') + '+05:30',
-                "call_duration": duration,
-                "summary": summary,
+                "call_duration": duration
+            }
+            language = self._caller_language()
+            if language:
+                record["language"] = language
+            await call_record_writer.submit(self.call_id, {
+                **record,
                 "transcript": self.dashboard_transcript,
                 "token_usage": self.total_token_usage
-            }).eq("call_id", self.call_id).execute()
+            })
+            
+            # Summary, final transliteration and the finished record happen off the call path
+            await post_call_processor.submit(PostCallJob(
+                call_id=self.call_id,
+                record=record,
+                transcript=[dict(entry) for entry in self.dashboard_transcript],
+                conversation_history=[dict(msg) for msg in self.conversation_history],
+                token_usage=self.total_token_usage
+            ))
             
-            logger.info(f"[{self.call_id}] Saved. Duration: {duration}s, Tokens: {self.total_token_usage}")
+            logger.info(f"[{self.call_id}] Queued final record. Duration: {duration}s, Tokens: {self.total_token_usage}")
         except Exception as e:
             logger.error(f"[{self.call_id}] DB update failed: {e}")
-
-    def _generate_summary(self) -> str:
-        """Generate short AI summary of the call."""
-        if not self.conversation_history:
-            return "No conversation."
-        
-        if len(self.conversation_history) <= 1:
-            return "Short call - minimal interaction."
-        
-        # Build conversation text
-        conversation_text = ""
-        for msg in self.conversation_history:
-            role = "Caller" if msg["role"] == "user" else "AI"
-            conversation_text += f"{role}: {msg['content']}\n"
-        
-        try:
-            client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
-            response = client.chat.completions.create(
-                model=settings.CHAT_MODEL,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """Summarize this VocalQ call in 1-2 crisp sentences (max 3 if absolutely needed).
-
-Format: "Caller asked about [topic]. [Outcome]."
-
-Examples:
-- "Caller asked about pricing plans. Provided VocalQ subscription details."
-- "Caller inquired about Tekisho services. Information shared successfully."
-- "Short call - caller hung up after greeting."
-
-Be specific, professional, and ultra-concise."""
-                    },
-                    {"role": "user", "content": f"Call transcript:\n{conversation_text}"}
-                ],
-                max_tokens=80,
-                temperature=0.2
-            )
-            # Track tokens from summary generation
-            if hasattr(response, 'usage') and response.usage:
-                tokens = response.usage.total_tokens
-                self.total_token_usage += tokens
-                logger.info(f"[{self.call_id}] Summary tokens: +{tokens}")
-            return response.choices[0].message.content.strip()
-        except Exception as e:
-            logger.error(f"[{self.call_id}] Summary failed: {e}")
-            return "Call completed."
+            metrics.ERRORS_TOTAL.labels(type="db_update_failed").inc()
+
+    def _record_pipeline_metrics(self, openai_outbox):
+        """Log and export per-call lane and send-queue health."""
+        lane_stats = self.lane_stats()
+        for lane, stats in lane_stats.items():
+            metrics.EVENT_LANE_MAX_WAIT_SECONDS.labels(lane=lane).observe(stats["max_wait_ms"] / 1000)
+            metrics.EVENT_LANE_MAX_DEPTH.labels(lane=lane).observe(stats["max_depth"])
+        for leg, outbox in (("twilio", self.twilio_outbox), ("openai", openai_outbox)):
+            if outbox:
+                metrics.SEND_QUEUE_HIGH_WATER.labels(leg=leg).observe(outbox.high_water)
+                metrics.SEND_QUEUE_DROPPED_TOTAL.labels(leg=leg).inc(outbox.dropped)
+        logger.info(f"[{self.call_id}] Event lane stats: {lane_stats}")
+        logger.info(f"[{self.call_id}] Send queue stats: twilio={self.twilio_outbox.stats()}, openai={openai_outbox.stats() if openai_outbox else None}")
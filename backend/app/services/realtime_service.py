@@ -1,18 +1,24 @@
 import asyncio
 import json
 import logging
+import time
 import websockets
+from websockets.protocol import State
 from app.core.config import settings
+from app.services.send_queue import OutboundQueue
 
 logger = logging.getLogger(__name__)
 
 class RealtimeService:
     def __init__(self):
         # Use Realtime Model from .env config
-        self.url = f"wss://api.openai.com/v1/realtime?model={settings.REALTIME_MODEL}"
+        self.url = f"{settings.REALTIME_URL}?model={settings.REALTIME_MODEL}"
         self.api_key = settings.OPENAI_API_KEY
         self.ws = None
         self.session_config = None
+        self.connected_at = None
+        self.session_ready = False
+        self.outbox = None
 
     async def connect(self):
         """Establish WebSocket connection to OpenAI Realtime API."""
@@ -23,6 +29,7 @@ class RealtimeService:
         try:
             logger.info(f"Connecting to OpenAI Realtime at {self.url}...")
             self.ws = await websockets.connect(self.url, additional_headers=headers)
+            self.connected_at = time.time()
             logger.info("Connected to OpenAI Realtime API - WebSocket Open")
         except Exception as e:
             logger.error(f"Failed to connect to OpenAI Realtime API: {e}")
@@ -39,7 +46,7 @@ class RealtimeService:
                 "modalities": ["text", "audio"],
                 "input_audio_format": "g711_ulaw",
                 "output_audio_format": "g711_ulaw",
-                "voice": "alloy",
+                "voice": settings.REALTIME_VOICE,
                 "temperature": 0.6,
                 "max_response_output_tokens": 150,
                 "input_audio_transcription": {
@@ -66,6 +73,45 @@ class RealtimeService:
         logger.info("Sending session.update to OpenAI")
         await self.ws.send(json.dumps(session_update))
 
+    async def wait_for_session_updated(self, timeout: float) -> bool:
+        """Consume events until OpenAI confirms the session.update (before the event loop takes over)."""
+        if not self.ws:
+            return False
+
+        async def _wait():
+            while True:
+                data = json.loads(await self.ws.recv())
+                if data.get("type") == "session.updated":
+                    return
+                if data.get("type") == "error":
+                    logger.error(f"OpenAI error while waiting for session.updated: {data}")
+
+        try:
+            await asyncio.wait_for(_wait(), timeout=timeout)
+            self.session_ready = True
+        except asyncio.TimeoutError:
+            logger.warning("Timed out waiting for session.updated")
+        return self.session_ready
+
+    def attach_outbox(self, maxsize: int, audio_policy: str, call_id: str = "") -> OutboundQueue:
+        """Route all sends through a bounded queue drained by one writer task."""
+        self.outbox = OutboundQueue("openai", self.ws.send, maxsize, audio_policy, call_id)
+        self.outbox.start()
+        return self.outbox
+
+    async def _send(self, message: str, audio: bool = False):
+        if self.outbox:
+            if audio:
+                await self.outbox.put_audio(message)
+            else:
+                await self.outbox.put_control(message)
+        else:
+            await self.ws.send(message)
+
+    def is_open(self) -> bool:
+        """Whether the underlying WebSocket is still usable."""
+        return self.ws is not None and self.ws.state is State.OPEN
+
     async def send_audio(self, base64_audio: str):
         """Send audio delta to OpenAI."""
         if not self.ws:
@@ -75,26 +121,32 @@ class RealtimeService:
             "type": "input_audio_buffer.append",
             "audio": base64_audio
         }
-        await self.ws.send(json.dumps(event))
+        await self._send(json.dumps(event), audio=True)
         
         
+    async def send_raw(self, message: str, audio: bool = False):
+        """Send an already-serialized event (media ingress fast path)."""
+        if not self.ws:
+            return
+        await self._send(message, audio=audio)
+
     async def commit_audio(self):
          """Commit audio buffer (usually not needed with VAD enabled, but good practice)."""
          if not self.ws:
              return
-         await self.ws.send(json.dumps({"type": "input_audio_buffer.commit"}))
+         await self._send(json.dumps({"type": "input_audio_buffer.commit"}))
          
     async def create_response(self):
         """Trigger a response generation."""
         if not self.ws:
             return
-        await self.ws.send(json.dumps({"type": "response.create"}))
+        await self._send(json.dumps({"type": "response.create"}))
 
     async def send_to_ws(self, event: dict):
         """Send a raw event dictionary to the WebSocket."""
         if not self.ws:
             return
-        await self.ws.send(json.dumps(event))
+        await self._send(json.dumps(event))
 
     async def send_conversation_item(self, item: dict):
         """Send a conversation item (e.g. system message or user message)."""
@@ -104,7 +156,7 @@ class RealtimeService:
             "type": "conversation.item.create",
             "item": item
         }
-        await self.ws.send(json.dumps(event))
+        await self._send(json.dumps(event))
 
     async def send_tool_output(self, call_id: str, output: str):
         """Send tool output back to OpenAI."""
@@ -119,7 +171,7 @@ class RealtimeService:
                 "output": output
             }
         }
-        await self.ws.send(json.dumps(event))
+        await self._send(json.dumps(event))
         
         # Trigger another response after tool output
         await self.create_response()
@@ -136,7 +188,18 @@ class RealtimeService:
             except json.JSONDecodeError:
                 logger.error("Failed to decode JSON from OpenAI")
     
+    async def receive_raw(self):
+        """Yield raw text frames from OpenAI WebSocket (callers decode what they need)."""
+        if not self.ws:
+            return
+        
+        async for message in self.ws:
+            yield message
+
     async def close(self):
+        if self.outbox:
+            await self.outbox.close(timeout=0.2)
+            self.outbox = None
         if self.ws:
             await self.ws.close()
             self.ws = None
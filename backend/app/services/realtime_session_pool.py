@@ -0,0 +1,279 @@
+"""
+Realtime Session Pool - keeps OpenAI Realtime sessions connected and already
+configured (system prompt + tools) so an inbound call can skip the TLS/WebSocket
+handshake and the session.update round trip.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional
+
+from app.core.config import settings
+from app.core import metrics
+from app.services.realtime_service import RealtimeService
+
+logger = logging.getLogger(__name__)
+
+# How long a cold (pool miss) session waits for session.updated before proceeding anyway
+COLD_SESSION_TIMEOUT = 1.5
+# Warm sessions are only pooled once OpenAI has confirmed the configuration
+WARM_SESSION_TIMEOUT = 5.0
+# Seconds between refill/recycle passes when nothing is leased
+REFILL_INTERVAL = 5.0
+# Back-off after a failed warm-up so a bad key or outage doesn't spin
+FAILURE_BACKOFF = 10.0
+
+
+@dataclass
+class Reservation:
+    """A session being opened speculatively for a call that has not streamed yet."""
+    task: asyncio.Task
+    started_at: float = field(default_factory=time.perf_counter)
+    ready_at: Optional[float] = None
+
+
+class RealtimeSessionPool:
+    """Pool of pre-warmed RealtimeService sessions, refilled in the background."""
+
+    def __init__(self, instructions: str, tools: list, size: int = None, max_age: int = None):
+        self.instructions = instructions
+        self.tools = tools
+        self.size = settings.REALTIME_POOL_SIZE if size is None else size
+        self.max_age = settings.REALTIME_POOL_MAX_AGE if max_age is None else max_age
+
+        self._idle = deque()
+        self._opening = 0
+        self._refill_needed = asyncio.Event()
+        self._refill_task = None
+        self._backoff_until = 0.0
+        self._reservations = {}
+        self._warming = set()        # _warm_one tasks in flight
+        self._stopped = False
+
+        # Stats
+        self.hits = 0
+        self.misses = 0
+        self.recycled = 0
+        self.failures = 0
+        self._lease_latencies = deque(maxlen=500)
+        self.reserved = 0
+        self.claimed = 0
+        self.orphaned = 0
+        self.over_cap = 0
+        self._saved_ms = deque(maxlen=500)
+
+    async def start(self):
+        """Start the background refill loop."""
+        if self.size <= 0 or not settings.OPENAI_API_KEY:
+            logger.info("Realtime session pool disabled")
+            return
+        self._stopped = False
+        if self._refill_task is None:
+            self._refill_task = asyncio.create_task(self._refill_loop())
+            logger.info(f"Realtime session pool started (size={self.size}, max_age={self.max_age}s)")
+
+    async def stop(self):
+        """Stop refilling, cancel warm-ups in flight and close every idle session."""
+        self._stopped = True
+        if self._refill_task:
+            self._refill_task.cancel()
+            self._refill_task = None
+        for key in list(self._reservations):
+            self._expire_reservation(key)
+        # A cancelled warm-up closes its half-open session (_open_session)
+        warming = list(self._warming)
+        for task in warming:
+            task.cancel()
+        await asyncio.gather(*warming, return_exceptions=True)
+        while self._idle:
+            await self._idle.popleft().close()
+
+    async def lease(self) -> RealtimeService:
+        """
+        Get a connected, configured session.
+        Pool hits return instantly; misses open a fresh session on the caller's time.
+        """
+        started = time.perf_counter()
+        service = None
+
+        while self._idle:
+            candidate = self._idle.popleft()
+            if candidate.is_open() and not self._is_expired(candidate):
+                service = candidate
+                break
+            self.recycled += 1
+            asyncio.create_task(candidate.close())
+
+        if service:
+            self.hits += 1
+            metrics.POOL_LEASES_TOTAL.labels(result="hit").inc()
+        else:
+            self.misses += 1
+            metrics.POOL_LEASES_TOTAL.labels(result="miss").inc()
+            service = await self._open_session(COLD_SESSION_TIMEOUT)
+
+        elapsed = time.perf_counter() - started
+        self._lease_latencies.append(elapsed * 1000)
+        metrics.POOL_LEASE_SECONDS.observe(elapsed)
+        metrics.POOL_IDLE_SESSIONS.set(len(self._idle))
+        self._refill_needed.set()
+        return service
+
+    def reserve(self, key: str):
+        """
+        Start leasing a session for a call that is about to stream (keyed by CallSid).
+        Overlaps the OpenAI handshake with Twilio's own stream setup. At most
+        REALTIME_PREWARM_MAX_PENDING are pending; beyond that the call leases on arrival.
+        """
+        if not key or key in self._reservations:
+            return
+        if len(self._reservations) >= settings.REALTIME_PREWARM_MAX_PENDING:
+            self.over_cap += 1
+            logger.warning(f"Speculative session for {key} skipped ({len(self._reservations)} pending)")
+            return
+        reservation = Reservation(task=asyncio.create_task(self.lease()))
+
+        def _on_ready(_task):
+            reservation.ready_at = time.perf_counter()
+
+        reservation.task.add_done_callback(_on_ready)
+        self._reservations[key] = reservation
+        self.reserved += 1
+        asyncio.get_running_loop().call_later(
+            settings.REALTIME_PREWARM_TIMEOUT, self._expire_reservation, key
+        )
+
+    async def claim(self, key: str):
+        """
+        Adopt the session reserved for `key`.
+        Returns (service, saved_ms) or None if nothing usable was reserved.
+        """
+        reservation = self._reservations.pop(key, None) if key else None
+        if not reservation:
+            return None
+
+        claimed_at = time.perf_counter()
+        try:
+            service = await reservation.task
+        except Exception as e:
+            logger.warning(f"Speculative session for {key} failed: {e}")
+            return None
+
+        # Time-to-greeting saved = the part of the lease that ran before the stream arrived
+        saved_ms = (min(reservation.ready_at or claimed_at, claimed_at) - reservation.started_at) * 1000
+        self.claimed += 1
+        self._saved_ms.append(saved_ms)
+        return service, saved_ms
+
+    def _expire_reservation(self, key: str):
+        """Garbage-collect a reservation whose stream never arrived."""
+        reservation = self._reservations.pop(key, None)
+        if not reservation:
+            return
+        self.orphaned += 1
+        logger.info(f"Speculative session for {key} orphaned - closing")
+
+        def _close(task):
+            if not task.cancelled() and task.exception() is None:
+                asyncio.create_task(task.result().close())
+
+        if reservation.task.done():
+            _close(reservation.task)
+        else:
+            reservation.task.add_done_callback(_close)
+            reservation.task.cancel()
+
+    def stats(self) -> dict:
+        """Pool counters for sizing against peak concurrent calls."""
+        latencies = sorted(self._lease_latencies)
+        total = self.hits + self.misses
+        return {
+            "size": self.size,
+            "idle": len(self._idle),
+            "opening": self._opening,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "recycled": self.recycled,
+            "failures": self.failures,
+            "lease_latency_ms": {
+                "avg": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+                "p50": round(latencies[len(latencies) // 2], 2) if latencies else 0.0,
+                "p95": round(latencies[int(len(latencies) * 0.95)], 2) if latencies else 0.0,
+                "max": round(latencies[-1], 2) if latencies else 0.0,
+            },
+            "speculative": {
+                "pending": len(self._reservations),
+                "reserved": self.reserved,
+                "claimed": self.claimed,
+                "orphaned": self.orphaned,
+                "over_cap": self.over_cap,
+                "avg_saved_ms": round(sum(self._saved_ms) / len(self._saved_ms), 2) if self._saved_ms else 0.0,
+            },
+        }
+
+    def _is_expired(self, service: RealtimeService) -> bool:
+        return time.time() - (service.connected_at or 0) > self.max_age
+
+    async def _open_session(self, ready_timeout: float) -> RealtimeService:
+        """Connect and configure a new session (closed again if this is cancelled or fails)."""
+        service = RealtimeService()
+        try:
+            await service.connect()
+            await service.update_session(instructions=self.instructions, tools=self.tools)
+            await service.wait_for_session_updated(ready_timeout)
+        except BaseException:
+            await service.close()
+            raise
+        return service
+
+    async def _warm_one(self):
+        """Open one session and add it to the idle pool."""
+        self._opening += 1
+        try:
+            service = await self._open_session(WARM_SESSION_TIMEOUT)
+            if not service.session_ready:
+                await service.close()
+                raise RuntimeError("session.updated not received")
+            if self._stopped:
+                await service.close()
+                return
+            self._idle.append(service)
+            metrics.POOL_IDLE_SESSIONS.set(len(self._idle))
+        except Exception as e:
+            self.failures += 1
+            self._backoff_until = time.time() + FAILURE_BACKOFF
+            logger.warning(f"Realtime pool warm-up failed: {e}")
+        finally:
+            self._opening -= 1
+
+    async def _refill_loop(self):
+        """Recycle stale sessions and top the pool back up to `size`."""
+        while True:
+            try:
+                # Recycle sessions before they approach the server-side session limit
+                for service in list(self._idle):
+                    if self._is_expired(service) or not service.is_open():
+                        self._idle.remove(service)
+                        self.recycled += 1
+                        asyncio.create_task(service.close())
+
+                if time.time() >= self._backoff_until:
+                    missing = self.size - len(self._idle) - self._opening
+                    for _ in range(max(missing, 0)):
+                        task = asyncio.create_task(self._warm_one())
+                        self._warming.add(task)
+                        task.add_done_callback(self._warming.discard)
+
+                self._refill_needed.clear()
+                try:
+                    await asyncio.wait_for(self._refill_needed.wait(), timeout=REFILL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Realtime pool refill error: {e}")
+                await asyncio.sleep(REFILL_INTERVAL)
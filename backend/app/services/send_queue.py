@@ -0,0 +1,141 @@
+"""
+Outbound send queues - one bounded queue and one writer task per socket, so a
+congested Twilio or OpenAI leg never stalls the reader loop on the other side.
+"""
+import asyncio
+import logging
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# Overflow policies for audio messages (control messages always block)
+DROP_OLDEST = "drop_oldest"
+BLOCK = "block"
+
+
+class OutboundQueue:
+    """Bounded FIFO of serialized messages drained by a single writer task."""
+
+    def __init__(self, name: str, send, maxsize: int, audio_policy: str = DROP_OLDEST, call_id: str = ""):
+        if audio_policy not in (DROP_OLDEST, BLOCK):
+            raise ValueError(f"Unknown overflow policy: {audio_policy}")
+        self.name = name
+        self.send = send
+        self.maxsize = maxsize
+        self.audio_policy = audio_policy
+        self.call_id = call_id
+
+        # Items are (is_audio, message) so overflow can evict audio but never control events
+        self._items = deque()
+        self._has_items = asyncio.Event()
+        self._has_space = asyncio.Event()
+        self._has_space.set()
+        self._task = None
+        self._sending = False
+        self.closed = False
+
+        # Stats
+        self.sent = 0
+        self.dropped = 0
+        self.high_water = 0
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._writer())
+
+    async def put_audio(self, message: str):
+        """Queue audio; on overflow drop the oldest queued audio or wait, per policy."""
+        if self.closed:
+            return
+        if len(self._items) >= self.maxsize and self.audio_policy == DROP_OLDEST:
+            if self._drop_oldest_audio():
+                self._append(True, message)
+                return
+        await self._wait_for_space()
+        self._append(True, message)
+
+    async def put_control(self, message: str):
+        """Queue a control event; waits for space rather than dropping."""
+        if self.closed:
+            return
+        await self._wait_for_space()
+        self._append(False, message)
+
+    def clear_audio(self) -> int:
+        """Discard queued audio (e.g. on barge-in) and keep control events. Returns how many were dropped."""
+        kept = deque(item for item in self._items if not item[0])
+        cleared = len(self._items) - len(kept)
+        self._items = kept
+        if len(self._items) < self.maxsize:
+            self._has_space.set()
+        return cleared
+
+    async def close(self, timeout: float = 1.0):
+        """Flush what is queued (up to `timeout`), then stop the writer."""
+        if self._task is None:
+            self.closed = True
+            return
+        try:
+            await asyncio.wait_for(self._drain(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        self.closed = True
+        self._task.cancel()
+        self._task = None
+        self._items.clear()
+        self._has_space.set()
+
+    def stats(self) -> dict:
+        return {
+            "depth": len(self._items),
+            "high_water": self.high_water,
+            "maxsize": self.maxsize,
+            "sent": self.sent,
+            "dropped": self.dropped,
+        }
+
+    def _append(self, is_audio: bool, message: str):
+        self._items.append((is_audio, message))
+        if len(self._items) > self.high_water:
+            self.high_water = len(self._items)
+        self._has_items.set()
+
+    def _drop_oldest_audio(self) -> bool:
+        for index, (is_audio, _) in enumerate(self._items):
+            if is_audio:
+                del self._items[index]
+                self.dropped += 1
+                return True
+        return False
+
+    async def _wait_for_space(self):
+        while len(self._items) >= self.maxsize and not self.closed:
+            self._has_space.clear()
+            await self._has_space.wait()
+
+    async def _drain(self):
+        while (self._items or self._sending) and not self.closed:
+            await asyncio.sleep(0.01)
+
+    async def _writer(self):
+        while True:
+            if not self._items:
+                self._has_items.clear()
+                await self._has_items.wait()
+                continue
+
+            _, message = self._items.popleft()
+            self._has_space.set()
+            self._sending = True
+            try:
+                await self.send(message)
+                self.sent += 1
+            except Exception as e:
+                # The socket is gone; stop accepting work instead of failing per message
+                logger.warning(f"[{self.call_id}] {self.name} writer stopped: {e}")
+                self.closed = True
+                self._items.clear()
+                self._has_space.set()
+                return
+            finally:
+                self._sending = False
@@ -0,0 +1,224 @@
+"""
+Transliteration - offline, rule-based romanization of Indic transcripts.
+
+The Brahmic Unicode blocks (Devanagari, Bengali, Gurmukhi, Gujarati, Oriya,
+Tamil, Telugu, Kannada, Malayalam) share one layout, so a single offset table
+plus a few per-script overrides covers all of them. Output uses the casual
+spelling people type in chat ("namaskaaram", "dhanyavaad", "vanakkam").
+Text in other scripts is left as-is for the (opt-in) LLM fallback.
+"""
+import unicodedata
+from functools import lru_cache
+
+from app.core.config import settings
+
+# Block start -> script name (each block is 0x80 code points)
+_BLOCKS = {
+    0x0900: "devanagari",
+    0x0980: "bengali",
+    0x0A00: "gurmukhi",
+    0x0A80: "gujarati",
+    0x0B00: "oriya",
+    0x0B80: "tamil",
+    0x0C00: "telugu",
+    0x0C80: "kannada",
+    0x0D00: "malayalam",
+}
+
+# Independent vowels (offset within block)
+_VOWELS = {
+    0x04: "a", 0x05: "a", 0x06: "aa", 0x07: "i", 0x08: "ee", 0x09: "u", 0x0A: "oo",
+    0x0B: "ru", 0x0C: "lu", 0x0D: "e", 0x0E: "e", 0x0F: "e", 0x10: "ai",
+    0x11: "o", 0x12: "o", 0x13: "o", 0x14: "au", 0x60: "roo", 0x61: "loo",
+    0x72: "", 0x73: "",  # Gurmukhi vowel bearers; the following sign supplies the vowel
+}
+
+# Dependent vowel signs (matras); 0x4D is the virama
+_SIGNS = {
+    0x3E: "aa", 0x3F: "i", 0x40: "ee", 0x41: "u", 0x42: "oo", 0x43: "ru", 0x44: "roo",
+    0x45: "e", 0x46: "e", 0x47: "e", 0x48: "ai", 0x49: "o", 0x4A: "o", 0x4B: "o", 0x4C: "au",
+    0x62: "lu", 0x63: "loo",
+}
+_VIRAMA = 0x4D
+_NUKTA = 0x3C
+
+_CONSONANTS = {
+    0x15: "k", 0x16: "kh", 0x17: "g", 0x18: "gh", 0x19: "ng",
+    0x1A: "ch", 0x1B: "chh", 0x1C: "j", 0x1D: "jh", 0x1E: "ny",
+    0x1F: "t", 0x20: "th", 0x21: "d", 0x22: "dh", 0x23: "n",
+    0x24: "t", 0x25: "th", 0x26: "d", 0x27: "dh", 0x28: "n", 0x29: "n",
+    0x2A: "p", 0x2B: "ph", 0x2C: "b", 0x2D: "bh", 0x2E: "m",
+    0x2F: "y", 0x30: "r", 0x31: "r", 0x32: "l", 0x33: "l", 0x34: "zh", 0x35: "v",
+    0x36: "sh", 0x37: "sh", 0x38: "s", 0x39: "h",
+    # Precomposed nukta / extra letters
+    0x58: "q", 0x59: "kh", 0x5A: "g", 0x5B: "z", 0x5C: "r", 0x5D: "rh", 0x5E: "f", 0x5F: "y",
+    0x71: "w",  # Oriya wa (Gurmukhi addak is handled separately)
+}
+
+_SCRIPT_CONSONANTS = {
+    "tamil": {0x24: "th"},
+    "bengali": {0x2F: "j", 0x4E: "t"},
+    "malayalam": {0x7A: "n", 0x7B: "n", 0x7C: "r", 0x7D: "l", 0x7E: "l", 0x7F: "k"},
+}
+# Malayalam chillus are complete consonants with no vowel
+_DEAD_CONSONANTS = {("malayalam", off) for off in range(0x7A, 0x80)} | {("bengali", 0x4E)}
+
+# Consonant + nukta
+_NUKTA_FORMS = {"k": "q", "kh": "kh", "g": "g", "j": "z", "ph": "f", "d": "r", "dh": "rh", "y": "y"}
+
+_OTHER_MARKS = {
+    0x00: "n", 0x01: "n", 0x03: "h", 0x3D: "", 0x50: "om",
+    0x51: "", 0x52: "", 0x55: "", 0x56: "", 0x57: "",
+    0x64: ".", 0x65: ".", 0x70: "n",  # danda, double danda, Gurmukhi tippi
+}
+_ANUSVARA = 0x02
+_ADDAK = ("gurmukhi", 0x71)
+_LABIALS = {0x2A, 0x2B, 0x2C, 0x2D, 0x2E}
+
+# Scripts whose word-final inherent vowel is silent (kamal, not kamala)
+_SCHWA_DELETION = {"devanagari", "bengali", "gurmukhi", "gujarati"}
+# Language each script is taken to mean (BCP-47), for the call's language column
+_SCRIPT_LANGUAGES = {
+    "devanagari": "hi-IN",
+    "bengali": "bn-IN",
+    "gurmukhi": "pa-IN",
+    "gujarati": "gu-IN",
+    "oriya": "or-IN",
+    "tamil": "ta-IN",
+    "telugu": "te-IN",
+    "kannada": "kn-IN",
+    "malayalam": "ml-IN",
+}
+# Word-final long vowels are written short in casual spelling (hindi, accha, ela)
+_FINAL_SHORT = {"aa": "a", "ee": "i", "oo": "u"}
+
+_PUNCTUATION = {
+    "\u2018": "'", "\u2019": "'", "\u201c": '"', "\u201d": '"', "\u2013": "-", "\u2014": "-",
+    "\u2026": "...", "\u00a0": " ", "\u200c": "", "\u200d": "", "\u20b9": "Rs ",
+}
+
+
+def _script_of(ch: str):
+    cp = ord(ch)
+    base = cp & ~0x7F
+    script = _BLOCKS.get(base)
+    return (script, cp - base) if script else (None, None)
+
+
+def _consonant(script: str, off: int):
+    return _SCRIPT_CONSONANTS.get(script, {}).get(off) or _CONSONANTS.get(off)
+
+
+def _is_letter(ch: str) -> bool:
+    script, off = _script_of(ch)
+    # Everything in a block except dandas and digits
+    return script is not None and not 0x64 <= off <= 0x6F
+
+
+def _romanize(text: str) -> str:
+    out = []
+    n = len(text)
+    i = 0
+    aksharas = 0      # aksharas so far in the current word
+    geminate = False  # Gurmukhi addak doubles the next consonant
+    while i < n:
+        ch = text[i]
+        script, off = _script_of(ch)
+        if script is None:
+            out.append(_PUNCTUATION.get(ch, ch))
+            aksharas = 0
+            i += 1
+            continue
+
+        if (script, off) == _ADDAK:
+            geminate = True
+            i += 1
+            continue
+
+        cons = _consonant(script, off)
+        if cons is not None and (script, off) not in _DEAD_CONSONANTS:
+            j = i + 1
+            if j < n and _script_of(text[j]) == (script, _NUKTA):
+                cons = _NUKTA_FORMS.get(cons, cons)
+                j += 1
+            next_script, next_off = _script_of(text[j]) if j < n else (None, None)
+            if next_script == script and next_off == _VIRAMA:
+                vowel = ""
+                j += 1
+            elif next_script == script and next_off in _SIGNS:
+                vowel = _SIGNS[next_off]
+                j += 1
+                if j >= n or not _is_letter(text[j]):
+                    vowel = _FINAL_SHORT.get(vowel, vowel)
+            else:
+                vowel = "a"
+                word_ends = j >= n or not _is_letter(text[j])
+                if word_ends and aksharas and script in _SCHWA_DELETION:
+                    vowel = ""
+            if geminate:
+                cons = cons[0] + cons
+                geminate = False
+            out.append(cons + vowel)
+            aksharas += 1
+            i = j
+            continue
+
+        if cons is not None:
+            # Dead consonant (chillu, khanda ta)
+            out.append(cons)
+        elif off in _VOWELS:
+            out.append(_VOWELS[off])
+            aksharas += 1
+        elif off in _SIGNS:
+            # Sign without a consonant (e.g. after a Gurmukhi vowel bearer)
+            out.append(_SIGNS[off])
+        elif off == _ANUSVARA:
+            next_script, next_off = _script_of(text[i + 1]) if i + 1 < n else (None, None)
+            if next_script == script and next_off in _LABIALS:
+                out.append("m")
+            elif next_script != script and script not in _SCHWA_DELETION:
+                out.append("m")  # Dravidian word-final anusvara: namaskaaram
+            else:
+                out.append("n")
+        elif off in _OTHER_MARKS:
+            out.append(_OTHER_MARKS[off])
+        elif 0x66 <= off <= 0x6F:
+            out.append(str(off - 0x66))
+        else:
+            out.append(ch)
+        i += 1
+
+    result = "".join(out)
+    if not result.isascii():
+        # Accented Latin (café -> cafe); anything else stays for the fallback
+        result = "".join(
+            c for c in unicodedata.normalize("NFKD", result) if not unicodedata.combining(c)
+        )
+    if result and not text[0].isascii():
+        result = result[0].upper() + result[1:]
+    return result
+
+
+def language_letters(text: str) -> dict:
+    """
+    Letters per language tag in (not yet romanized) text: Brahmic scripts map to
+    their language, Latin letters count as en-US, other scripts are ignored.
+    """
+    counts = {}
+    for ch in text:
+        if ch.isascii():
+            tag = "en-US" if ch.isalpha() else None
+        else:
+            script, off = _script_of(ch)
+            tag = _SCRIPT_LANGUAGES[script] if script and _is_letter(ch) else None
+        if tag:
+            counts[tag] = counts.get(tag, 0) + 1
+    return counts
+
+
+@lru_cache(maxsize=settings.TRANSLITERATION_CACHE_SIZE)
+def romanize(text: str) -> str:
+    """Romanize Indic-script text (cached). Unsupported scripts are returned unchanged."""
+    if text.isascii():
+        return text
+    return _romanize(text)
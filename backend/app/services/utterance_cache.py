@@ -0,0 +1,99 @@
+"""
+Utterance Cache - pre-rendered g711 μ-law audio for scripted phrases (greeting,
+closing line), keyed by text + voice. Captured from the first live rendering,
+persisted to disk, and played straight to Twilio on later calls.
+
+Lookups are memory-only: preload() reads the disk cache once at startup, and
+writes/removals are handed to background tasks, so a call never waits on file I/O.
+"""
+import asyncio
+import hashlib
+import logging
+import re
+from pathlib import Path
+from typing import Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_phrase(text: str) -> str:
+    """Compare phrases ignoring case, punctuation and spacing."""
+    return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+
+class UtteranceCache:
+    """Memory + disk cache of μ-law renderings of scripted phrases."""
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = Path(cache_dir)
+        self._memory = {}
+        # Disk updates run in order, off the caller's path
+        self._disk_lock = asyncio.Lock()
+        self._disk_tasks = set()
+
+    def _key(self, text: str, voice: str) -> str:
+        return hashlib.sha1(f"{voice}\n{normalize_phrase(text)}".encode()).hexdigest()[:20]
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.ulaw"
+
+    def preload(self) -> int:
+        """Load every persisted rendering into memory (blocking; run in a thread at startup)."""
+        loaded = 0
+        if self.cache_dir.is_dir():
+            for path in self.cache_dir.glob("*.ulaw"):
+                try:
+                    self._memory.setdefault(path.stem, path.read_bytes())
+                    loaded += 1
+                except OSError as e:
+                    logger.warning(f"Failed to load utterance cache entry {path.name}: {e}")
+        return loaded
+
+    def get(self, text: str, voice: str = None) -> Optional[bytes]:
+        """Return cached audio for the phrase (memory only; see preload)."""
+        return self._memory.get(self._key(text, voice or settings.REALTIME_VOICE))
+
+    def put(self, text: str, audio: bytes, voice: str = None):
+        """Store a rendering in memory; it is persisted to disk in the background."""
+        key = self._key(text, voice or settings.REALTIME_VOICE)
+        self._memory[key] = audio
+        self._on_disk(f"Cached rendering of '{text[:40]}' ({len(audio)} bytes)", self._write, key, audio)
+
+    def invalidate(self, text: str, voice: str = None):
+        """Drop the cached rendering of a phrase (e.g. when the greeting changes)."""
+        key = self._key(text, voice or settings.REALTIME_VOICE)
+        self._memory.pop(key, None)
+        self._on_disk(None, self._remove, key)
+
+    async def flush(self):
+        """Wait for pending disk updates (shutdown)."""
+        if self._disk_tasks:
+            await asyncio.gather(*self._disk_tasks, return_exceptions=True)
+
+    def _on_disk(self, message: Optional[str], func, *args):
+        task = asyncio.create_task(self._run_on_disk(func, args, message))
+        self._disk_tasks.add(task)
+        task.add_done_callback(self._disk_tasks.discard)
+
+    async def _run_on_disk(self, func, args, message: Optional[str]):
+        async with self._disk_lock:
+            try:
+                await asyncio.to_thread(func, *args)
+                if message:
+                    logger.info(message)
+            except Exception as e:
+                logger.warning(f"Utterance cache disk update failed: {e}")
+
+    def _write(self, key: str, audio: bytes):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self._path(key).with_suffix(".tmp")
+        tmp.write_bytes(audio)
+        tmp.replace(self._path(key))
+
+    def _remove(self, key: str):
+        self._path(key).unlink(missing_ok=True)
+
+
+utterance_cache = UtteranceCache(settings.UTTERANCE_CACHE_DIR)
@@ -0,0 +1,158 @@
+"""
+Vector Replica - in-process copy of the knowledge_base collection for KB search
+during calls without a network round trip.
+
+Vectors are kept L2-normalized in one contiguous float32 matrix (rows grow by
+doubling) with payloads alongside, so a cosine search is a single matrix-vector
+product plus argpartition. Qdrant stays the source of truth: the replica is
+loaded by scrolling the collection and QdrantService applies each of its writes
+here too. A reload (for writes made by other processes) journals the writes
+that land while it scrolls and replays them onto the fresh copy before swapping.
+"""
+import logging
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class VectorReplica:
+    """Normalized float32 vectors + payloads, keyed by point id."""
+
+    def __init__(self, dim: int, capacity: int = 1024):
+        self.dim = dim
+        self._vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self._ids = []
+        self._payloads = []
+        self._rows = {}
+        self._journal = None
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    # --- Writes ---
+    def upsert(self, points: Iterable[tuple]):
+        """(point_id, vector, payload) tuples; existing ids are overwritten."""
+        points = list(points)
+        self._record("upsert", points)
+        if not points:
+            return
+        matrix = _normalized(np.asarray([vector for _, vector, _ in points], dtype=np.float32))
+        for (point_id, _, payload), vector in zip(points, matrix):
+            row = self._rows.get(point_id)
+            if row is None:
+                row = len(self._ids)
+                self._grow(row + 1)
+                self._rows[point_id] = row
+                self._ids.append(point_id)
+                self._payloads.append(payload)
+            else:
+                self._payloads[row] = payload
+            self._vectors[row] = vector
+
+    def delete(self, point_ids: Iterable):
+        point_ids = list(point_ids)
+        self._record("delete", point_ids)
+        for point_id in point_ids:
+            row = self._rows.pop(point_id, None)
+            if row is None:
+                continue
+            # Move the last row into the hole
+            last = len(self._ids) - 1
+            if row != last:
+                moved = self._ids[last]
+                self._vectors[row] = self._vectors[last]
+                self._ids[row] = moved
+                self._payloads[row] = self._payloads[last]
+                self._rows[moved] = row
+            self._ids.pop()
+            self._payloads.pop()
+
+    def delete_where(self, key: str, value):
+        """Delete points whose payload metadata has key == value."""
+        self._record("delete_where", key, value)
+        self.delete([
+            point_id for point_id, payload in zip(self._ids, self._payloads)
+            if (payload.get("metadata") or {}).get(key) == value
+        ])
+
+    def set_metadata(self, point_ids: Iterable, fields: dict):
+        point_ids = list(point_ids)
+        self._record("set_metadata", point_ids, fields)
+        for point_id in point_ids:
+            row = self._rows.get(point_id)
+            if row is not None:
+                payload = self._payloads[row]
+                self._payloads[row] = {**payload, "metadata": {**(payload.get("metadata") or {}), **fields}}
+
+    def clear(self):
+        self._record("clear")
+        self.drop()
+
+    def drop(self):
+        """Free the contents without journaling (the replica is out of use until the next reload)."""
+        self._vectors = np.zeros((1024, self.dim), dtype=np.float32)
+        self._ids = []
+        self._payloads = []
+        self._rows = {}
+
+    # --- Reads ---
+    def search(self, vector, limit: int) -> List[dict]:
+        """Payloads of the `limit` nearest points by cosine similarity, best first."""
+        count = len(self._ids)
+        if not count or limit <= 0:
+            return []
+        query = _normalized(np.asarray(vector, dtype=np.float32).reshape(1, -1))[0]
+        scores = self._vectors[:count] @ query
+        if count > limit:
+            top = np.argpartition(scores, count - limit)[count - limit:]
+        else:
+            top = np.arange(count)
+        top = top[np.argsort(-scores[top])]
+        return [self._payloads[row] for row in top]
+
+    def items(self):
+        """(point_id, payload) of every point."""
+        return zip(self._ids, self._payloads)
+
+    # --- Reload ---
+    @property
+    def reloading(self) -> bool:
+        return self._journal is not None
+
+    def begin_reload(self):
+        """Start journaling writes so they can be replayed onto a freshly loaded copy."""
+        self._journal = []
+
+    def end_reload(self, fresh: Optional["VectorReplica"]) -> bool:
+        """
+        Replay the journal onto fresh (None = reload failed) and adopt its contents.
+        Returns whether the points (ids and payloads) differ from what was replaced.
+        """
+        journal, self._journal = self._journal, None
+        if fresh is None:
+            return False
+        for op, args in journal or []:
+            getattr(fresh, op)(*args)
+        changed = self._rows.keys() != fresh._rows.keys() or any(
+            self._payloads[row] != fresh._payloads[fresh._rows[point_id]] for point_id, row in self._rows.items()
+        )
+        self._vectors, self._ids, self._payloads, self._rows = fresh._vectors, fresh._ids, fresh._payloads, fresh._rows
+        return changed
+
+    def _record(self, op: str, *args):
+        if self._journal is not None:
+            self._journal.append((op, args))
+
+    def _grow(self, rows: int):
+        if rows > len(self._vectors):
+            grown = np.zeros((max(rows, 2 * len(self._vectors)), self.dim), dtype=np.float32)
+            grown[:len(self._ids)] = self._vectors[:len(self._ids)]
+            self._vectors = grown
+
+
+def _normalized(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
@@ -2,11 +2,11 @@
 Quick script to create the payload index on existing Qdrant collection
 """
 import asyncio
-from app.services.qdrant_service import QdrantService
+from app.services.qdrant_service import qdrant_service
 from qdrant_client.http import models
 
 async def create_index():
-    service = QdrantService()
+    service = qdrant_service
     
     try:
         print("Creating payload index for metadata.doc_id...")
@@ -0,0 +1,6 @@
+"""
+Offline load-test harness - mock OpenAI Realtime / Supabase / Qdrant / OpenAI
+HTTP stubs plus a swarm of simulated Twilio Media Stream callers.
+
+Run from backend/: python -m loadtest.run --stages 10,25,50
+"""
@@ -0,0 +1,28 @@
+"""
+Backend launcher for load tests - serves app.main with uvicorn at warning log
+level (access logs off) so logging doesn't skew the measurements.
+
+Usage: python -m loadtest.backend --port 8901
+"""
+import argparse
+import asyncio
+
+import uvicorn
+
+
+async def serve(host: str, port: int):
+    from app.main import app
+    server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning"))
+    await server.serve()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8901)
+    args = parser.parse_args()
+    asyncio.run(serve(args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Simulated Twilio caller - streams paced 20 ms μ-law media frames into
+/api/v1/stream (silence while listening, a voiced tone while "speaking") and
+timestamps the AI audio that comes back.
+"""
+import asyncio
+import base64
+import json
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+import websockets
+
+from app.services.barge_in import FRAME_MS, FRAME_SAMPLES, SAMPLE_RATE, ulaw_encode
+
+_t = np.arange(FRAME_SAMPLES) / SAMPLE_RATE
+_SPEECH_FRAME = base64.b64encode(ulaw_encode(0.2 * np.sin(2 * np.pi * 200 * _t))).decode()
+_SILENCE_FRAME = base64.b64encode(b"\xff" * FRAME_SAMPLES).decode()
+
+
+@dataclass
+class CallResult:
+    index: int
+    ok: bool = False
+    error: str = ""
+    greeting_ms: float = None              # start event -> first AI audio
+    turn_latencies_ms: list = field(default_factory=list)  # end of caller speech -> first AI audio
+    unanswered_turns: int = 0
+    media_received: int = 0
+    duration_s: float = 0.0
+
+
+class SimulatedCaller:
+    """One Twilio Media Stream: listen to the greeting, then alternate speaking and listening."""
+
+    def __init__(self, url: str, index: int, duration_s: float, speech_ms: int = 1200, listen_ms: int = 3000):
+        self.url = url
+        self.result = CallResult(index)
+        self.duration_s = duration_s
+        self.speech_frames = speech_ms // FRAME_MS
+        self.listen_frames = listen_ms // FRAME_MS
+        self.stream_sid = f"MZloadtest{index:06d}"
+        self._started_at = None
+        self._speech_ended_at = None
+
+    async def run(self) -> CallResult:
+        began = time.perf_counter()
+        try:
+            async with websockets.connect(self.url, max_size=None) as ws:
+                receiver = asyncio.create_task(self._receive(ws))
+                try:
+                    await self._send_call(ws)
+                finally:
+                    receiver.cancel()
+            self.result.ok = True
+        except Exception as e:
+            self.result.error = f"{type(e).__name__}: {e}"
+        self.result.duration_s = time.perf_counter() - began
+        return self.result
+
+    async def _send_call(self, ws):
+        await ws.send(json.dumps({"event": "connected", "protocol": "Call", "version": "1.0.0"}))
+        await ws.send(json.dumps({
+            "event": "start",
+            "streamSid": self.stream_sid,
+            "start": {
+                "streamSid": self.stream_sid,
+                "callSid": f"CAloadtest{self.result.index:06d}",
+                "customParameters": {"callerNumber": f"+1555{self.result.index:07d}"},
+            },
+        }))
+        self._started_at = time.perf_counter()
+
+        loop = asyncio.get_running_loop()
+        next_frame = loop.time()
+        deadline = next_frame + self.duration_s
+        sequence = 0
+
+        async def send_frames(count: int, payload: str):
+            nonlocal next_frame, sequence
+            for _ in range(count):
+                sequence += 1
+                # Compact form, event name first - exactly like Twilio
+                await ws.send(
+                    '{"event":"media","sequenceNumber":"%d","media":{"track":"inbound","chunk":"%d","timestamp":"%d","payload":"%s"},"streamSid":"%s"}'
+                    % (sequence, sequence, sequence * FRAME_MS, payload, self.stream_sid)
+                )
+                next_frame += FRAME_MS / 1000
+                await asyncio.sleep(max(0.0, next_frame - loop.time()))
+
+        # Listen to the greeting, then take turns until the call time is used up
+        await send_frames(self.listen_frames, _SILENCE_FRAME)
+        while loop.time() + (self.speech_frames + self.listen_frames) * FRAME_MS / 1000 <= deadline:
+            if self._speech_ended_at is not None:
+                self.result.unanswered_turns += 1
+            await send_frames(self.speech_frames, _SPEECH_FRAME)
+            self._speech_ended_at = time.perf_counter()
+            await send_frames(self.listen_frames, _SILENCE_FRAME)
+        if self._speech_ended_at is not None:
+            self.result.unanswered_turns += 1
+
+        await ws.send(json.dumps({"event": "stop", "streamSid": self.stream_sid, "stop": {}}))
+
+    async def _receive(self, ws):
+        async for message in ws:
+            if not message.startswith('{"event":"media"'):
+                continue
+            now = time.perf_counter()
+            self.result.media_received += 1
+            if self.result.greeting_ms is None and self._started_at is not None:
+                self.result.greeting_ms = (now - self._started_at) * 1000
+            if self._speech_ended_at is not None:
+                self.result.turn_latencies_ms.append((now - self._speech_ended_at) * 1000)
+                self._speech_ended_at = None
@@ -0,0 +1,96 @@
+"""
+Ingestion throughput check - embeds and stores one synthetic document against the
+load-test stubs and reports chunks per second. --baseline also times the old path
+(one embedding request and one single-point upsert per chunk, sequentially).
+
+Usage: python -m loadtest.ingest_bench [--chunks 200] [--http-delay-ms 50] [--baseline]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from loadtest.run import BACKEND_DIR, start_process, wait_until_up
+
+
+def make_chunks(count: int) -> list:
+    # Distinct texts, so no two chunks share an embedding cache entry
+    return [
+        f"Section {i}. Tekisho's VocalQ plan {i} includes {i % 7 + 1} phone numbers and "
+        f"{(i % 5 + 1) * 500} minutes of AI voice per month. " * 8
+        for i in range(count)
+    ]
+
+
+async def run_batched(service, chunks: list) -> float:
+    started = time.perf_counter()
+    items = [(idx, service._generate_point_id("0123456789ab", chunk), chunk) for idx, chunk in enumerate(chunks)]
+    stored = await service._store_chunks(items, {"doc_id": "0123456789ab", "source": "bench.txt"})
+    assert stored == len(chunks), f"stored {stored}/{len(chunks)}"
+    return time.perf_counter() - started
+
+
+async def run_baseline(service, chunks: list) -> float:
+    """The pre-batching behaviour: one embedding request and one upsert per chunk."""
+    from app.services.audio_service import AudioService
+    started = time.perf_counter()
+    for idx, chunk in enumerate(chunks):
+        embedding = await AudioService.get_openai_embedding(chunk)
+        await service.qdrant_service.add_point(
+            point_id=service._generate_point_id("0123456789ab", chunk),
+            vector=embedding,
+            payload={"text": chunk, "metadata": {"chunk_index": idx}}
+        )
+    return time.perf_counter() - started
+
+
+def report(name: str, chunks: int, elapsed: float):
+    print(f"{name:<10} {chunks} chunks in {elapsed:6.2f}s  ->  {chunks / elapsed:7.1f} chunks/s")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=200)
+    parser.add_argument("--http-delay-ms", type=int, default=50)
+    parser.add_argument("--stub-port", type=int, default=8900)
+    parser.add_argument("--baseline", action="store_true")
+    args = parser.parse_args()
+
+    stub = f"127.0.0.1:{args.stub_port}"
+    workdir = tempfile.mkdtemp(prefix="vocalq-ingest-")
+    # Must be set before app.core.config is imported
+    os.environ.update({
+        "SUPABASE_URL": f"http://{stub}",
+        "SUPABASE_KEY": "loadtest",
+        "OPENAI_API_KEY": "loadtest",
+        "OPENAI_BASE_URL": f"http://{stub}/v1",
+        "QDRANT_URL": f"http://{stub}",
+        "EMBEDDING_CACHE_ENABLED": "false",
+    })
+    stub_proc = start_process(
+        [sys.executable, "-m", "loadtest.stubs", "--port", str(args.stub_port), "--http-delay-ms", str(args.http_delay_ms)],
+        {**os.environ, "PYTHONPATH": str(BACKEND_DIR)}, str(BACKEND_DIR), Path(workdir) / "stubs.log",
+    )
+    try:
+        await wait_until_up(f"http://{stub}/")
+        from app.services.audio_service import get_openai_client
+        from app.services.document_ingestion_service import DocumentIngestionService
+        get_openai_client()
+        service = DocumentIngestionService()
+        chunks = make_chunks(args.chunks)
+        # Warm both connection pools first
+        await service._store_chunks([(0, service._generate_point_id("warmup", chunks[0]), chunks[0])], {"doc_id": "warmup", "source": "warmup.txt"})
+
+        report("batched", len(chunks), await run_batched(service, chunks))
+        if args.baseline:
+            report("baseline", len(chunks), await run_baseline(service, chunks))
+    finally:
+        stub_proc.terminate()
+        stub_proc.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
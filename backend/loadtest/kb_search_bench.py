@@ -0,0 +1,129 @@
+"""
+KB search latency check - times the in-process vector replica against the remote
+Qdrant query for the same query vectors and reports p50/p99 of each (the query
+embedding is excluded; both paths get an already-embedded query).
+
+By default the remote side is the load-test Qdrant stub (a local HTTP round trip
+plus --http-delay-ms). With --qdrant-url the points are uploaded to a scratch
+collection on a real server instead, and the replica's top results are also
+checked against Qdrant's (recall@limit; HNSW is approximate, the replica is exact).
+
+Usage: python -m loadtest.kb_search_bench [--points 5000] [--queries 500] [--limit 3]
+                                          [--http-delay-ms 0] [--qdrant-url URL]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http import models
+
+from loadtest.run import BACKEND_DIR, start_process, wait_until_up
+from app.services.vector_replica import VectorReplica
+
+DIM = 1536
+COLLECTION = "kb_search_bench"
+
+
+def make_points(count: int, rng: np.random.Generator) -> list:
+    vectors = rng.standard_normal((count, DIM), dtype=np.float32)
+    return [
+        (i, vectors[i].tolist(), {"text": f"Snippet {i}", "metadata": {"doc_id": f"doc{i // 20}", "chunk_index": i % 20}})
+        for i in range(count)
+    ]
+
+
+def percentiles(samples: list) -> str:
+    ordered = sorted(samples)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return f"p50 {statistics.median(ordered) * 1000:8.3f} ms   p99 {p99 * 1000:8.3f} ms"
+
+
+async def upload(client: AsyncQdrantClient, points: list):
+    await client.recreate_collection(
+        collection_name=COLLECTION,
+        vectors_config=models.VectorParams(size=DIM, distance=models.Distance.COSINE),
+    )
+    for start in range(0, len(points), 256):
+        await client.upsert(
+            collection_name=COLLECTION,
+            points=[models.PointStruct(id=i, vector=v, payload=p) for i, v, p in points[start:start + 256]],
+            wait=True,
+        )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=3)
+    parser.add_argument("--http-delay-ms", type=int, default=0)
+    parser.add_argument("--stub-port", type=int, default=8900)
+    parser.add_argument("--qdrant-url", help="real Qdrant server (a scratch collection is created and dropped)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    points = make_points(args.points, rng)
+    queries = rng.standard_normal((args.queries, DIM), dtype=np.float32).tolist()
+
+    started = time.perf_counter()
+    replica = VectorReplica(DIM)
+    replica.upsert(points)
+    print(f"Replica: {len(replica)} x {DIM} loaded in {time.perf_counter() - started:.2f}s "
+          f"({replica._vectors.nbytes / 1024 / 1024:.0f} MB)")
+
+    stub_proc = None
+    if args.qdrant_url:
+        url = args.qdrant_url
+    else:
+        url = f"http://127.0.0.1:{args.stub_port}"
+        workdir = tempfile.mkdtemp(prefix="vocalq-kbsearch-")
+        stub_proc = start_process(
+            [sys.executable, "-m", "loadtest.stubs", "--port", str(args.stub_port), "--http-delay-ms", str(args.http_delay_ms)],
+            {**os.environ, "PYTHONPATH": str(BACKEND_DIR)}, str(BACKEND_DIR), Path(workdir) / "stubs.log",
+        )
+    client = AsyncQdrantClient(url=url)
+    try:
+        if stub_proc is not None:
+            await wait_until_up(f"{url}/")
+        else:
+            await upload(client, points)
+
+        replica_times, replica_hits = [], []
+        for query in queries:
+            t0 = time.perf_counter()
+            hits = replica.search(query, args.limit)
+            replica_times.append(time.perf_counter() - t0)
+            replica_hits.append({hit["text"] for hit in hits})
+
+        remote_times, remote_hits = [], []
+        # Warm the connection first
+        await client.query_points(collection_name=COLLECTION, query=queries[0], limit=args.limit, with_payload=True)
+        for query in queries:
+            t0 = time.perf_counter()
+            result = await client.query_points(collection_name=COLLECTION, query=query, limit=args.limit, with_payload=True)
+            remote_times.append(time.perf_counter() - t0)
+            remote_hits.append({hit.payload.get("text") for hit in result.points})
+
+        print(f"{'replica':<8} {percentiles(replica_times)}")
+        print(f"{'qdrant':<8} {percentiles(remote_times)}   ({'server ' + url if stub_proc is None else f'stub, +{args.http_delay_ms} ms'})")
+        if stub_proc is None:
+            recall = sum(len(a & b) for a, b in zip(replica_hits, remote_hits)) / (args.limit * len(queries))
+            print(f"recall@{args.limit} of Qdrant vs. exact replica search: {recall:.3f}")
+    finally:
+        if stub_proc is None:
+            await client.delete_collection(COLLECTION)
+        await client.close()
+        if stub_proc is not None:
+            stub_proc.terminate()
+            stub_proc.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,144 @@
+"""
+Upload parse lag check - parses a generated 15 MB PDF the way an upload does while
+sampling event-loop lag with a 1 ms ticker. The same ticker first runs idle for as
+long as the parse takes; the check fails if the worst lag during the parse exceeds
+the idle worst (the host's own timer jitter) by more than --max-lag-ms.
+--baseline also times the old path (PyPDF2 + chunking inline on the loop).
+
+The PDF has text on every page plus an embedded binary stream per page (like the
+scans and images that make real uploads large).
+
+Usage: python -m loadtest.parse_lag [--size-mb 15] [--pages 300] [--max-lag-ms 5] [--baseline]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import zlib
+
+from loadtest.run import percentile
+
+TICK = 0.001
+
+PARAGRAPH = (
+    "VocalQ by Tekisho answers inbound calls around the clock. Plans start at ten dollars "
+    "per month and include call summaries, transcripts and knowledge base search. "
+)
+
+
+def write_pdf(path: str, pages: int, size_mb: float):
+    """Minimal multi-page PDF: Helvetica text plus an unused incompressible stream per page."""
+    filler_bytes = max(0, int(size_mb * 1024 * 1024 / pages) - 3200)
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in range(pages):
+        page_text = f"Page {page + 1}. " + PARAGRAPH * 25
+        lines = [page_text[i:i + 90] for i in range(0, 40 * 90, 90)]
+        text = "".join(f"({line.replace('(', '').replace(')', '')}) Tj T* " for line in lines)
+        content = f"BT /F1 9 Tf 11 TL 40 780 Td {text}ET".encode()
+        filler = zlib.compress(os.urandom(filler_bytes), 0)[:filler_bytes]
+        objects.append(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+        content_id = len(objects)
+        objects.append(b"<< /Length %d >>\nstream\n" % len(filler) + filler + b"\nendstream")
+        filler_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 3 0 R >> /XObject << /Fill %d 0 R >> >> >>" % (content_id, filler_id)
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % k for k in kids), pages)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+async def sample_lag(samples: list, stop: asyncio.Event):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK)
+        samples.append(max(0.0, time.perf_counter() - started - TICK) * 1000)
+
+
+async def measure(parse) -> tuple:
+    samples, stop = [], asyncio.Event()
+    sampler = asyncio.create_task(sample_lag(samples, stop))
+    await asyncio.sleep(0.05)
+    started = time.perf_counter()
+    chunks = await parse()
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await sampler
+    return samples, elapsed, len(chunks)
+
+
+def report(name: str, samples: list, elapsed: float, chunks: int):
+    print(
+        f"{name:<10} {chunks} chunks in {elapsed:5.2f}s | loop lag "
+        f"p50 {percentile(samples, 50):6.2f}ms  p99 {percentile(samples, 99):7.2f}ms  max {max(samples):8.2f}ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=float, default=15)
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--max-lag-ms", type=float, default=5)
+    parser.add_argument("--baseline", action="store_true")
+    args = parser.parse_args()
+
+    os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:1")
+    os.environ.setdefault("SUPABASE_KEY", "loadtest")
+    from app.services.chunker import chunk_by_tokens
+    from app.services.document_ingestion_service import DocumentIngestionService, IngestionProgress
+    from app.services.document_parser import extract_pdf_pages, get_parse_pool, pdf_page_count
+
+    path = os.path.join(tempfile.mkdtemp(prefix="vocalq-parse-"), "upload.pdf")
+    write_pdf(path, args.pages, args.size_mb)
+    print(f"PDF: {os.path.getsize(path) / 1024 / 1024:.1f} MB, {args.pages} pages, {get_parse_pool()._max_workers} parse workers")
+
+    service = DocumentIngestionService()
+
+    async def pooled():
+        # The upload's parse and chunk stages (no embedding/storage)
+        progress = IngestionProgress(file_name="upload.pdf")
+        return [chunk async for chunk in service._iter_chunks(path, "upload.pdf", None, progress, lambda: None)]
+
+    async def inline():
+        text = "\n".join(extract_pdf_pages(path, 0, pdf_page_count(path)))
+        return chunk_by_tokens(text, 256, 40)
+
+    # Start the workers first (a running server has them warm after its first upload)
+    await pooled()
+
+    samples, elapsed, chunks = await measure(pooled)
+
+    async def idle():
+        await asyncio.sleep(elapsed)
+        return []
+
+    idle_samples, _, _ = await measure(idle)
+    report("idle", idle_samples, elapsed, 0)
+    report("pool", samples, elapsed, chunks)
+    if args.baseline:
+        report("baseline", *await measure(inline))
+
+    added = max(samples) - max(idle_samples)
+    if added > args.max_lag_ms:
+        print(f"FAIL: parsing added {added:.2f}ms to max loop lag (limit {args.max_lag_ms:.0f}ms)")
+        sys.exit(1)
+    print(f"PASS: parsing added {max(0.0, added):.2f}ms to max loop lag (limit {args.max_lag_ms:.0f}ms)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
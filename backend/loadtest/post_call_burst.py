@@ -0,0 +1,150 @@
+"""
+Post-call burst check - 50 calls hang up at once; the event loop must stay responsive
+while their summaries, transliteration passes and record writes run.
+
+Starts the load-test stubs, queues one PostCallJob per call, and samples event-loop
+lag with a 10 ms ticker until every job has finished. Exits non-zero if the worst
+lag exceeds --max-lag-ms. --baseline also times the old path (a new synchronous
+OpenAI client and a blocking completion per call, on the loop) for comparison.
+
+Usage: python -m loadtest.post_call_burst [--calls 50] [--max-lag-ms 50] [--baseline]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from loadtest.run import BACKEND_DIR, percentile, start_process, wait_until_up
+
+TICK = 0.01
+
+
+async def sample_lag(samples: list, stop: asyncio.Event):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK)
+        samples.append(max(0.0, time.perf_counter() - started - TICK) * 1000)
+
+
+def make_job(i: int):
+    from app.services.post_call_processor import PostCallJob
+    transcript = [
+        {"speaker": "ai", "text": "Hello, this is VocalQ from Tekisho. Which language do you prefer?", "timestamp": ""},
+        {"speaker": "user", "text": "Telugu please" if i % 2 else "నమస్కారం, ధరలు ఏమిటి?", "timestamp": ""},
+        {"speaker": "ai", "text": "Our plans start at ten dollars per month.", "timestamp": ""},
+    ]
+    history = [{"role": "assistant" if e["speaker"] == "ai" else "user", "content": e["text"]} for e in transcript]
+    return PostCallJob(
+        call_id=f"00000000-0000-4000-8000-{i:012d}",
+        record={"call_status": "completed", "call_duration": 60},
+        transcript=transcript,
+        conversation_history=history,
+        token_usage=1000,
+    )
+
+
+async def run_burst(calls: int) -> tuple:
+    from app.services.call_record_writer import call_record_writer
+    from app.services.post_call_processor import COMPLETED, post_call_processor
+    from app.services.audio_service import get_openai_client
+
+    # As in the app lifespan: shared client created before calls arrive
+    get_openai_client()
+    call_record_writer.start()
+    post_call_processor.start()
+    # One call first, so connection setup isn't counted as burst lag (a live server is warm)
+    await post_call_processor.submit(make_job(calls))
+    await post_call_processor.queue.join()
+
+    samples, stop = [], asyncio.Event()
+    sampler = asyncio.create_task(sample_lag(samples, stop))
+    started = time.perf_counter()
+
+    jobs = [make_job(i) for i in range(calls)]
+    # Every call's handle_disconnect queues its job at the same moment
+    await asyncio.gather(*(post_call_processor.submit(job) for job in jobs))
+    await post_call_processor.queue.join()
+    await call_record_writer.queue.join()
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await sampler
+    await post_call_processor.stop()
+    await call_record_writer.stop()
+    completed = sum(1 for job in jobs if job.status == COMPLETED)
+    return samples, elapsed, completed
+
+
+async def run_baseline(calls: int) -> tuple:
+    """The pre-queue behaviour: a blocking summary per call on the event loop."""
+    import openai
+    from app.core.config import settings
+
+    samples, stop = [], asyncio.Event()
+    sampler = asyncio.create_task(sample_lag(samples, stop))
+    started = time.perf_counter()
+
+    async def hang_up(i: int):
+        await asyncio.sleep(0)
+        client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
+        client.chat.completions.create(model=settings.CHAT_MODEL, messages=[{"role": "user", "content": "summary"}])
+
+    await asyncio.gather(*(hang_up(i) for i in range(calls)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await sampler
+    return samples, elapsed, calls
+
+
+def report(name: str, samples: list, elapsed: float, completed: int, calls: int):
+    print(
+        f"{name:<10} {completed}/{calls} done in {elapsed:5.1f}s | loop lag "
+        f"p50 {percentile(samples, 50):6.1f}ms  p99 {percentile(samples, 99):7.1f}ms  max {max(samples):7.1f}ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--max-lag-ms", type=float, default=50)
+    parser.add_argument("--llm-delay-ms", type=int, default=400)
+    parser.add_argument("--stub-port", type=int, default=8900)
+    parser.add_argument("--baseline", action="store_true")
+    args = parser.parse_args()
+
+    stub = f"127.0.0.1:{args.stub_port}"
+    # Must be set before app.core.config is imported
+    os.environ.update({
+        "SUPABASE_URL": f"http://{stub}",
+        "SUPABASE_KEY": "loadtest",
+        "OPENAI_API_KEY": "loadtest",
+        "OPENAI_BASE_URL": f"http://{stub}/v1",
+        "QDRANT_URL": f"http://{stub}",
+    })
+    workdir = tempfile.mkdtemp(prefix="vocalq-postcall-")
+    stub_proc = start_process(
+        [sys.executable, "-m", "loadtest.stubs", "--port", str(args.stub_port), "--llm-delay-ms", str(args.llm_delay_ms)],
+        {**os.environ, "PYTHONPATH": str(BACKEND_DIR)}, str(BACKEND_DIR), Path(workdir) / "stubs.log",
+    )
+    try:
+        await wait_until_up(f"http://{stub}/")
+        samples, elapsed, completed = await run_burst(args.calls)
+        report("queue", samples, elapsed, completed, args.calls)
+        if args.baseline:
+            report("baseline", *await run_baseline(args.calls), args.calls)
+    finally:
+        stub_proc.terminate()
+        stub_proc.wait(timeout=10)
+
+    worst = max(samples)
+    if completed < args.calls or worst > args.max_lag_ms:
+        print(f"FAIL: {completed}/{args.calls} jobs completed, max loop lag {worst:.1f}ms (limit {args.max_lag_ms:.0f}ms)")
+        sys.exit(1)
+    print(f"PASS: max loop lag {worst:.1f}ms <= {args.max_lag_ms:.0f}ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
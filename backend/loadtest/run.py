@@ -0,0 +1,240 @@
+"""
+Load-test runner - starts the stubs and one backend process (app.main:app under uvicorn)
+wired to them, then runs stages of N concurrent simulated calls and reports per stage:
+
+- calls completed / failed
+- backend CPU (% of one core, and CPU-ms per call-second) from /proc/<pid>/stat
+- event-loop lag percentiles (vocalq_event_loop_lag_seconds from /metrics)
+- time to greeting and end-to-end turn latency percentiles (caller's view)
+
+Stops at the first stage that misses the SLO and prints the highest passing stage
+as "calls per process". Everything runs locally; no network access needed.
+
+Usage: python -m loadtest.run [--stages 10,25,50,100] [--stage-seconds 30] [--slo-ms 1200]
+Extra backend settings can be passed as KEY=VALUE (e.g. MEDIA_COALESCE_MS=100).
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from prometheus_client.parser import text_string_to_metric_families
+
+from loadtest.caller import SimulatedCaller
+
+BACKEND_DIR = Path(__file__).parent.parent
+LOOP_LAG_METRIC = "vocalq_event_loop_lag_seconds"
+
+
+def percentile(values: list, pct: float):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def fmt_ms(value) -> str:
+    if value is None:
+        return "   n/a"
+    # Above the largest histogram bucket
+    return " >2500" if value == float("inf") else f"{value:6.0f}"
+
+
+def cpu_seconds(pid: int):
+    """utime + stime of a process (Linux /proc); None elsewhere."""
+    try:
+        fields = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+async def wait_until_up(url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(url, timeout=1.0)
+                return
+            except httpx.HTTPError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up within {timeout:.0f}s")
+
+
+async def loop_lag_buckets(metrics_url: str) -> dict:
+    """Cumulative bucket counts {upper_bound: count} of the backend's loop-lag histogram."""
+    async with httpx.AsyncClient() as client:
+        text = (await client.get(metrics_url, timeout=5.0)).text
+    for family in text_string_to_metric_families(text):
+        if family.name == LOOP_LAG_METRIC:
+            return {
+                float(s.labels["le"]): s.value
+                for s in family.samples if s.name.endswith("_bucket")
+            }
+    return {}
+
+
+def bucket_percentile(before: dict, after: dict, pct: float):
+    """Upper bound (ms) of the bucket holding the pct-th percentile of samples taken between two scrapes."""
+    deltas = sorted((le, after.get(le, 0) - before.get(le, 0)) for le in after)
+    total = deltas[-1][1] if deltas else 0
+    if not total:
+        return None
+    for le, count in deltas:
+        if count >= total * pct / 100:
+            return le * 1000
+    return None
+
+
+async def run_stage(args, calls: int, stream_url: str, metrics_url: str, backend_pid: int) -> dict:
+    lag_before = await loop_lag_buckets(metrics_url)
+    cpu_before = cpu_seconds(backend_pid)
+    started = time.perf_counter()
+
+    async def staggered(i: int):
+        # Spread call arrivals over the ramp window instead of a thundering herd
+        await asyncio.sleep(args.ramp_seconds * i / max(1, calls))
+        return await SimulatedCaller(stream_url, i, args.stage_seconds, args.speech_ms, args.listen_ms).run()
+
+    results = await asyncio.gather(*(staggered(i) for i in range(calls)))
+    # Let post-call work (summary, DB update) land before reading CPU and lag
+    await asyncio.sleep(args.settle_seconds)
+    wall = time.perf_counter() - started
+    cpu_after = cpu_seconds(backend_pid)
+    lag_after = await loop_lag_buckets(metrics_url)
+
+    ok = [r for r in results if r.ok]
+    turn_latencies = [ms for r in ok for ms in r.turn_latencies_ms]
+    greetings = [r.greeting_ms for r in ok if r.greeting_ms is not None]
+    call_seconds = sum(r.duration_s for r in ok)
+    cpu = None if cpu_before is None or cpu_after is None else cpu_after - cpu_before
+
+    stage = {
+        "calls": calls,
+        "ok": len(ok),
+        "failed": calls - len(ok),
+        "errors": sorted({r.error for r in results if r.error})[:3],
+        "unanswered": sum(r.unanswered_turns for r in ok),
+        "cpu_pct": None if cpu is None else cpu / wall * 100,
+        "cpu_ms_per_call_s": None if cpu is None or not call_seconds else cpu * 1000 / call_seconds,
+        "lag_p50": bucket_percentile(lag_before, lag_after, 50),
+        "lag_p99": bucket_percentile(lag_before, lag_after, 99),
+        "greeting_p50": percentile(greetings, 50),
+        "greeting_p95": percentile(greetings, 95),
+        "turn_p50": percentile(turn_latencies, 50),
+        "turn_p95": percentile(turn_latencies, 95),
+        "turn_p99": percentile(turn_latencies, 99),
+        "turns": len(turn_latencies),
+    }
+    stage["passed"] = (
+        stage["failed"] == 0
+        and stage["turn_p95"] is not None
+        and stage["turn_p95"] <= args.slo_ms
+        and (stage["lag_p99"] is None or stage["lag_p99"] <= args.lag_slo_ms)
+    )
+    return stage
+
+
+def print_stage(stage: dict, args):
+    cpu_pct = "  n/a" if stage["cpu_pct"] is None else f"{stage['cpu_pct']:5.1f}"
+    cpu_call = "  n/a" if stage["cpu_ms_per_call_s"] is None else f"{stage['cpu_ms_per_call_s']:5.1f}"
+    print(
+        f"{stage['calls']:>6} {stage['ok']:>4} {stage['failed']:>4} {cpu_pct:>6} {cpu_call:>8} "
+        f"{fmt_ms(stage['lag_p50'])} {fmt_ms(stage['lag_p99'])} "
+        f"{fmt_ms(stage['greeting_p50'])} {fmt_ms(stage['greeting_p95'])} "
+        f"{fmt_ms(stage['turn_p50'])} {fmt_ms(stage['turn_p95'])} {fmt_ms(stage['turn_p99'])} "
+        f"{'PASS' if stage['passed'] else 'FAIL':>5}"
+    )
+    for error in stage["errors"]:
+        print(f"       error: {error}")
+    if stage["unanswered"]:
+        print(f"       {stage['unanswered']} caller turns got no audio back")
+
+
+def start_process(cmd: list, env: dict, cwd: str, log_path: Path) -> subprocess.Popen:
+    log = open(log_path, "w")
+    return subprocess.Popen(cmd, env=env, cwd=cwd, stdout=log, stderr=subprocess.STDOUT)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stages", default="10,25,50,100", help="Concurrent calls per stage")
+    parser.add_argument("--stage-seconds", type=float, default=30)
+    parser.add_argument("--ramp-seconds", type=float, default=2)
+    parser.add_argument("--settle-seconds", type=float, default=3)
+    parser.add_argument("--speech-ms", type=int, default=1200)
+    parser.add_argument("--listen-ms", type=int, default=3000)
+    parser.add_argument("--slo-ms", type=float, default=1200, help="Max p95 end-to-end turn latency")
+    parser.add_argument("--lag-slo-ms", type=float, default=50, help="Max p99 event-loop lag")
+    parser.add_argument("--model-delay-ms", type=int, default=300)
+    parser.add_argument("--llm-delay-ms", type=int, default=400)
+    parser.add_argument("--keep-going", action="store_true", help="Run every stage even after an SLO miss")
+    parser.add_argument("--stub-port", type=int, default=8900)
+    parser.add_argument("--backend-port", type=int, default=8901)
+    parser.add_argument("settings", nargs="*", help="Backend settings overrides, KEY=VALUE")
+    args = parser.parse_args()
+
+    stub = f"127.0.0.1:{args.stub_port}"
+    workdir = tempfile.mkdtemp(prefix="vocalq-loadtest-")
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(BACKEND_DIR),
+        "SUPABASE_URL": f"http://{stub}",
+        "SUPABASE_KEY": "loadtest",
+        "OPENAI_API_KEY": "loadtest",
+        "OPENAI_BASE_URL": f"http://{stub}/v1",
+        "QDRANT_URL": f"http://{stub}",
+        "QDRANT_API_KEY": "",
+        "REALTIME_URL": f"ws://{stub}/v1/realtime",
+        "UTTERANCE_CACHE_DIR": str(Path(workdir) / "audio_cache"),
+    }
+    env.update(kv.split("=", 1) for kv in args.settings)
+
+    stub_proc = start_process(
+        [sys.executable, "-m", "loadtest.stubs", "--port", str(args.stub_port),
+         "--model-delay-ms", str(args.model_delay_ms), "--llm-delay-ms", str(args.llm_delay_ms)],
+        env, str(BACKEND_DIR), Path(workdir) / "stubs.log",
+    )
+    backend_proc = None
+    try:
+        await wait_until_up(f"http://{stub}/")
+        # Run from the temp dir so server_debug.log and a local .env stay out of the way
+        backend_proc = start_process(
+            [sys.executable, "-m", "loadtest.backend", "--port", str(args.backend_port)],
+            env, workdir, Path(workdir) / "backend.log",
+        )
+        backend = f"127.0.0.1:{args.backend_port}"
+        await wait_until_up(f"http://{backend}/")
+
+        print(f"Logs: {workdir}")
+        print(f"Stub model delay {args.model_delay_ms}ms + VAD silence 200ms are included in turn latency")
+        print(f"SLO: turn p95 <= {args.slo_ms:.0f}ms, loop lag p99 <= {args.lag_slo_ms:.0f}ms, no failed calls")
+        print(f"{'calls':>6} {'ok':>4} {'fail':>4} {'cpu%':>6} {'cpu/c-s':>8} "
+              f"{'lag50':>6} {'lag99':>6} {'grt50':>6} {'grt95':>6} {'turn50':>6} {'turn95':>6} {'turn99':>6} {'slo':>5}")
+
+        best = 0
+        for calls in (int(n) for n in args.stages.split(",")):
+            stage = await run_stage(args, calls, f"ws://{backend}/api/v1/stream", f"http://{backend}/metrics", backend_proc.pid)
+            print_stage(stage, args)
+            if stage["passed"]:
+                best = calls
+            elif not args.keep_going:
+                break
+        print(f"Calls per process within SLO: {best}")
+    finally:
+        for proc in (backend_proc, stub_proc):
+            if proc:
+                proc.terminate()
+                try:
+                    proc.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
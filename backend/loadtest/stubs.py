@@ -0,0 +1,288 @@
+"""
+Load-test stubs - one local server standing in for every external dependency:
+
+- OpenAI Realtime WebSocket (/v1/realtime): session.updated, an energy VAD on
+  appended audio (speech_started / speech_stopped), timed audio deltas,
+  transcripts, usage, and a knowledge-base function call every Nth turn
+- OpenAI HTTP (/v1/embeddings, /v1/chat/completions)
+- Supabase PostgREST (/rest/v1/*)
+- Qdrant REST (/collections/*)
+
+Usage: python -m loadtest.stubs --port 8900 [--model-delay-ms 300]
+"""
+import argparse
+import asyncio
+import base64
+import itertools
+import json
+import logging
+import time
+
+import numpy as np
+import uvicorn
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse
+
+from app.services.barge_in import SAMPLE_RATE, ulaw_decode, ulaw_encode
+
+logger = logging.getLogger("loadtest.stubs")
+
+EMBEDDING_DIM = 1536
+
+
+class StubConfig:
+    """Timing knobs for the mock Realtime model (set from the command line)."""
+    model_delay_ms = 300       # speech_stopped / response.create -> response.created
+    response_audio_ms = 1500   # length of each spoken response
+    audio_chunk_ms = 100       # audio per response.audio.delta
+    audio_speedup = 4.0        # deltas arrive this much faster than real time (like OpenAI)
+    vad_silence_ms = 200       # matches turn_detection.silence_duration_ms
+    vad_threshold_dbfs = -40.0
+    tool_every = 3             # every Nth caller turn triggers search_knowledge_base (0 = never)
+    http_delay_ms = 50         # latency of the stubbed HTTP APIs (Supabase, Qdrant, embeddings)
+    llm_delay_ms = 400         # latency of stubbed chat completions (summary, transliteration)
+
+
+config = StubConfig()
+app = FastAPI(title="vocalQ load-test stubs")
+_ids = itertools.count(1)
+
+# A mid-level vowel-like tone, pre-encoded once and sliced into deltas
+_t = np.arange(SAMPLE_RATE * 4) / SAMPLE_RATE
+_AI_AUDIO = ulaw_encode(0.1 * (np.sin(2 * np.pi * 180 * _t) + 0.5 * np.sin(2 * np.pi * 360 * _t)))
+
+
+def _dumps(event: dict) -> str:
+    # OpenAI sends compact JSON with the type first (the egress passthrough relies on it)
+    return json.dumps(event, separators=(",", ":"))
+
+
+class MockRealtimeSession:
+    """One mock Realtime connection."""
+
+    def __init__(self, ws: WebSocket):
+        self.ws = ws
+        self.in_speech = False
+        self.silence_ms = 0.0
+        self.turn = 0
+        self.response_task = None
+
+    async def send(self, event: dict):
+        await self.ws.send_text(_dumps(event))
+
+    async def run(self):
+        await self.send({"type": "session.created", "session": {"id": f"sess_{next(_ids)}"}})
+        try:
+            while True:
+                event = json.loads(await self.ws.receive_text())
+                await self.handle(event)
+        except WebSocketDisconnect:
+            pass
+        finally:
+            if self.response_task:
+                self.response_task.cancel()
+
+    async def handle(self, event: dict):
+        event_type = event.get("type")
+        if event_type == "session.update":
+            await self.send({"type": "session.updated", "session": event.get("session", {})})
+        elif event_type == "input_audio_buffer.append":
+            await self.on_audio(base64.b64decode(event.get("audio", "")))
+        elif event_type == "response.create":
+            self.start_response(tool_call=False)
+        elif event_type == "response.cancel":
+            if self.response_task and not self.response_task.done():
+                self.response_task.cancel()
+                await self.send({"type": "response.done", "response": {"status": "cancelled", "usage": {}}})
+
+    async def on_audio(self, ulaw: bytes):
+        if not ulaw:
+            return
+        samples = ulaw_decode(ulaw)
+        level_db = 10 * np.log10(float(np.mean(samples * samples)) + 1e-10)
+        if level_db > config.vad_threshold_dbfs:
+            self.silence_ms = 0.0
+            if not self.in_speech:
+                self.in_speech = True
+                await self.send({"type": "input_audio_buffer.speech_started", "audio_start_ms": 0})
+            return
+        if not self.in_speech:
+            return
+        self.silence_ms += len(ulaw) * 1000 / SAMPLE_RATE
+        if self.silence_ms >= config.vad_silence_ms:
+            self.in_speech = False
+            self.turn += 1
+            await self.send({"type": "input_audio_buffer.speech_stopped", "audio_end_ms": 0})
+            await self.send({
+                "type": "conversation.item.input_audio_transcription.completed",
+                "transcript": f"Caller question number {self.turn}."
+            })
+            self.start_response(tool_call=bool(config.tool_every) and self.turn % config.tool_every == 0)
+
+    def start_response(self, tool_call: bool):
+        if self.response_task and not self.response_task.done():
+            self.response_task.cancel()
+        self.response_task = asyncio.create_task(self.respond(tool_call))
+
+    async def respond(self, tool_call: bool):
+        response_id = f"resp_{next(_ids)}"
+        await asyncio.sleep(config.model_delay_ms / 1000)
+        await self.send({"type": "response.created", "response": {"id": response_id}})
+
+        if tool_call:
+            await self.send({
+                "type": "response.function_call_arguments.done",
+                "response_id": response_id,
+                "call_id": f"call_{next(_ids)}",
+                "name": "search_knowledge_base",
+                "arguments": json.dumps({"query": "pricing plans"}),
+            })
+            await self.send({"type": "response.done", "response": {"id": response_id, "usage": _usage(40, 20)}})
+            return
+
+        chunk_bytes = config.audio_chunk_ms * SAMPLE_RATE // 1000
+        total_bytes = config.response_audio_ms * SAMPLE_RATE // 1000
+        interval = config.audio_chunk_ms / 1000 / config.audio_speedup
+        for offset in range(0, total_bytes, chunk_bytes):
+            delta = base64.b64encode(_AI_AUDIO[offset:offset + chunk_bytes]).decode()
+            await self.send({
+                "type": "response.audio.delta",
+                "response_id": response_id,
+                "item_id": f"item_{response_id}",
+                "output_index": 0,
+                "content_index": 0,
+                "delta": delta,
+            })
+            await asyncio.sleep(interval)
+        await self.send({"type": "response.audio.done", "response_id": response_id})
+        await self.send({
+            "type": "response.audio_transcript.done",
+            "response_id": response_id,
+            "transcript": "Our plans start at ten dollars per month.",
+        })
+        await self.send({"type": "response.done", "response": {"id": response_id, "usage": _usage(120, 60)}})
+
+
+def _usage(input_tokens: int, output_tokens: int) -> dict:
+    return {"input_tokens": input_tokens, "output_tokens": output_tokens, "total_tokens": input_tokens + output_tokens}
+
+
+@app.websocket("/v1/realtime")
+async def realtime(websocket: WebSocket):
+    await websocket.accept()
+    await MockRealtimeSession(websocket).run()
+
+
+# --- OpenAI HTTP ---
+@app.post("/v1/embeddings")
+async def embeddings(request: Request):
+    body = await request.json()
+    inputs = body.get("input")
+    inputs = inputs if isinstance(inputs, list) else [inputs]
+    await asyncio.sleep(config.http_delay_ms / 1000)
+    vector = [0.0] * EMBEDDING_DIM
+    vector[0] = 1.0
+    return {
+        "object": "list",
+        "model": body.get("model"),
+        "data": [{"object": "embedding", "index": i, "embedding": vector} for i in range(len(inputs))],
+        "usage": {"prompt_tokens": 8 * len(inputs), "total_tokens": 8 * len(inputs)},
+    }
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    await asyncio.sleep(config.llm_delay_ms / 1000)
+    content = "Caller asked about pricing plans. Provided plan details."
+    if (body.get("response_format") or {}).get("type") == "json_object":
+        content = json.dumps({"summary": content, "intent": "pricing", "sentiment": "positive", "language": "te-IN"})
+    return {
+        "id": f"chatcmpl-{next(_ids)}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": {"prompt_tokens": 120, "completion_tokens": 15, "total_tokens": 135},
+    }
+
+
+# --- Supabase PostgREST ---
+@app.api_route("/rest/v1/{path:path}", methods=["GET", "POST", "PATCH", "PUT", "DELETE"])
+async def supabase_rest(path: str, request: Request):
+    await asyncio.sleep(config.http_delay_ms / 1000)
+    return JSONResponse([], status_code=201 if request.method == "POST" else 200)
+
+
+# --- Qdrant REST ---
+def _qdrant(result) -> dict:
+    return {"result": result, "status": "ok", "time": 0.0}
+
+
+@app.get("/")
+async def qdrant_root():
+    return {"title": "qdrant - vector search engine", "version": "1.12.0"}
+
+
+@app.get("/collections")
+async def qdrant_collections():
+    return _qdrant({"collections": [{"name": "knowledge_base"}]})
+
+
+@app.get("/collections/{name}")
+async def qdrant_collection(name: str):
+    return _qdrant({
+        "status": "green",
+        "optimizer_status": "ok",
+        "points_count": 3,
+        "segments_count": 1,
+        "config": {
+            "params": {"vectors": {"size": EMBEDDING_DIM, "distance": "Cosine"}},
+            "hnsw_config": {"m": 16, "ef_construct": 100, "full_scan_threshold": 10000},
+            "optimizer_config": {
+                "deleted_threshold": 0.2, "vacuum_min_vector_number": 1000, "default_segment_number": 0,
+                "flush_interval_sec": 5,
+            },
+            "wal_config": {"wal_capacity_mb": 32, "wal_segments_ahead": 0},
+        },
+        "payload_schema": {},
+    })
+
+
+@app.post("/collections/{name}/points/query")
+async def qdrant_query(name: str, request: Request):
+    body = await request.json()
+    await asyncio.sleep(config.http_delay_ms / 1000)
+    points = [
+        {"id": i, "version": 0, "score": 0.9 - i * 0.1, "payload": {"text": f"Pricing snippet {i}: plans start at $10/month."}}
+        for i in range(body.get("limit", 3))
+    ]
+    return _qdrant({"points": points})
+
+
+@app.api_route("/collections/{path:path}", methods=["PUT", "POST", "DELETE"])
+async def qdrant_mutation(path: str):
+    await asyncio.sleep(config.http_delay_ms / 1000)
+    return _qdrant({"operation_id": 0, "status": "completed"})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    for name, value in vars(StubConfig).items():
+        if not name.startswith("_"):
+            parser.add_argument(f"--{name.replace('_', '-')}", type=type(value), default=value)
+    args = parser.parse_args()
+    for name in vars(StubConfig):
+        if not name.startswith("_"):
+            setattr(config, name, getattr(args, name))
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning", ws_max_size=16 * 1024 * 1024)
+
+
+if __name__ == "__main__":
+    main()
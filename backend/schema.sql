@@ -69,8 +69,10 @@ create table public.knowledge_base_documents (
     vector_count integer default 0,
     status text default 'processing', -- processing, ready, failed
     metadata jsonb default '{}',
-    created_at timestamptz default now()
+    created_at timestamptz default now(),
+    updated_at timestamptz default now() -- refreshed by the ingesting process (lease)
 );
+-- Existing databases: alter table public.knowledge_base_documents add column if not exists updated_at timestamptz default now();
 
 -- ============================================
 -- INDEXES for performance
@@ -95,6 +97,7 @@ create index idx_queue_assigned_to on public.call_queue(assigned_to);
 create index idx_kb_doc_id on public.knowledge_base_documents(doc_id);
 create index idx_kb_uploaded_by on public.knowledge_base_documents(uploaded_by);
 create index idx_kb_status on public.knowledge_base_documents(status);
+create index idx_kb_status_updated on public.knowledge_base_documents(status, updated_at);
 create index idx_kb_upload_date on public.knowledge_base_documents(upload_date desc);
 
 -- ============================================
@@ -0,0 +1,111 @@
+"""
+Benchmark the token-budget chunker against the original character chunker
+(chunk_text, 1000 chars / 200 overlap) on synthetic multi-MB texts.
+
+Reports chunks per second, chunk count and tokens per chunk for each corpus.
+The "run-on" corpus has short sentences between long unpunctuated runs, where
+the character chunker can step backwards and never finish; each baseline run
+is therefore done in a child process and abandoned after --timeout seconds.
+
+Usage: python scripts/bench_chunker.py [--size-mb 4] [--max-tokens 256] [--overlap-tokens 40] [--timeout 60] [--model M]
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.services.chunker import chunk_by_tokens, chunk_stats, get_token_counter
+from app.services.document_parser import chunk_text
+
+WORDS = (
+    "VocalQ answers inbound calls around the clock and books demos for the sales team "
+    "plans include call summaries transcripts knowledge base search and CRM integration "
+    "pricing starts at ten dollars per month with discounts for annual billing"
+).split()
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + rng.choice([". ", "! ", "? ", ".\n"])
+
+
+def make_text(kind: str, size: int, seed: int = 7) -> str:
+    """Synthetic corpus of about `size` characters."""
+    rng = random.Random(seed)
+    parts = []
+    length = 0
+    while length < size:
+        if kind == "prose":
+            part = sentence(rng, rng.randint(6, 30))
+        elif kind == "short":
+            part = sentence(rng, rng.randint(1, 4))
+        else:  # run-on: a short sentence, then a long stretch with no sentence boundary
+            part = sentence(rng, 5) + " ".join(rng.choice(WORDS) for _ in range(rng.randint(200, 400))) + "\n"
+        parts.append(part)
+        length += len(part)
+    return "".join(parts)
+
+
+def _baseline_worker(text: str, queue):
+    started = time.perf_counter()
+    chunks = chunk_text(text, 1000, 200)
+    queue.put((time.perf_counter() - started, chunks))
+
+
+def run_baseline(text: str, timeout: float):
+    """(elapsed, chunks) of chunk_text, or None if it didn't finish within timeout."""
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_baseline_worker, args=(text, queue), daemon=True)
+    process.start()
+    try:
+        return queue.get(timeout=timeout)
+    except Exception:
+        return None
+    finally:
+        process.terminate()
+        process.join()
+
+
+def report(name: str, elapsed: float, chunks: list, counter):
+    count, mean_tokens, max_tokens = chunk_stats(chunks, counter)
+    print(
+        f"  {name:<9} {count:7d} chunks in {elapsed:6.2f}s  ->  {count / elapsed:9.0f} chunks/s | "
+        f"tokens/chunk mean {mean_tokens:6.1f}  max {max_tokens:5d}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=float, default=4)
+    parser.add_argument("--max-tokens", type=int, default=256)
+    parser.add_argument("--overlap-tokens", type=int, default=40)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--model", default=os.getenv("EMBEDDING_MODEL", "text-embedding-3-small"))
+    args = parser.parse_args()
+
+    counter = get_token_counter(args.model)
+    print(f"Token counter: {counter.name} ({counter.model}); token chunker {args.max_tokens}/{args.overlap_tokens} tokens, "
+          f"baseline 1000/200 chars")
+
+    for kind in ("prose", "short", "run-on"):
+        text = make_text(kind, int(args.size_mb * 1024 * 1024))
+        print(f"--- {kind}: {len(text) / 1024 / 1024:.1f} MB ---")
+
+        started = time.perf_counter()
+        chunks = chunk_by_tokens(text, args.max_tokens, args.overlap_tokens, counter)
+        report("tokens", time.perf_counter() - started, chunks, counter)
+
+        baseline = run_baseline(text, args.timeout)
+        if baseline is None:
+            print(f"  {'baseline':<9} did not finish in {args.timeout:.0f}s (no forward progress)")
+        else:
+            report("baseline", *baseline, counter)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Micro-benchmark: CPU per call-second for Twilio -> OpenAI media forwarding.
+
+Compares the legacy path (json.loads -> dict -> json.dumps per 20 ms frame)
+with the fast path (payload slice + pre-built template), with and without
+frame coalescing (windows are rounded to multiples of 60 ms).
+
+Socket send cost is excluded. Coalescing costs CPU: 160-byte frames can't be
+joined as base64 strings, so each window is decoded and re-encoded, which costs
+more than the fast path itself (reported as "+N µs vs fast path"). It only pays
+off if a WebSocket send costs more than that overhead divided by the sends it
+saves (also reported), so it stays off by default (MEDIA_COALESCE_MS=0).
+
+Usage: python scripts/bench_media_ingress.py [call_seconds]
+"""
+import base64
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.services.media_ingress import MediaCoalescer, build_append_event, extract_media_payload
+
+FRAMES_PER_SECOND = 50  # Twilio sends 20 ms μ-law frames
+
+
+def make_frames(count: int) -> list:
+    """Realistic Twilio media messages with random 160-byte μ-law payloads."""
+    frames = []
+    for seq in range(count):
+        payload = base64.b64encode(os.urandom(160)).decode("ascii")
+        frames.append(json.dumps({
+            "event": "media",
+            "sequenceNumber": str(seq + 2),
+            "media": {"track": "inbound", "chunk": str(seq + 1), "timestamp": str(seq * 20), "payload": payload},
+            "streamSid": "MZ00000000000000000000000000000000",
+        }, separators=(",", ":")))
+    return frames
+
+
+def legacy(frames: list) -> list:
+    sent = []
+    for message in frames:
+        data = json.loads(message)
+        if data.get("event") == "media":
+            payload = data.get("media", {}).get("payload")
+            sent.append(json.dumps({"type": "input_audio_buffer.append", "audio": payload}))
+    return sent
+
+
+def fast(frames: list) -> list:
+    sent = []
+    for message in frames:
+        payload = extract_media_payload(message)
+        if payload is not None:
+            sent.append(build_append_event(payload))
+    return sent
+
+
+def fast_coalesced(frames: list, window_ms: int) -> list:
+    sent = []
+    coalescer = MediaCoalescer(window_ms)
+    for message in frames:
+        payload = extract_media_payload(message)
+        if payload is not None:
+            out = coalescer.add(payload)
+            if out:
+                sent.append(out)
+    tail = coalescer.flush()
+    if tail:
+        sent.append(tail)
+    return sent
+
+
+def measure(label: str, fn, frames: list, call_seconds: int, baseline: float = None, fast_path: tuple = None) -> tuple:
+    start = time.process_time()
+    sent = fn(frames)
+    cpu = time.process_time() - start
+    per_call_second_us = cpu / call_seconds * 1e6
+    appends = len(sent) / call_seconds
+    ratio = f"  ({baseline / per_call_second_us:.1f}x vs legacy)" if baseline else ""
+    print(f"{label:<28} {per_call_second_us:8.1f} µs CPU per call-second, "
+          f"{appends:4.1f} appends/call-second{ratio}")
+    if fast_path:
+        fast_us, fast_appends = fast_path
+        overhead = per_call_second_us - fast_us
+        saved = fast_appends - appends
+        print(f"{'':<28} +{overhead:.1f} µs vs fast path for {saved:.1f} fewer sends/call-second "
+              f"(worth it if one send costs > {overhead / saved:.2f} µs)")
+    return per_call_second_us, appends
+
+
+def main():
+    call_seconds = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    frames = make_frames(call_seconds * FRAMES_PER_SECOND)
+    print(f"--- {call_seconds} call-seconds, {len(frames)} frames ---")
+
+    baseline, _ = measure("legacy (loads/dumps)", legacy, frames, call_seconds)
+    fast_path = measure("fast path", fast, frames, call_seconds, baseline)
+    for window in (60, 120):
+        measure(
+            f"fast path + coalesce {window}ms", lambda f: fast_coalesced(f, window), frames, call_seconds,
+            baseline, fast_path
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark the local transliteration engine on a fixture set of caller/AI
+utterances (Telugu, Hindi, Tamil, Kannada, Malayalam, Bengali, mixed English).
+
+Reports per-utterance cost uncached (rule engine) and cached (LRU hit), and
+prints each fixture's romanization for eyeballing.
+
+Usage: python scripts/bench_transliteration.py [rounds]
+"""
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.services.transliteration import _romanize, romanize
+
+UTTERANCES = [
+    # Telugu
+    "నమస్కారం",
+    "నాకు తెలుగు కావాలి",
+    "మీ ధరలు ఎంత?",
+    "మీరు ఏ సేవలు అందిస్తారు?",
+    "నాకు డెమో కావాలి, రేపు కాల్ చేయగలరా?",
+    "సరే, ధన్యవాదాలు",
+    "మీ ఆఫీస్ ఎక్కడ ఉంది?",
+    "ఇంకేమీ లేదు, బై",
+    # Hindi
+    "नमस्ते, मुझे हिंदी में बात करनी है",
+    "आपकी कीमत क्या है?",
+    "क्या आप वेबसाइट भी बनाते हैं?",
+    "मुझे कल सुबह दस बजे कॉल कीजिए",
+    "ठीक है, बहुत धन्यवाद",
+    "मेरा नाम राहुल है और मैं हैदराबाद से बोल रहा हूँ",
+    # Tamil
+    "வணக்கம்",
+    "எனக்கு தமிழ் வேண்டும்",
+    "உங்கள் விலை என்ன?",
+    "சரி, நன்றி",
+    # Kannada
+    "ನಮಸ್ಕಾರ",
+    "ನನಗೆ ಕನ್ನಡ ಬೇಕು",
+    "ನಿಮ್ಮ ಸೇವೆಗಳ ಬಗ್ಗೆ ಹೇಳಿ",
+    "ಧನ್ಯವಾದಗಳು",
+    # Malayalam / Bengali
+    "നമസ്കാരം, എനിക്ക് മലയാളം വേണം",
+    "আমি দাম জানতে চাই",
+    # Mixed with English
+    "నాకు AI voice agent pricing కావాలి",
+    "मुझे CRM integration के बारे में बताइए",
+    "ok, thank you, ಧನ್ಯವಾದ",
+]
+
+
+def bench(fn, rounds: int) -> list:
+    """Per-utterance cost in microseconds (best of each utterance's rounds)."""
+    costs = []
+    for text in UTTERANCES:
+        best = float("inf")
+        for _ in range(rounds):
+            started = time.perf_counter()
+            fn(text)
+            best = min(best, time.perf_counter() - started)
+        costs.append(best * 1e6)
+    return costs
+
+
+def summarize(name: str, costs: list):
+    ordered = sorted(costs)
+    mean = sum(ordered) / len(ordered)
+    print(f"{name:<10} mean {mean:7.2f} us   p50 {ordered[len(ordered) // 2]:7.2f} us   max {ordered[-1]:7.2f} us")
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    for text in UTTERANCES:
+        print(f"{text}\n  -> {romanize(text)}")
+    print()
+
+    print(f"--- {len(UTTERANCES)} utterances, best of {rounds} runs each ---")
+    summarize("uncached", bench(_romanize, rounds))
+    romanize.cache_clear()
+    for text in UTTERANCES:
+        romanize(text)
+    summarize("cached", bench(romanize, rounds))
+    print(romanize.cache_info())
+
+
+if __name__ == "__main__":
+    main()
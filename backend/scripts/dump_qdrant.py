@@ -5,13 +5,12 @@ import sys
 # Add current directory to path
 sys.path.append(os.getcwd())
 
-from app.services.qdrant_service import QdrantService
+from app.services.qdrant_service import qdrant_service
 from app.core.config import settings
 
 async def main():
-    qdrant = QdrantService()
-    # Wait for the collection to be ensured
-    await asyncio.sleep(3) 
+    qdrant = qdrant_service
+    await qdrant.ensure_collection()
     docs = await qdrant.list_documents()
     print(f"Total documents: {len(docs)}")
     for doc in docs:
@@ -0,0 +1,135 @@
+"""
+Evaluate the local barge-in detector on a synthetic μ-law corpus.
+
+Non-speech clips (line noise, hum, hiss, clicks, quiet echo) measure the false
+trigger rate; speech-like clips (harmonic voiced segments with syllabic
+modulation and fricative bursts) measure detection rate and latency.
+
+Usage: python scripts/eval_barge_in.py [clips_per_kind]
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add backend to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+from app.services.barge_in import FRAME_MS, FRAME_SAMPLES, SAMPLE_RATE, BargeInDetector, ulaw_encode
+
+CLIP_SECONDS = 2.0
+
+
+def _db(level_dbfs: float) -> float:
+    return 10 ** (level_dbfs / 20)
+
+
+def _normalize(x: np.ndarray, level_dbfs: float) -> np.ndarray:
+    rms = np.sqrt(np.mean(x * x)) + 1e-12
+    return x / rms * _db(level_dbfs)
+
+
+def silence(rng, n):
+    return rng.normal(0, _db(-70), n)
+
+
+def comfort_noise(rng, n):
+    return rng.normal(0, _db(rng.uniform(-60, -45)), n)
+
+
+def loud_hiss(rng, n):
+    return rng.normal(0, _db(rng.uniform(-35, -20)), n)
+
+
+def mains_hum(rng, n):
+    t = np.arange(n) / SAMPLE_RATE
+    f0 = rng.choice([50.0, 60.0])
+    x = sum(np.sin(2 * np.pi * f0 * k * t) / k for k in range(1, 4))
+    return _normalize(x, rng.uniform(-40, -25)) + rng.normal(0, _db(-60), n)
+
+
+def clicks(rng, n):
+    x = rng.normal(0, _db(-60), n)
+    for pos in rng.integers(0, n - 40, size=6):
+        x[pos:pos + 40] += rng.normal(0, _db(-15), 40)
+    return x
+
+
+def quiet_echo(rng, n):
+    # Residual echo of the AI's own voice after the carrier's echo canceller
+    return speech_like(rng, n, level_dbfs=rng.uniform(-58, -50), onset=0)
+
+
+def speech_like(rng, n, level_dbfs=None, onset=None):
+    """Voiced harmonics with 4-6 Hz syllabic envelope and occasional fricatives."""
+    t = np.arange(n) / SAMPLE_RATE
+    f0 = rng.uniform(90, 250) * (1 + 0.05 * np.sin(2 * np.pi * rng.uniform(1, 3) * t))
+    phase = 2 * np.pi * np.cumsum(f0) / SAMPLE_RATE
+    voiced = sum(np.sin(k * phase) * np.exp(-k / 6) for k in range(1, 16))
+    envelope = 0.55 + 0.45 * np.sin(2 * np.pi * rng.uniform(4, 6) * t) ** 2
+    x = voiced * envelope
+    for pos in rng.integers(0, n - 800, size=2):
+        x[pos:pos + 800] = rng.normal(0, 0.4, 800) * np.hanning(800)
+    x = _normalize(x, level_dbfs if level_dbfs is not None else rng.uniform(-30, -15))
+
+    onset = int(rng.uniform(0.3, 1.0) * SAMPLE_RATE) if onset is None else onset
+    out = rng.normal(0, _db(-60), n)
+    out[onset:] += x[: n - onset]
+    return out, onset
+
+
+def run_clip(detector: BargeInDetector, ulaw: bytes):
+    """Feed 20 ms frames like Twilio does; return the time (s) of the first trigger or None."""
+    frame_bytes = FRAME_SAMPLES
+    for i in range(0, len(ulaw) - frame_bytes + 1, frame_bytes):
+        if detector.process(ulaw[i:i + frame_bytes]):
+            return (i // frame_bytes + 1) * FRAME_MS / 1000
+    return None
+
+
+def make_detector() -> BargeInDetector:
+    return BargeInDetector(
+        energy_dbfs=settings.BARGE_IN_ENERGY_DBFS,
+        noise_margin_db=settings.BARGE_IN_NOISE_MARGIN_DB,
+        zcr_min=settings.BARGE_IN_ZCR_MIN,
+        zcr_max=settings.BARGE_IN_ZCR_MAX,
+        min_speech_ms=settings.BARGE_IN_MIN_SPEECH_MS,
+    )
+
+
+def main():
+    clips = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    rng = np.random.default_rng(7)
+    n = int(CLIP_SECONDS * SAMPLE_RATE)
+
+    print(f"--- {clips} clips per kind, {CLIP_SECONDS:.0f}s each ---")
+    print("Non-speech (false triggers):")
+    total_false = 0
+    for kind in (silence, comfort_noise, loud_hiss, mains_hum, clicks, quiet_echo):
+        false = 0
+        for _ in range(clips):
+            x = kind(rng, n)
+            x = x[0] if isinstance(x, tuple) else x
+            if run_clip(make_detector(), ulaw_encode(x)) is not None:
+                false += 1
+        total_false += false
+        print(f"  {kind.__name__:<14} {false / clips:6.1%}")
+    print(f"  {'overall':<14} {total_false / (clips * 6):6.1%}")
+
+    print("Speech (detection):")
+    latencies = []
+    for _ in range(clips):
+        x, onset = speech_like(rng, n)
+        hit = run_clip(make_detector(), ulaw_encode(x))
+        if hit is not None and hit >= onset / SAMPLE_RATE:
+            latencies.append(hit - onset / SAMPLE_RATE)
+    latencies.sort()
+    print(f"  detected       {len(latencies) / clips:6.1%}")
+    if latencies:
+        print(f"  latency p50    {latencies[len(latencies) // 2] * 1000:6.0f} ms")
+        print(f"  latency p95    {latencies[int(len(latencies) * 0.95)] * 1000:6.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
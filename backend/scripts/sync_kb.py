@@ -6,42 +6,39 @@ from pathlib import Path
 # Add backend to path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from app.services.qdrant_service import QdrantService
+from app.services.qdrant_service import qdrant_service
 from app.services.document_ingestion_service import DocumentIngestionService
 
 async def main():
-    print("--- Starting Knowledge Base Cleanup and Sync ---")
-    
-    qdrant = QdrantService()
+    print("--- Starting Knowledge Base Sync ---")
+
     doc_ingestion = DocumentIngestionService()
-    
-    # 1. Clear Qdrant collection
-    print("Clearing Qdrant collection...")
-    await qdrant.clear_knowledge_base()
-    
-    # 2. Sync with FS
-    uploaded_dir = Path(__file__).parent.parent / "knowledge_base" / "uploaded"
-    if not uploaded_dir.exists():
-        print(f"Uploaded directory not found: {uploaded_dir}")
-        return
-
-    print(f"Scanning {uploaded_dir} for documents to re-ingest...")
-    
-    for doc_dir in uploaded_dir.iterdir():
-        if doc_dir.is_dir():
-            for file_path in doc_dir.glob("*"):
-                if file_path.suffix.lower() in [".pdf", ".txt", ".docx"]:
-                    print(f"Re-ingesting: {file_path.name}")
-                    result = await doc_ingestion.ingest_document(
-                        file_path=str(file_path),
-                        file_name=file_path.name
-                    )
-                    if result["success"]:
-                        print(f"Successfully re-ingested {file_path.name}")
-                    else:
-                        print(f"Failed to re-ingest {file_path.name}: {result.get('error')}")
-
-    print("--- Cleanup and Sync Complete ---")
+    await qdrant_service.ensure_collection()
+
+    print(f"Syncing {doc_ingestion.knowledge_base_dir} (only changed chunks are re-embedded)...")
+
+    def on_document(doc_id: str, result: dict):
+        if result.get("unchanged"):
+            return
+        if result["success"]:
+            print(
+                f"Synced {result['file_name']} ({doc_id}): {result['points_stored']} embedded, "
+                f"{result['chunks_reused']} unchanged, {result['chunks_removed']} removed"
+            )
+        else:
+            print(f"Failed to sync {result['file_name']} ({doc_id}): {result.get('error')}")
+
+    stats = await doc_ingestion.sync_knowledge_base(on_document)
+    print(
+        f"{stats['unchanged']} unchanged, {stats['updated']} updated, {stats['failed']} failed, "
+        f"{stats['orphans_removed']} orphaned documents removed"
+    )
+    print(
+        f"Chunks: {stats['chunks_embedded']} embedded, {stats['chunks_reused']} reused, "
+        f"{stats['chunks_removed']} removed in {stats['elapsed_s']}s"
+    )
+
+    print("--- Sync Complete ---")
 
 if __name__ == "__main__":
     asyncio.run(main())
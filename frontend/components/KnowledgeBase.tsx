@@ -50,6 +50,16 @@ const KnowledgeBase: React.FC = () => {
                 const error = await res.json();
                 throw new Error(error.detail || 'Upload failed');
             }
+            // Ingestion runs in the background; poll the job until it finishes
+            const { job_id } = await res.json();
+            while (true) {
+                await new Promise((resolve) => setTimeout(resolve, 1000));
+                const jobRes = await fetch(`http://localhost:8000/api/v1/knowledge-base/jobs/${job_id}`);
+                if (!jobRes.ok) throw new Error('Failed to fetch upload status');
+                const job = await jobRes.json();
+                if (job.status === 'failed') throw new Error(job.error || 'Ingestion failed');
+                if (job.status === 'ready') break;
+            }
             await fetchDocuments();
         } catch (e: any) {
             console.error('Error uploading document:', e);
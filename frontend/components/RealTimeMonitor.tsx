@@ -2,7 +2,7 @@
 import React, { useState } from 'react';
 import { api } from '../services/api';
 import { COLORS } from '../constants';
-import { CallMetric } from '../types';
+import { CallMetric, TranscriptPart } from '../types';
 import { getWebSocket } from '../services/websocket';
 
 const RealTimeMonitor: React.FC = () => {
@@ -10,38 +10,52 @@ const RealTimeMonitor: React.FC = () => {
   const [lastUpdated, setLastUpdated] = useState<Date>(new Date());
 
   React.useEffect(() => {
-    const fetchActive = async () => {
-      try {
-        const calls = await api.getActiveCalls();
+    // Initial state from the API; the event stream's snapshot supersedes it on connect
+    api.getActiveCalls()
+      .then(calls => {
         setActiveCalls(calls);
         setLastUpdated(new Date());
-      } catch (e) {
-        console.error(e);
-      }
-    };
+      })
+      .catch(console.error);
 
-    fetchActive();
+    const ws = getWebSocket();
 
-    // Poll every 3 seconds as fallback
-    const interval = setInterval(fetchActive, 3000);
+    const handleSnapshot = (data: { calls: CallMetric[] }) => {
+      setActiveCalls(data.calls);
+      setLastUpdated(new Date());
+    };
 
-    // Also listen to WebSocket for real-time updates
-    const ws = getWebSocket();
+    const handleCallStarted = (call: CallMetric) => {
+      setActiveCalls(prev => [...prev.filter(c => c.id !== call.id), call]);
+      setLastUpdated(new Date());
+    };
+
+    // Deltas: entries replace/append starting at `index`
+    const handleTranscript = (data: { call_id: string; index: number; entries: TranscriptPart[] }) => {
+      setActiveCalls(prev => prev.map(call => {
+        if (call.id !== data.call_id) return call;
+        const transcript = [...(call.transcript || [])];
+        transcript.splice(data.index, data.entries.length, ...data.entries);
+        return { ...call, transcript };
+      }));
+      setLastUpdated(new Date());
+    };
 
-    const handleCallUpdate = (data: any) => {
-      console.log('Call update received:', data);
-      fetchActive(); // Refresh when changes detected
+    const handleCallEnded = (data: { id: string }) => {
+      setActiveCalls(prev => prev.filter(c => c.id !== data.id));
+      setLastUpdated(new Date());
     };
 
-    ws.on('call_started', handleCallUpdate);
-    ws.on('call_updated', handleCallUpdate);
-    ws.on('call_ended', handleCallUpdate);
+    ws.on('snapshot', handleSnapshot);
+    ws.on('call_started', handleCallStarted);
+    ws.on('transcript_update', handleTranscript);
+    ws.on('call_ended', handleCallEnded);
 
     return () => {
-      clearInterval(interval);
-      ws.off('call_started', handleCallUpdate);
-      ws.off('call_updated', handleCallUpdate);
-      ws.off('call_ended', handleCallUpdate);
+      ws.off('snapshot', handleSnapshot);
+      ws.off('call_started', handleCallStarted);
+      ws.off('transcript_update', handleTranscript);
+      ws.off('call_ended', handleCallEnded);
     };
   }, []);
 
@@ -111,7 +125,7 @@ const RealTimeMonitor: React.FC = () => {
           </div>
           <h3 style={{ fontSize: '16px', fontWeight: '600', color: '#0F172A', marginBottom: '8px' }}>No Active Calls</h3>
           <p style={{ fontSize: '14px', color: '#94A3B8', maxWidth: '320px', margin: '0 auto 16px' }}>
-            When calls come in, they will appear here in real-time. The monitor refreshes every 3 seconds.
+            When calls come in, they will appear here in real-time.
           </p>
           <div style={{ display: 'flex', alignItems: 'center', gap: '8px', justifyContent: 'center' }}>
             <span style={{ width: '8px', height: '8px', borderRadius: '50%', backgroundColor: '#06B6D4', display: 'inline-block', animation: 'pulse 2s infinite' }} />
@@ -1,9 +1,11 @@
 /**
- * WebSocket utility for real-time call updates
+ * WebSocket utility for real-time call updates.
+ * Connects to the dashboard event stream (/api/v1/events): a `snapshot` of the
+ * active calls on connect, then one JSON array of events per server tick.
  */
 
 export interface WebSocketMessage {
-    type: 'call_started' | 'call_updated' | 'call_ended' | 'transcript_update';
+    type: 'snapshot' | 'call_started' | 'call_updated' | 'call_ended' | 'transcript_update';
     data: any;
 }
 
@@ -23,7 +25,7 @@ export class CallWebSocket {
 
         try {
             const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
-            const wsUrl = `${protocol}//${window.location.hostname}:8000/api/v1/stream`;
+            const wsUrl = `${protocol}//${window.location.hostname}:8000/api/v1/events`;
 
             this.ws = new WebSocket(wsUrl);
 
@@ -34,8 +36,9 @@ export class CallWebSocket {
 
             this.ws.onmessage = (event) => {
                 try {
-                    const message: WebSocketMessage = JSON.parse(event.data);
-                    this.notifyListeners(message.type, message.data);
+                    const parsed = JSON.parse(event.data);
+                    const messages: WebSocketMessage[] = Array.isArray(parsed) ? parsed : [parsed];
+                    messages.forEach(message => this.notifyListeners(message.type, message.data));
                 } catch (error) {
                     console.error('Failed to parse WebSocket message:', error);
                 }